@@ -0,0 +1,81 @@
+# benchmarks/bench_color_grading.py
+"""
+Benchmark color grading lama (convertScaleAbs + HSV float32 + split/merge)
+vs stage LUT baru (engine/color_grading.py) di frame 1080x1920.
+
+Jalankan dari root repo:
+    python benchmarks/bench_color_grading.py
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from engine.color_grading import compile_grade
+
+
+def legacy_grade(img, bright, contrast, sat, hue, temp):
+    """Salinan pipeline lama VideoService._apply_effects (tanpa blur)."""
+    img = img.copy()
+    if bright != 0 or contrast != 0:
+        img = cv2.convertScaleAbs(img, alpha=1.0 + (contrast / 100.0), beta=bright)
+
+    if sat != 0 or hue != 0 or temp != 0:
+        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype("float32")
+        (h, s, v) = cv2.split(hsv)
+        if sat != 0:
+            s = np.clip(s * (1.0 + (sat / 100.0)), 0, 255)
+        if hue != 0:
+            h = np.mod(h + hue, 180)
+        img = cv2.cvtColor(cv2.merge([h, s, v]).astype("uint8"), cv2.COLOR_HSV2BGR)
+
+    if temp != 0:
+        b, g, r = cv2.split(img)
+        if temp > 0:
+            r = cv2.add(r, int(temp))
+            b = cv2.subtract(b, int(temp))
+        else:
+            r = cv2.subtract(r, int(abs(temp)))
+            b = cv2.add(b, int(abs(temp)))
+        img = cv2.merge([b, g, r])
+    return img
+
+
+def lut_grade(img, bright, contrast, sat, hue, temp):
+    return compile_grade(bright, contrast, sat, hue, temp).apply(img)
+
+
+def bench(fn, img, params, repeat):
+    fn(img, *params)  # warm-up (compile LUT / cache)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(img, *params)
+    return (time.perf_counter() - t0) / repeat * 1000.0
+
+
+def main(repeat=30):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, size=(1920, 1080, 3), dtype=np.uint8)
+
+    cases = {
+        "bright+contrast": (20, 15, 0, 0, 0),
+        "bright+contrast+temp": (20, 15, 0, 0, 12),
+        "full grade": (20, 15, 30, 8, 12),
+        "sat+hue": (0, 0, -40, -10, 0),
+    }
+
+    print(f"Frame 1080x1920, {repeat} iterasi per kasus")
+    print(f"{'kasus':<24}{'lama (ms)':>12}{'LUT (ms)':>12}{'speedup':>10}{'max diff':>10}")
+    for name, params in cases.items():
+        t_old = bench(legacy_grade, img, params, repeat)
+        t_new = bench(lut_grade, img, params, repeat)
+        diff = int(np.abs(legacy_grade(img, *params).astype(np.int16) -
+                          lut_grade(img, *params).astype(np.int16)).max())
+        print(f"{name:<24}{t_old:>12.2f}{t_new:>12.2f}{t_old / t_new:>9.1f}x{diff:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_timeline.py
+"""
+Benchmark TimelineEngine lama (list + scan linear) vs TimelineEngine
+berindex (id map + IntervalIndex) di project 10k layer
+(kira-kira hasil auto-caption video panjang).
+
+Jalankan dari root repo:
+    python benchmarks/bench_timeline.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from manager.timeline.timeline_engine import TimelineEngine
+from manager.timeline.layer_model import LayerModel
+from manager.timeline.time_range import TimeRange
+
+
+class LegacyTimelineEngine:
+    """Salinan TimelineEngine lama (scan linear, remove + add + sort per sync)."""
+    def __init__(self):
+        self._layers = []
+
+    def add_layer(self, layer):
+        self._layers.append(layer)
+        self._layers.sort(key=lambda l: l.z_index)
+
+    def update_layer(self, layer):
+        # Pola _sync_layer_to_timeline lama
+        self._layers = [l for l in self._layers if l.id != layer.id]
+        self.add_layer(layer)
+
+    def get_active_layers(self, t):
+        return [layer for layer in self._layers if layer.time.contains(t)]
+
+    def get_layer(self, layer_id):
+        for layer in self._layers:
+            if layer.id == layer_id:
+                return layer
+        return None
+
+    def get_total_duration(self):
+        return max((layer.time.end for layer in self._layers), default=0.0)
+
+
+def make_layers(count, seed=0):
+    """Caption berurutan 0.5 - 3 detik + beberapa layer panjang (video / background)."""
+    rng = random.Random(seed)
+    layers, t = [], 0.0
+    for i in range(count):
+        if i % 500 == 0:
+            layers.append(LayerModel(f"bg{i}", "video", TimeRange(t, t + 600.0), -100))
+        dur = rng.uniform(0.5, 3.0)
+        layers.append(LayerModel(f"cap{i}", "caption", TimeRange(t, t + dur), rng.randint(0, 3)))
+        t += dur * rng.uniform(0.3, 1.0)
+    return layers
+
+
+def bench(fn, repeat):
+    t0 = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - t0) / repeat * 1e6  # mikrodetik per operasi
+
+
+def main(count=10000):
+    layers = make_layers(count)
+    duration = max(l.time.end for l in layers)
+    rng = random.Random(1)
+    times = [rng.uniform(0, duration) for _ in range(2000)]
+    ids = [rng.choice(layers).id for _ in range(2000)]
+
+    results = {}
+    for name, cls in (("lama", LegacyTimelineEngine), ("index", TimelineEngine)):
+        tl = cls()
+        t0 = time.perf_counter()
+        for layer in layers:
+            tl.add_layer(layer)
+        build_ms = (time.perf_counter() - t0) * 1000.0
+
+        by_id = {l.id: l for l in layers}
+
+        def sync(i):
+            old = by_id[ids[i]]
+            tl.update_layer(LayerModel(old.id, old.type, old.time, old.z_index, old.payload))
+
+        results[name] = {
+            "build (ms total)": build_ms,
+            "get_active_layers (us)": bench(lambda i: tl.get_active_layers(times[i]), len(times)),
+            "get_layer (us)": bench(lambda i: tl.get_layer(ids[i]), len(ids)),
+            "sync layer (us)": bench(sync, 300),
+            "total duration (us)": bench(lambda i: tl.get_total_duration(), 300),
+        }
+        # Hasil harus sama
+        results[name]["_check"] = [sorted(l.id for l in tl.get_active_layers(t)) for t in times[:200]]
+
+    assert results["lama"].pop("_check") == results["index"].pop("_check"), "Hasil query berbeda!"
+
+    print(f"{len(layers)} layer, durasi {duration:.0f} detik")
+    print(f"{'operasi':<26}{'lama':>12}{'index':>12}{'speedup':>10}")
+    for op in results["lama"]:
+        old, new = results["lama"][op], results["index"][op]
+        print(f"{op:<26}{old:>12.1f}{new:>12.1f}{old / new if new else 0:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
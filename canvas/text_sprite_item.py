@@ -0,0 +1,54 @@
+# canvas/text_sprite_item.py
+from PySide6.QtGui import QPixmap
+
+from canvas.video_item import VideoLayerItem
+from engine.text.raster_cache import TextRasterCache, TEXT_STYLE_KEYS
+
+
+class TextSpriteItem(VideoLayerItem):
+    """
+    Layer text / caption di preview, digambar dari sprite TextRasterCache
+    (raster yang sama dengan export), jadi layout preview = hasil render.
+    Transform (x, y, scale, rotation) & gizmo sama dengan VideoLayerItem:
+    pivot = center kotak text, margin stroke / shadow lewat offset pixmap.
+    """
+
+    def __init__(self, layer_id, parent=None):
+        self._payload = {}
+        self._box = None  # (w, h) kotak logis text
+        super().__init__(layer_id, None, parent)
+
+    def update_transform(self, props: dict):
+        super().update_transform(props)
+        if "opacity" in props: self.setOpacity(float(props["opacity"]))
+
+        # Raster ulang hanya kalau style text berubah (transform saja -> sprite tetap)
+        changed = False
+        for k in TEXT_STYLE_KEYS:
+            if k in props and self._payload.get(k) != props[k]:
+                self._payload[k] = props[k]
+                changed = True
+        if changed or self._box is None:
+            self._refresh_sprite()
+
+    def _refresh_sprite(self):
+        sprite = TextRasterCache.instance().get(self._payload)
+        self._box = (sprite.box_w, sprite.box_h)
+        self.setPixmap(QPixmap.fromImage(sprite.to_qimage()))
+        self.setOffset(sprite.offset_x, sprite.offset_y)
+        self._update_origin()
+
+    def _update_origin(self):
+        # Dipanggil juga dari __init__ VideoLayerItem (placeholder) sebelum sprite ada
+        box = getattr(self, "_box", None)
+        if box is None:
+            return super()._update_origin()
+        self.setTransformOriginPoint(box[0] / 2.0, box[1] / 2.0)
+        if self.gizmo and hasattr(self.gizmo, "refresh"):
+            self.gizmo.refresh()
+
+    def sync_frame(self, relative_time: float, video_service=None):
+        pass  # text statis, sprite sudah di-set saat update_transform
+
+    def request_frame(self, relative_time: float, dispatcher=None):
+        pass
@@ -99,12 +99,33 @@ class VideoLayerItem(QObject, QGraphicsPixmapItem):
         qimg = video_service.get_frame(
             self.layer_id,
             relative_time,
-            self.color_config   # 🔥 INI KUNCI COLOR GRADING
+            self.color_config,   # 🔥 INI KUNCI COLOR GRADING
+            preview=True         # boleh pakai proxy resolusi rendah
         )
 
         if qimg and not qimg.isNull():
-            self.setPixmap(QPixmap.fromImage(qimg))
-            self._update_origin()
+            self.set_frame_image(qimg, video_service.get_source_size(self.layer_id))
+
+    def request_frame(self, relative_time: float, dispatcher):
+        """
+        Versi async sync_frame: frame yang sudah di-cache langsung tampil,
+        selain itu frame terakhir tetap tampil sampai FrameDispatcher mengirim hasil decode.
+        """
+        qimg = dispatcher.request(self.layer_id, relative_time, self.color_config)
+        if qimg is not None:
+            self.set_frame_image(qimg, dispatcher.video_service.get_source_size(self.layer_id))
+
+    def set_frame_image(self, qimg, source_size=None):
+        """
+        Tampilkan frame. Kalau frame lebih kecil dari media asli (proxy / preview Half-Quarter),
+        devicePixelRatio dipakai supaya ukuran logis item tetap = media asli,
+        jadi x / y / scale / rotation dari controller tetap benar.
+        """
+        pix = QPixmap.fromImage(qimg)
+        if source_size and source_size[0] > 0 and qimg.width() != source_size[0]:
+            pix.setDevicePixelRatio(qimg.width() / float(source_size[0]))
+        self.setPixmap(pix)
+        self._update_origin()
 
     # ======================================================
     # 🔧 UPDATE DARI CONTROLLER (TRANSFORM + COLOR)
@@ -1,6 +1,8 @@
 import av
 import numpy as np
 import cv2
+from engine.frame_cache import FrameCache
+from engine.media_index import get_media_index, IndexedDecoder
 
 class BackgroundLayer:
     def __init__(self):
@@ -8,6 +10,7 @@ class BackgroundLayer:
         self.path = None
         self.container = None
         self.stream = None
+        self.decoder = None
 
         self.x = 0
         self.y = 0
@@ -19,7 +22,7 @@ class BackgroundLayer:
         self.vig_radius = 0.85
         self.vig_angle = 0.0
 
-        self._frame_cache = {}
+        self._frame_cache = FrameCache(name="background")
 
     # =====================
     # SOURCE
@@ -32,10 +35,13 @@ class BackgroundLayer:
             self.container = av.open(path)
             self.stream = self.container.streams.video[0]
             self.stream.thread_type = "AUTO"
+            index = get_media_index(path)
+            self.decoder = IndexedDecoder(self.container, self.stream, index) if index else None
         except Exception as e:
             print(f"Error opening background: {e}")
             self.container = None
             self.stream = None
+            self.decoder = None
 
         self._frame_cache.clear()
 
@@ -60,7 +66,7 @@ class BackgroundLayer:
         if not self.enabled or not self.container:
             return canvas
 
-        frame = self._get_frame(frame_idx)
+        frame = self._get_frame(frame_idx, fps)
         if frame is None:
             return canvas
 
@@ -153,26 +159,33 @@ class BackgroundLayer:
         
         return np.clip(img_out, 0, 255).astype(np.uint8)
 
-    def _get_frame(self, frame_idx: int):
-        if frame_idx in self._frame_cache:
-            return self._frame_cache[frame_idx].copy()
+    def _get_frame(self, frame_idx: int, fps: float):
+        """frame_idx = frame project (fps project) -> frame media lewat index PTS."""
+        t = frame_idx / float(fps or 30)
+        if self.decoder is not None:
+            media_idx = self.decoder.index.frame_at_time(t)
+        else:
+            media_idx = int(t * float(self.stream.average_rate or fps or 30))
+
+        cached = self._frame_cache.get(media_idx)
+        if cached is not None:
+            return cached.copy()
 
         try:
-            target_ts = int(frame_idx / self.stream.average_rate)
-            # Optimization: Only seek if diff is large to avoid stutter
-            self.container.seek(target_ts)
+            if self.decoder is not None:
+                frame = self.decoder.frame_at(media_idx)
+            else:
+                # Tanpa index: seek pakai satuan time_base stream (bukan detik)
+                self.container.seek(int(t / self.stream.time_base), stream=self.stream)
+                frame = next(self.container.decode(self.stream), None)
         except Exception:
-            pass
+            frame = None
 
-        try:
-            for frame in self.container.decode(self.stream):
-                img = frame.to_ndarray(format="rgb24")
-                self._frame_cache[frame_idx] = img
-                return img
-        except StopIteration:
-            pass # End of stream
-            
-        return None
+        if frame is None:
+            return None
+        img = frame.to_ndarray(format="rgb24")
+        self._frame_cache.put(media_idx, img)
+        return img
 
     def _apply_scale(self, img: np.ndarray):
         if self.scale == 100:
@@ -226,4 +239,5 @@ class BackgroundLayer:
         if self.container:
             self.container.close()
         self.container = None
-        self.stream = None
\ No newline at end of file
+        self.stream = None
+        self.decoder = None
\ No newline at end of file
@@ -0,0 +1,193 @@
+# engine/cache_manager.py
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+
+DEFAULT_BUDGET_MB = 1024
+
+
+def estimate_nbytes(value) -> int:
+    """Perkiraan ukuran memori satu entry cache (ndarray / QImage / bytes)."""
+    if value is None:
+        return 0
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size_fn = getattr(value, "sizeInBytes", None)  # QImage
+    if callable(size_fn):
+        return int(size_fn())
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class CacheManager:
+    """
+    Pengatur memori global untuk semua FrameCache dalam satu proses.
+    - Satu budget (byte) untuk semua cache yang register.
+    - Eviction berdasarkan byte & recency (LRU global lintas cache).
+    - Counter hit / miss / eviction per cache dan total, buat sizing host.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "CacheManager":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+
+        self._lock = threading.RLock()
+        self._lru = OrderedDict()   # (cache_id, key) -> nbytes
+        self._caches = {}           # cache_id -> weakref(FrameCache)
+        self._evicted = []          # (FrameCache, key, frame) menunggu hook on_evict (di luar lock)
+        self._stats = {}            # cache_id -> dict counter
+        self._next_id = 0
+
+    # ---------- CONFIG ----------
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = max(0, int(budget_bytes))
+            self._enforce_budget()
+        self.drain_evicted()
+
+    def set_budget_mb(self, budget_mb: float):
+        self.set_budget(int(budget_mb * 1024 * 1024))
+
+    # ---------- REGISTRATION ----------
+    def register(self, cache) -> int:
+        with self._lock:
+            cache_id = self._next_id
+            self._next_id += 1
+            self._caches[cache_id] = weakref.ref(cache, lambda _, cid=cache_id: self._on_cache_dead(cid))
+            self._stats[cache_id] = {
+                "name": cache.name, "entries": 0, "bytes": 0,
+                "hits": 0, "misses": 0, "evictions": 0,
+            }
+            return cache_id
+
+    def _on_cache_dead(self, cache_id: int):
+        with self._lock:
+            self._drop_cache_entries(cache_id)
+            self._caches.pop(cache_id, None)
+            self._stats.pop(cache_id, None)
+
+    def _drop_cache_entries(self, cache_id: int):
+        for lru_key in [k for k in self._lru if k[0] == cache_id]:
+            self.used_bytes -= self._lru.pop(lru_key)
+        st = self._stats.get(cache_id)
+        if st:
+            st["entries"] = 0
+            st["bytes"] = 0
+
+    # ---------- BOOKKEEPING (dipanggil FrameCache) ----------
+    def record_hit(self, cache_id: int, key):
+        with self._lock:
+            lru_key = (cache_id, key)
+            if lru_key in self._lru:
+                self._lru.move_to_end(lru_key)
+            st = self._stats.get(cache_id)
+            if st: st["hits"] += 1
+
+    def record_miss(self, cache_id: int):
+        with self._lock:
+            st = self._stats.get(cache_id)
+            if st: st["misses"] += 1
+
+    def record_put(self, cache_id: int, key, nbytes: int):
+        with self._lock:
+            lru_key = (cache_id, key)
+            st = self._stats.get(cache_id)
+            old = self._lru.pop(lru_key, None)
+            if old is not None:
+                self.used_bytes -= old
+                if st:
+                    st["entries"] -= 1
+                    st["bytes"] -= old
+
+            self._lru[lru_key] = nbytes
+            self.used_bytes += nbytes
+            if st:
+                st["entries"] += 1
+                st["bytes"] += nbytes
+
+            self._enforce_budget(protect=lru_key)
+
+    def record_remove(self, cache_id: int, key, evicted: bool = False):
+        """evicted=True: dibuang karena batas max_frames / max_bytes cache sendiri (ikut counter eviction)."""
+        with self._lock:
+            nbytes = self._lru.pop((cache_id, key), None)
+            if nbytes is None: return
+            self.used_bytes -= nbytes
+            st = self._stats.get(cache_id)
+            if st:
+                st["entries"] -= 1
+                st["bytes"] -= nbytes
+                if evicted: st["evictions"] += 1
+
+    def record_clear(self, cache_id: int):
+        with self._lock:
+            self._drop_cache_entries(cache_id)
+
+    # ---------- EVICTION ----------
+    def _enforce_budget(self, protect=None):
+        # Entry yang baru saja dimasukkan tidak ikut di-evict (minimal 1 frame tetap hidup)
+        while self.used_bytes > self.budget_bytes and self._lru:
+            lru_key, nbytes = next(iter(self._lru.items()))
+            if lru_key == protect: break
+
+            self._lru.pop(lru_key)
+            self.used_bytes -= nbytes
+            cache_id, key = lru_key
+
+            st = self._stats.get(cache_id)
+            if st:
+                st["entries"] -= 1
+                st["bytes"] -= nbytes
+                st["evictions"] += 1
+
+            ref = self._caches.get(cache_id)
+            cache = ref() if ref else None
+            if cache is not None:
+                cache._evict(key)
+
+    def queue_evicted(self, cache, key, frame):
+        """Catat entry ter-evict yang punya hook on_evict (lock sudah dipegang caller)."""
+        self._evicted.append((cache, key, frame))
+
+    def drain_evicted(self):
+        """
+        Jalankan hook on_evict entry yang ter-evict, setelah lock dilepas:
+        hook (mis. spill ke disk) tidak pernah menahan cache lain.
+        """
+        with self._lock:
+            if not self._evicted: return
+            pending, self._evicted = self._evicted, []
+        for cache, key, frame in pending:
+            cache._notify_evict(key, frame)
+
+    # ---------- STATS ----------
+    def stats(self) -> dict:
+        with self._lock:
+            caches = [dict(st) for st in self._stats.values()]
+            return {
+                "budget_bytes": self.budget_bytes,
+                "used_bytes": self.used_bytes,
+                "entries": len(self._lru),
+                "hits": sum(c["hits"] for c in caches),
+                "misses": sum(c["misses"] for c in caches),
+                "evictions": sum(c["evictions"] for c in caches),
+                "caches": caches,
+            }
+
+    def reset_counters(self):
+        with self._lock:
+            for st in self._stats.values():
+                st["hits"] = st["misses"] = st["evictions"] = 0
@@ -0,0 +1,23 @@
+# engine/cache_paths.py
+import hashlib
+import os
+import tempfile
+
+CACHE_ROOT_NAME = "mamenpro_cache"
+
+
+def get_cache_dir(sub: str) -> str:
+    """Folder cache di temp sistem (dibuat kalau belum ada), mis. get_cache_dir("proxy")."""
+    path = os.path.join(tempfile.gettempdir(), CACHE_ROOT_NAME, sub)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_signature(path: str) -> str:
+    """
+    Identitas file media untuk nama file cache: path absolut + ukuran + mtime.
+    File yang diedit / diganti otomatis dapat cache baru.
+    """
+    st = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
@@ -1,6 +1,7 @@
 import cv2
 import numpy as np
 from PySide6.QtGui import QImage
+from engine.numpy_compositor import premultiply_bgra
 
 class ChromaProcessor:
     @staticmethod
@@ -19,34 +20,11 @@ class ChromaProcessor:
         ptr = qimage.bits() 
         arr = np.array(ptr).reshape(height, width, 4) 
         
-        # 3. Konversi ke HSV
-        img_rgb = cv2.cvtColor(arr, cv2.COLOR_RGBA2RGB)
-        img_hsv = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2HSV)
+        # 3-7. Mask key (HSV) -> alpha
+        alpha_mask, mask = ChromaProcessor._key_alpha(
+            cv2.cvtColor(arr, cv2.COLOR_RGBA2RGB), cv2.COLOR_RGB2HSV, hex_color, threshold, softness
+        )
 
-        # 4. Target Color
-        target_rgb = ChromaProcessor._hex_to_rgb(hex_color)
-        target_pixel = np.uint8([[target_rgb]]) 
-        target_hsv = cv2.cvtColor(target_pixel, cv2.COLOR_RGB2HSV)[0][0]
-        h_target = int(target_hsv[0])
-
-        # 5. Adaptive Hue Tolerance
-        hue_tol = int(15 + threshold * 45) 
-        
-        lower_h = np.array([max(0, h_target - hue_tol), 40, 40])
-        upper_h = np.array([min(179, h_target + hue_tol), 255, 255])
-        
-        # 6. Masking
-        mask = cv2.inRange(img_hsv, lower_h, upper_h)
-
-        if softness > 0:
-            k_size = int(softness * 10) | 1 
-            if k_size > 1:
-                mask = cv2.GaussianBlur(mask, (k_size, k_size), 0)
-
-        # 7. Alpha Calculation (Invert)
-        # Putih (255) = Objek, Hitam (0) = Transparan
-        alpha_mask = cv2.bitwise_not(mask)
-        
         # ✅ FIX #1: SET ALPHA LANGSUNG (Overwrite)
         # Jangan di-AND dengan alpha lama. Kita mau 'bolongin' gambar ini.
         arr[:, :, 3] = alpha_mask.astype(np.uint8)
@@ -68,6 +46,49 @@ class ChromaProcessor:
 
         return out_image
 
+    @staticmethod
+    def process_array(img_bgr: np.ndarray, hex_color: str, threshold: float, softness: float = 0.1) -> np.ndarray:
+        """
+        Versi array (tanpa QImage) untuk compositor NumPy: BGR -> BGRA premultiplied.
+        Mask & spill suppression sama dengan process_qimage.
+        """
+        alpha_mask, mask = ChromaProcessor._key_alpha(img_bgr, cv2.COLOR_BGR2HSV, hex_color, threshold, softness)
+
+        out = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2BGRA)
+        out[:, :, 3] = alpha_mask
+        spill_area = (mask > 10)
+        out[:, :, 1][spill_area] = np.clip(out[:, :, 1][spill_area] * 0.7, 0, 255).astype(np.uint8)
+        return premultiply_bgra(out)
+
+    @staticmethod
+    def _key_alpha(img, hsv_code, hex_color: str, threshold: float, softness: float):
+        """Return (alpha, mask): mask 255 = warna key, alpha = kebalikannya."""
+        img_hsv = cv2.cvtColor(img, hsv_code)
+
+        # Target Color
+        target_rgb = ChromaProcessor._hex_to_rgb(hex_color)
+        target_pixel = np.uint8([[target_rgb]]) 
+        target_hsv = cv2.cvtColor(target_pixel, cv2.COLOR_RGB2HSV)[0][0]
+        h_target = int(target_hsv[0])
+
+        # Adaptive Hue Tolerance
+        hue_tol = int(15 + threshold * 45) 
+        
+        lower_h = np.array([max(0, h_target - hue_tol), 40, 40])
+        upper_h = np.array([min(179, h_target + hue_tol), 255, 255])
+        
+        # Masking
+        mask = cv2.inRange(img_hsv, lower_h, upper_h)
+
+        if softness > 0:
+            k_size = int(softness * 10) | 1 
+            if k_size > 1:
+                mask = cv2.GaussianBlur(mask, (k_size, k_size), 0)
+
+        # Alpha Calculation (Invert)
+        # Putih (255) = Objek, Hitam (0) = Transparan
+        return cv2.bitwise_not(mask), mask
+
     @staticmethod
     def _hex_to_rgb(hex_str):
         hex_str = hex_str.lstrip('#')
@@ -0,0 +1,82 @@
+# engine/color_grading.py
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+
+class GradeStage:
+    """
+    Color grading yang sudah di-compile jadi LUT.
+    - Brightness / contrast / temperature dilipat ke LUT per-channel 256 entry,
+      dipakai dengan satu cv2.LUT.
+    - Hue / saturation: satu pass HSV uint8 (LUT H & S, V identity).
+    Hasilnya identik dengan pipeline lama (convertScaleAbs -> HSV float32 -> split/merge).
+    """
+    def __init__(self, brightness=0, contrast=0, saturation=0, hue=0, temperature=0):
+        identity = np.arange(256, dtype=np.uint8)
+
+        # 1. Brightness / Contrast: LUT dibangun dari convertScaleAbs sendiri biar pembulatannya sama
+        if brightness != 0 or contrast != 0:
+            alpha = 1.0 + (contrast / 100.0)
+            bc = cv2.convertScaleAbs(identity.reshape(1, 256), alpha=alpha, beta=brightness).reshape(256)
+        else:
+            bc = identity
+
+        # 2. Temperature: geser R & B (saturating, sama seperti cv2.add / cv2.subtract)
+        shift = int(temperature)
+        temp_b = np.clip(identity.astype(np.int16) - shift, 0, 255).astype(np.uint8)
+        temp_r = np.clip(identity.astype(np.int16) + shift, 0, 255).astype(np.uint8)
+
+        # 3. Hue / Saturation (aritmatika float32 sama dengan versi lama, lalu truncate ke uint8)
+        self.hsv_lut = None
+        if saturation != 0 or hue != 0:
+            ramp = identity.astype(np.float32)
+            s = np.clip(ramp * (1.0 + (saturation / 100.0)), 0, 255) if saturation != 0 else ramp
+            h = np.mod(ramp + hue, 180) if hue != 0 else ramp
+            self.hsv_lut = cv2.merge([h.astype(np.uint8), s.astype(np.uint8), identity]).reshape(1, 256, 3)
+
+        # Urutan lama: B/C -> HSV -> temperature.
+        # Tanpa HSV, ketiganya dilipat jadi satu LUT BGR; dengan HSV, temperature jadi LUT setelahnya.
+        if self.hsv_lut is None:
+            self.pre_lut = self._bgr_lut(temp_b[bc], bc, temp_r[bc])
+            self.post_lut = None
+        else:
+            self.pre_lut = None if brightness == 0 and contrast == 0 else self._bgr_lut(bc, bc, bc)
+            self.post_lut = None if shift == 0 else self._bgr_lut(temp_b, identity, temp_r)
+
+        if self.pre_lut is not None and self._is_identity(self.pre_lut):
+            self.pre_lut = None
+
+    @staticmethod
+    def _bgr_lut(b, g, r):
+        # LUT 1-channel (dipakai ke semua channel) jauh lebih cepat dari LUT 3-channel
+        if np.array_equal(b, g) and np.array_equal(g, r):
+            return b.reshape(1, 256)
+        return cv2.merge([b, g, r]).reshape(1, 256, 3)
+
+    @staticmethod
+    def _is_identity(lut):
+        return lut.ndim == 2 and np.array_equal(lut[0], np.arange(256))
+
+    def apply(self, img: np.ndarray) -> np.ndarray:
+        """img: BGR uint8. Selalu mengembalikan array baru kalau ada grading, input tidak diubah."""
+        if self.pre_lut is not None:
+            img = cv2.LUT(img, self.pre_lut)
+        if self.hsv_lut is not None:
+            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            cv2.LUT(hsv, self.hsv_lut, dst=hsv)
+            img = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+        if self.post_lut is not None:
+            img = cv2.LUT(img, self.post_lut)
+        return img
+
+    @property
+    def is_noop(self) -> bool:
+        return self.pre_lut is None and self.hsv_lut is None and self.post_lut is None
+
+
+@lru_cache(maxsize=64)
+def compile_grade(brightness=0, contrast=0, saturation=0, hue=0, temperature=0) -> GradeStage:
+    """GradeStage di-cache per set parameter (slider yang sama tidak compile ulang)."""
+    return GradeStage(brightness, contrast, saturation, hue, temperature)
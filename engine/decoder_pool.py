@@ -0,0 +1,208 @@
+# engine/decoder_pool.py
+import threading
+from collections import OrderedDict
+
+import cv2
+from engine.frame_cache import time_to_frame_index
+from engine.media_index import get_media_index, peek_media_index
+
+
+class DecoderSession:
+    """
+    Satu cv2.VideoCapture milik satu layer.
+    Menyimpan posisi baca sendiri supaya decode bisa berurutan (tanpa seek).
+    Kalau MediaIndex tersedia, index frame = urutan PTS (akurat untuk VFR)
+    dan seek selalu ke keyframe GOP target lalu grab maju.
+    Satu session hanya dibaca satu thread sekaligus (self.lock); layer lain
+    tetap bisa decode paralel di session-nya sendiri.
+    """
+    # Batas lompatan maju yang masih di-decode berurutan (grab) daripada seek.
+    # Seek = balik ke keyframe + decode ulang, jadi untuk gap kecil grab lebih murah.
+    SEQ_READ_WINDOW = 15
+
+    def __init__(self, layer_id: str, path: str):
+        self.layer_id = layer_id
+        self.path = path
+        self.lock = threading.Lock()
+        self.cap = cv2.VideoCapture(path)
+        self.fps = (self.cap.get(cv2.CAP_PROP_FPS) or 30) if self.cap.isOpened() else 30
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) if self.cap.isOpened() else 0
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) if self.cap.isOpened() else 0
+        self._pos = None  # index frame berikutnya yang akan dibaca
+        # File yang belum ter-index di-scan di background; sampai selesai pakai jalur fps
+        self.index = get_media_index(path, background=True) if self.is_open() else None
+        self._index_pending = self.is_open() and self.index is None
+        if self.index is not None:
+            self.fps = self.index.fps
+
+    def is_open(self) -> bool:
+        return self.cap is not None and self.cap.isOpened()
+
+    def poll_index(self):
+        """Ambil MediaIndex dari scan background kalau sudah jadi (murah, tanpa scan)."""
+        if not self._index_pending: return self.index
+        index, pending = peek_media_index(self.path)
+        if index is not None:
+            self.index = index
+            self.fps = index.fps
+        self._index_pending = pending and index is None
+        return self.index
+
+    def frame_at_time(self, t: float) -> int:
+        """Waktu lokal (detik) -> index frame file ini."""
+        if self.poll_index() is not None:
+            return self.index.frame_at_time(t)
+        return time_to_frame_index(t, self.fps)
+
+    def read(self, frame_idx: int):
+        """
+        Baca frame ke-frame_idx (thread-safe per session). None kalau gagal
+        atau session sudah ditutup (mis. ter-evict dari pool selagi menunggu lock).
+        """
+        with self.lock:
+            if not self.is_open(): return None
+            self.poll_index()
+            return self._read(frame_idx)
+
+    def _read(self, frame_idx: int):
+        """
+        Baca frame ke-frame_idx dengan fast path sequential.
+        - Frame berikutnya / sedikit di depan (atau masih satu GOP): grab() frame
+          perantara tanpa retrieve pixel, lalu read(). (Juga menangani source fps > project fps.)
+        - Lompatan jauh / mundur: seek ke keyframe GOP via index, atau
+          CAP_PROP_POS_FRAMES kalau file tidak ter-index.
+        """
+        gap = frame_idx - self._pos if self._pos is not None else -1
+        # Tanpa keyframe di antara posisi sekarang & target, decode maju selalu lebih murah dari seek
+        same_gop = (gap >= 0 and self.index is not None
+                    and self.index.gop_start(frame_idx) <= self._pos)
+
+        if 0 <= gap <= self.SEQ_READ_WINDOW or same_gop:
+            for _ in range(gap):
+                if not self.cap.grab():
+                    self._pos = None
+                    return None
+        elif self.index is not None:
+            return self._seek_read(frame_idx)
+        else:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+
+        ok, frame = self.cap.read()
+        if ok:
+            self._pos = frame_idx + 1
+            return frame
+
+        # Posisi reader tidak pasti lagi (EOF / error), paksa seek berikutnya
+        self._pos = None
+        return None
+
+    def _seek_read(self, frame_idx: int):
+        """
+        Seek ke keyframe GOP target, cek frame tempat mendarat lewat PTS
+        (CAP_PROP_POS_MSEC), lalu grab maju sampai target.
+        POS_FRAMES cv2 dihitung dari fps rata-rata, jadi di file VFR bisa
+        mendarat setelah target -> mundur satu GOP lagi.
+        """
+        if frame_idx >= len(self.index):
+            self._pos = None
+            return None
+
+        key = self.index.gop_start(frame_idx)
+        for _ in range(3):
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, key)
+            if not self.cap.grab(): break
+            current = self.index.frame_at_time(self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+            if current <= frame_idx:
+                while current < frame_idx:
+                    if not self.cap.grab(): break
+                    current += 1
+                ok, frame = self.cap.retrieve() if current == frame_idx else (False, None)
+                if ok:
+                    self._pos = frame_idx + 1
+                    return frame
+                break
+            if key == 0: break
+            key = self.index.gop_start(key - 1)
+
+        self._pos = None
+        return None
+
+    def close(self):
+        # Tunggu read yang sedang jalan selesai dulu
+        with self.lock:
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            self._pos = None
+
+
+class DecoderPool:
+    """
+    Pool DecoderSession dengan key (layer_id, path).
+    Dua layer yang memakai file yang sama (B-roll reuse) punya decoder sendiri,
+    jadi tidak saling rebutan posisi seek. Jumlah session dibatasi max_sessions,
+    session yang paling lama tidak dipakai ditutup duluan (LRU).
+    Lock pool hanya menjaga dict session; buka file & close (yang menunggu
+    read selesai) dikerjakan di luar lock.
+    """
+    def __init__(self, max_sessions: int = 8):
+        self.max_sessions = max(1, max_sessions)
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, layer_id: str, path: str):
+        key = (layer_id, path)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+
+        session = DecoderSession(layer_id, path)
+        if not session.is_open():
+            session.close()
+            return None
+
+        with self._lock:
+            existing = self._sessions.get(key)
+            if existing is not None:
+                # Thread lain sudah lebih dulu membuka session yang sama
+                idle = [session]
+                session = existing
+                self._sessions.move_to_end(key)
+            else:
+                self._sessions[key] = session
+                idle = self._trim()
+        for s in idle:
+            s.close()
+        return session
+
+    def set_max_sessions(self, max_sessions: int):
+        with self._lock:
+            self.max_sessions = max(1, max_sessions)
+            idle = self._trim()
+        for s in idle:
+            s.close()
+
+    def close_layer(self, layer_id: str):
+        with self._lock:
+            idle = [self._sessions.pop(k) for k in [k for k in self._sessions if k[0] == layer_id]]
+        for s in idle:
+            s.close()
+
+    def release_all(self):
+        with self._lock:
+            idle = list(self._sessions.values())
+            self._sessions.clear()
+        for s in idle:
+            s.close()
+
+    def _trim(self):
+        """Keluarkan session LRU di atas max_sessions (lock dipegang caller)."""
+        idle = []
+        while len(self._sessions) > self.max_sessions:
+            idle.append(self._sessions.popitem(last=False)[1])
+        return idle
+
+    def __len__(self):
+        return len(self._sessions)
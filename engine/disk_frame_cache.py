@@ -0,0 +1,283 @@
+# engine/disk_frame_cache.py
+import json
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+from engine.cache_paths import get_cache_dir
+
+
+DEFAULT_QUOTA_MB = 8192
+SLOTS_PER_CHUNK = 32      # slot per file chunk (file baru dibuat saat slot dibutuhkan)
+INDEX_VERSION = 1
+SLOT_HEADER = 64          # byte di depan tiap slot: key frame (ascii), ditulis paling akhir
+MAX_GEOMETRIES = 3        # subfolder geometri yang disimpan (mis. Full / Half / Quarter)
+
+
+class DiskFrameCache:
+    """
+    Tier disk untuk frame komposit (spill dari RAM preview).
+    - Slot raw berukuran tetap (w * h * 3 byte BGR) di file chunk yang di-mmap,
+      jadi get_image = QImage langsung ke halaman mmap (zero-copy); slot-nya di-pin
+      sampai release supaya writer tidak menimpanya selagi dibaca.
+    - Index kecil (JSON): key -> slot, urut LRU. Key = hash input render frame,
+      jadi frame yang inputnya tidak berubah tetap hit di sesi berikutnya.
+    - Total slot dibatasi quota disk; slot LRU dipakai ulang saat penuh.
+    - Tiap slot diawali key-nya sendiri (ditulis setelah pixel), jadi index yang
+      belum sempat di-flush (crash) tidak pernah menampilkan frame yang salah.
+    Satu subfolder + index per geometri kanvas (<dir>/<w>x<h>/), jadi pindah
+    Full -> Half -> Full tidak membuang isi cache. Quota berlaku per geometri;
+    hanya MAX_GEOMETRIES subfolder terakhir dipakai yang disimpan.
+    """
+    def __init__(self, directory: str = None, quota_mb: float = DEFAULT_QUOTA_MB):
+        self.root = directory or get_cache_dir("ram_preview")
+        self.directory = self.root
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.width = self.height = 0
+        self.frame_bytes = 0
+        self.slot_bytes = 0
+        self.capacity = 0
+
+        self._lock = threading.Lock()
+        self._slots = OrderedDict()  # key -> slot (urut LRU, paling lama di depan)
+        self._free = []
+        self._next_slot = 0
+        self._chunks = {}            # index chunk -> (file, mmap)
+        self._pins = {}              # slot -> jumlah QImage get_image yang masih membaca
+        self._generation = 0         # naik tiap configure (pin geometri lama jadi basi)
+        self._dirty = False
+
+    # ---------- SETUP ----------
+    def configure(self, width: int, height: int):
+        """Siapkan slot untuk kanvas w x h; index subfolder geometri ini dipakai lagi kalau ada."""
+        with self._lock:
+            if (width, height) == (self.width, self.height): return
+            self._write_index()  # geometri sebelumnya tetap bisa dipakai nanti
+            self._close_chunks()
+            self._pins.clear()
+            self._generation += 1
+            self.width, self.height = int(width), int(height)
+            self.frame_bytes = self.width * self.height * 3
+            self.slot_bytes = SLOT_HEADER + self.frame_bytes
+            self.capacity = self.quota_bytes // self.slot_bytes if self.slot_bytes else 0
+            self._slots.clear()
+            self._free = []
+            self._next_slot = 0
+            self.directory = os.path.join(self.root, f"{self.width}x{self.height}")
+            os.makedirs(self.directory, exist_ok=True)
+            os.utime(self.directory)  # mtime folder = terakhir dipakai (untuk prune)
+            if not self._load_index():
+                self._wipe_files(self.directory)
+            self._remove_chunks_from(self._chunk_count())
+            self._wipe_files(self.root)  # sisa layout lama (chunk langsung di root)
+            self._prune_geometries()
+            self._dirty = False
+
+    # ---------- API ----------
+    def __contains__(self, key):
+        return key in self._slots
+
+    def __len__(self):
+        return len(self._slots)
+
+    def get(self, key):
+        """Frame BGR (H, W, 3) hasil copy dari slot (aman dipakai lama), atau None."""
+        with self._lock:
+            view = self._view(key)
+            return None if view is None else view.copy()
+
+    def get_image(self, key):
+        """
+        QImage BGR888 yang membaca langsung buffer mmap (tanpa copy), atau None.
+        Slot-nya di-pin (tidak dipakai ulang writer) sampai release(image) dipanggil,
+        jadi panggil release setelah QPixmap.fromImage / selesai membaca.
+        """
+        with self._lock:
+            view = self._view(key)
+            if view is None: return None
+            slot = self._slots[key]
+            self._pins[slot] = self._pins.get(slot, 0) + 1
+        qimg = QImage(view.data, self.width, self.height, self.width * 3, QImage.Format_BGR888)
+        qimg._buffer = view                      # pegang view selama QImage hidup
+        qimg._pin = (self._generation, slot)
+        return qimg
+
+    def release(self, image):
+        """Lepas pin slot dari get_image (image lain / pin dari geometri lama diabaikan)."""
+        pin = getattr(image, "_pin", None)
+        if pin is None: return
+        image._pin = None
+        generation, slot = pin
+        with self._lock:
+            if generation != self._generation: return
+            count = self._pins.get(slot, 0) - 1
+            if count > 0:
+                self._pins[slot] = count
+            else:
+                self._pins.pop(slot, None)
+
+    def put(self, key, frame):
+        """Tulis frame ke slot (frame dengan geometri lain diabaikan)."""
+        if frame is None or frame.shape != (self.height, self.width, 3): return False
+        with self._lock:
+            if key in self._slots:
+                self._slots.move_to_end(key)
+                return True
+            slot = self._alloc_slot()
+            if slot is None: return False
+            mm, offset = self._slot_buffer(slot)
+            # Header dikosongkan dulu, pixel, baru key -> slot setengah jadi tidak pernah valid
+            mm[offset:offset + SLOT_HEADER] = bytes(SLOT_HEADER)
+            dst = np.frombuffer(mm, dtype=np.uint8, count=self.frame_bytes, offset=offset + SLOT_HEADER)
+            dst[:] = np.ascontiguousarray(frame).reshape(-1)
+            mm[offset:offset + SLOT_HEADER] = self._header(key)
+            self._slots[key] = slot
+            self._dirty = True
+            return True
+
+    def flush(self):
+        """Simpan index (tulis ke file sementara lalu replace -> index tidak pernah setengah jadi)."""
+        with self._lock:
+            self._write_index()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._close_chunks()
+
+    # ---------- INTERNAL ----------
+    def _view(self, key):
+        """View NumPy ke slot key (dipanggil di dalam lock), None kalau miss / slot basi."""
+        slot = self._slots.get(key)
+        if slot is None: return None
+        mm, offset = self._slot_buffer(slot)
+        if mm[offset:offset + SLOT_HEADER] != self._header(key):
+            # Slot sudah ditimpa frame lain / tulisan terpotong
+            del self._slots[key]
+            self._free.append(slot)
+            self._dirty = True
+            return None
+        self._slots.move_to_end(key)
+        return np.frombuffer(mm, dtype=np.uint8, count=self.frame_bytes, offset=offset + SLOT_HEADER) \
+            .reshape(self.height, self.width, 3)
+
+    def _write_index(self):
+        """Isi flush (dipanggil di dalam lock)."""
+        if not self._dirty or not self.slot_bytes: return
+        for _, mm in self._chunks.values():
+            mm.flush()
+        data = {
+            "version": INDEX_VERSION,
+            "width": self.width, "height": self.height,
+            "slots": list(self._slots.items()),
+        }
+        tmp = self._index_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self._index_path())
+        self._dirty = False
+
+    def _alloc_slot(self):
+        if self._free:
+            return self._free.pop()
+        if self._next_slot < self.capacity:
+            self._next_slot += 1
+            return self._next_slot - 1
+        # LRU -> dipakai ulang, kecuali slot yang masih di-pin pembaca (get_image)
+        for key, slot in self._slots.items():
+            if slot not in self._pins:
+                del self._slots[key]
+                return slot
+        return None
+
+    def _slot_buffer(self, slot: int):
+        return self._chunk(slot // SLOTS_PER_CHUNK), (slot % SLOTS_PER_CHUNK) * self.slot_bytes
+
+    @staticmethod
+    def _header(key) -> bytes:
+        return str(key).encode("ascii")[:SLOT_HEADER].ljust(SLOT_HEADER, b"\0")
+
+    def _chunk(self, idx: int):
+        entry = self._chunks.get(idx)
+        if entry is None:
+            path = self._chunk_path(idx)
+            # Chunk terakhir hanya sebesar sisa quota
+            size = min(SLOTS_PER_CHUNK, self.capacity - idx * SLOTS_PER_CHUNK) * self.slot_bytes
+            f = open(path, "r+b" if os.path.exists(path) else "w+b")
+            if os.path.getsize(path) != size:
+                f.truncate(size)
+            entry = (f, mmap.mmap(f.fileno(), size))
+            self._chunks[idx] = entry
+        return entry[1]
+
+    def _close_chunks(self):
+        for f, mm in self._chunks.values():
+            try:
+                mm.close()
+            except BufferError:
+                pass  # masih ada view yang dipakai; ditutup GC bersama view-nya
+            f.close()
+        self._chunks.clear()
+
+    def _chunk_path(self, idx: int):
+        return os.path.join(self.directory, f"slots_{idx:04d}.bin")
+
+    def _chunk_count(self) -> int:
+        return -(-self.capacity // SLOTS_PER_CHUNK)
+
+    def _remove_chunks_from(self, first: int):
+        """Hapus file chunk di luar quota (quota diperkecil sejak sesi sebelumnya)."""
+        idx = first
+        while os.path.exists(self._chunk_path(idx)):
+            try:
+                os.remove(self._chunk_path(idx))
+            except OSError:
+                break
+            idx += 1
+
+    def _index_path(self):
+        return os.path.join(self.directory, "index.json")
+
+    def _load_index(self) -> bool:
+        try:
+            with open(self._index_path(), "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION: return False
+        if (data.get("width"), data.get("height")) != (self.width, self.height): return False
+
+        used = set()
+        for key, slot in data.get("slots", []):
+            if slot >= self.capacity or slot in used: continue  # quota mengecil
+            self._slots[key] = slot
+            used.add(slot)
+        self._next_slot = max(used) + 1 if used else 0
+        self._free = [s for s in range(self._next_slot) if s not in used]
+        return True
+
+    @staticmethod
+    def _wipe_files(directory: str):
+        for name in os.listdir(directory):
+            if name.startswith("slots_") or name.startswith("index.json"):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def _prune_geometries(self):
+        """Hapus subfolder geometri paling lama tidak dipakai di luar MAX_GEOMETRIES."""
+        dirs = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if path != self.directory and os.path.isdir(path) and "x" in name:
+                dirs.append((os.path.getmtime(path), path))
+        dirs.sort(reverse=True)
+        for _, path in dirs[MAX_GEOMETRIES - 1:]:
+            # Chunk yang masih di-mmap (Windows) gagal dihapus -> dicoba lagi di configure berikutnya
+            shutil.rmtree(path, ignore_errors=True)
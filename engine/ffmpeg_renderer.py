@@ -5,8 +5,9 @@ import os
 
 class FFmpegRenderer:
     # [FIX] Wajib menerima 4 parameter ini
-    def __init__(self, output_path, width, height, fps):
+    def __init__(self, output_path, width, height, fps, pix_fmt='rgb24'):
         self.output_path = output_path
+        self.pix_fmt = pix_fmt  # format frame mentah dari Python (rgb24 QPainter, bgr24 NumPy)
         self.width = width
         self.height = height
         self.fps = fps
@@ -15,7 +16,7 @@ class FFmpegRenderer:
     def start_process(self, audio_path=None, audio_delay_ms=0):
         cmd = [
             'ffmpeg', '-y', '-f', 'rawvideo', '-vcodec', 'rawvideo',
-            '-s', f'{self.width}x{self.height}', '-pix_fmt', 'rgb24',
+            '-s', f'{self.width}x{self.height}', '-pix_fmt', self.pix_fmt,
             '-r', str(self.fps), '-i', '-', 
         ]
 
@@ -1,31 +1,111 @@
+import math
 from collections import OrderedDict
+from engine.cache_manager import CacheManager, estimate_nbytes
+
+# Toleransi drift float (sepersekian frame): 0.1 + 0.1 + 0.1 vs 3 / 30.0
+# harus jatuh ke frame yang sama.
+FRAME_EPSILON = 1e-3
+
+def time_to_frame_index(t: float, fps: float) -> int:
+    """Waktu (detik) -> index frame source, tahan terhadap drift float."""
+    if t <= 0 or fps <= 0:
+        return 0
+    return int(math.floor(t * fps + FRAME_EPSILON))
 
 class FrameCache:
     """
     Cache frame.
     [MODIFIED] Sekarang menerima key apa saja (str/float), 
     tidak lagi memaksakan round(t) di dalam method get/put.
+    [MODIFIED] Ukuran dibatasi oleh budget byte global (CacheManager),
+    max_frames / max_bytes hanya batas tambahan opsional per cache.
     """
-    def __init__(self, max_frames=120):
+    def __init__(self, max_frames=None, name="frames", manager=None, max_bytes=None):
         self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.name = name
         self.cache = OrderedDict()
+        self.nbytes = 0
+        self._sizes = {}
+        # Hook on_evict(key, frame): dipanggil saat entry dibuang karena batas ukuran
+        # (bukan remove / clear), mis. untuk spill ke tier disk. Selalu di luar lock
+        # CacheManager, di thread yang memicu eviction -> hook harus cepat.
+        self.on_evict = None
+
+        self._manager = manager or CacheManager.instance()
+        self._lock = self._manager._lock
+        self._cache_id = self._manager.register(self)
 
     def get(self, key):
-        # HAPUS: key = round(t, 3) 
-        # GANTI JADI:
-        if key in self.cache:
-            self.cache.move_to_end(key)
-            return self.cache[key]
-        return None
+        with self._lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self._manager.record_hit(self._cache_id, key)
+                return self.cache[key]
+            self._manager.record_miss(self._cache_id)
+            return None
 
     def put(self, key, frame):
-        # HAPUS: key = round(t, 3)
-        # GANTI JADI:
-        self.cache[key] = frame
-        self.cache.move_to_end(key)
+        with self._lock:
+            nbytes = estimate_nbytes(frame)
+            self.nbytes += nbytes - self._sizes.get(key, 0)
+            self._sizes[key] = nbytes
+            self.cache[key] = frame
+            self.cache.move_to_end(key)
+            self._manager.record_put(self._cache_id, key, nbytes)
+
+            while len(self.cache) > 1 and (
+                    (self.max_frames and len(self.cache) > self.max_frames) or
+                    (self.max_bytes and self.nbytes > self.max_bytes)):
+                old_key, old_frame = self.cache.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old_key, 0)
+                self._manager.record_remove(self._cache_id, old_key, evicted=True)
+                if self.on_evict is not None:
+                    self._manager.queue_evicted(self, old_key, old_frame)
+        # Eviction dari cache ini / budget global: hook dijalankan setelah lock dilepas
+        self._manager.drain_evicted()
 
-        if len(self.cache) > self.max_frames:
-            self.cache.popitem(last=False)
+    def remove(self, key):
+        with self._lock:
+            if self.cache.pop(key, None) is not None:
+                self.nbytes -= self._sizes.pop(key, 0)
+                self._manager.record_remove(self._cache_id, key)
+
+    def remove_if(self, predicate):
+        """Buang semua entry yang key-nya cocok dengan predicate(key)."""
+        with self._lock:
+            for key in [k for k in self.cache if predicate(k)]:
+                self.cache.pop(key)
+                self.nbytes -= self._sizes.pop(key, 0)
+                self._manager.record_remove(self._cache_id, key)
+
+    def keys(self):
+        with self._lock:
+            return list(self.cache)
 
     def clear(self):
-        self.cache.clear()
\ No newline at end of file
+        with self._lock:
+            self.cache.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self._manager.record_clear(self._cache_id)
+
+    def _evict(self, key):
+        # Dipanggil CacheManager (lock sudah dipegang) saat budget global terlampaui
+        frame = self.cache.pop(key, None)
+        self.nbytes -= self._sizes.pop(key, 0)
+        if frame is not None and self.on_evict is not None:
+            self._manager.queue_evicted(self, key, frame)
+
+    def _notify_evict(self, key, frame):
+        if self.on_evict is None: return
+        try:
+            self.on_evict(key, frame)
+        except Exception as e:
+            print(f"[CACHE] on_evict {self.name} error: {e}")
+
+    def __len__(self):
+        return len(self.cache)
+
+    def __contains__(self, key):
+        return key in self.cache
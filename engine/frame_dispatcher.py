@@ -0,0 +1,102 @@
+# engine/frame_dispatcher.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+
+class FrameDispatcher(QObject):
+    """
+    Pengantar frame preview secara async: decode + effect + konversi QImage
+    jalan di thread pool, hasilnya dikirim balik lewat sig_frame_ready
+    (queued ke GUI thread). QPixmap tetap dibuat di GUI thread oleh item.
+
+    Latest-wins per layer: tiap layer punya paling banyak 1 job jalan + 1 slot
+    request terbaru. Request baru (scrub cepat) menimpa slot itu, jadi posisi
+    playhead lama tidak pernah menumpuk di antrian. Hasil yang sudah kalah
+    dari frame yang lebih baru (seq lebih kecil) dibuang.
+    """
+    sig_frame_ready = Signal(str, int, object, object)  # layer_id, seq, QImage, source_size
+
+    def __init__(self, video_service, workers: int = 2, parent=None):
+        super().__init__(parent)
+        self.video_service = video_service
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="FrameDispatch")
+        self._lock = threading.Lock()
+        self._seq = {}      # layer_id -> seq request terakhir
+        self._shown = {}    # layer_id -> seq frame terakhir yang ditampilkan / dikirim
+        self._pending = {}  # layer_id -> (seq, time, props) request terbaru yang belum dikerjakan
+        self._busy = set()  # layer dengan job yang sedang jalan di pool
+
+    def request(self, layer_id: str, time: float, props: dict = None):
+        """
+        Minta frame layer di waktu lokal `time`.
+        Return QImage langsung kalau frame sudah ada di cache (VideoService.peek, tanpa decode);
+        selain itu return None dan frame menyusul lewat sig_frame_ready.
+        """
+        props = self._snapshot(props)
+        with self._lock:
+            seq = self._seq.get(layer_id, 0) + 1
+            self._seq[layer_id] = seq
+
+        qimg = self.video_service.peek(layer_id, time, props, preview=True)
+        with self._lock:
+            if qimg is not None and not qimg.isNull():
+                # Cache hit: tampil sekarang, request lama yang masih antri tidak relevan lagi
+                self._shown[layer_id] = seq
+                self._pending.pop(layer_id, None)
+                return qimg
+
+            self._pending[layer_id] = (seq, time, props)
+            if layer_id not in self._busy:
+                self._busy.add(layer_id)
+                self._pool.submit(self._work, layer_id)
+        return None
+
+    def is_current(self, layer_id: str, seq: int) -> bool:
+        """Hasil async masih boleh ditampilkan (belum disalip frame yang lebih baru)?"""
+        with self._lock:
+            return seq >= self._shown.get(layer_id, 0)
+
+    def forget(self, layer_id: str):
+        """Layer dihapus: buang request yang belum dikerjakan."""
+        with self._lock:
+            self._pending.pop(layer_id, None)
+            self._seq.pop(layer_id, None)
+            self._shown.pop(layer_id, None)
+
+    def cancel(self):
+        with self._lock:
+            self._pending.clear()
+
+    def shutdown(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
+
+    # ---------- WORKER ----------
+    def _work(self, layer_id: str):
+        while True:
+            with self._lock:
+                job = self._pending.pop(layer_id, None)
+                if job is None:
+                    self._busy.discard(layer_id)
+                    return
+            seq, time, props = job
+
+            try:
+                qimg = self.video_service.get_frame(layer_id, time, props, preview=True)
+            except Exception as e:
+                print(f"[DISPATCH] Error: {e}")
+                continue
+
+            with self._lock:
+                if seq <= self._shown.get(layer_id, 0): continue  # sudah disalip
+                self._shown[layer_id] = seq
+            if qimg is not None and not qimg.isNull():
+                self.sig_frame_ready.emit(layer_id, seq, qimg, self.video_service.get_source_size(layer_id))
+
+    @staticmethod
+    def _snapshot(props):
+        """Salinan props (color_config item bisa berubah selagi job jalan)."""
+        if not props: return props
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in props.items()}
@@ -0,0 +1,79 @@
+# engine/layer_plates.py
+
+# Layer yang gambarnya tidak berubah selama aktif (tanpa decode per frame).
+# Audio tidak menggambar apa-apa, jadi tidak mengubah frame.
+STATIC_LAYER_TYPES = ("image", "text", "caption", "audio")
+
+
+def is_static_layer(layer) -> bool:
+    return layer.type in STATIC_LAYER_TYPES
+
+
+class Plate:
+    """Hasil flatten satu grup layer statis (QImage atau array, tergantung compositor)."""
+    def __init__(self, layer_ids: tuple, bottom: bool, snapshot: list, image):
+        self.layer_ids = layer_ids
+        self.bottom = bottom      # grup paling bawah -> plate opaque (sudah termasuk background)
+        self.snapshot = snapshot  # salinan payload saat plate dibuat
+        self.image = image
+
+
+class PlateCache:
+    """
+    Cache "plate" untuk tumpukan layer: grup layer statis yang berurutan (di bawah /
+    di atas / di antara layer dinamis) di-flatten sekali jadi satu gambar kanvas penuh.
+    Per frame tinggal decode layer dinamis + blit plate.
+
+    build(layers, bottom, current_time) -> gambar plate (dibuat oleh compositor pemanggil).
+    Plate dibuat ulang hanya kalau isi grup (set layer aktif) atau payload layer berubah.
+    Plate yang tidak dipakai frame ini dibuang (ukurannya sebesar kanvas).
+    """
+    MIN_GROUP = 2  # grup statis di atas layer dinamis: 1 layer saja langsung digambar
+
+    def __init__(self, build):
+        self._build = build
+        self._plates = {}  # (layer_ids, bottom) -> Plate
+        self.built = 0     # jumlah plate yang di-flatten (statistik)
+
+    def resolve(self, active_layers, current_time):
+        """
+        Layer aktif (urut z) -> list entry ("plate", Plate) / ("layer", layer), urut z.
+        """
+        entries = []
+        used = {}
+        group = []
+
+        def flush():
+            if not group: return
+            bottom = not entries
+            if bottom or len(group) >= self.MIN_GROUP:
+                plate = self._get(group, bottom, current_time)
+                used[(plate.layer_ids, bottom)] = plate
+                entries.append(("plate", plate))
+            else:
+                entries.extend(("layer", layer) for layer in group)
+            group.clear()
+
+        for layer in active_layers:
+            if is_static_layer(layer):
+                group.append(layer)
+            else:
+                flush()
+                entries.append(("layer", layer))
+        flush()
+
+        self._plates = used
+        return entries
+
+    def clear(self):
+        self._plates.clear()
+
+    def _get(self, layers, bottom, current_time) -> Plate:
+        layer_ids = tuple(layer.id for layer in layers)
+        plate = self._plates.get((layer_ids, bottom))
+        if plate is not None and all(layer.payload == snap for layer, snap in zip(layers, plate.snapshot)):
+            return plate
+
+        self.built += 1
+        image = self._build(list(layers), bottom, current_time)
+        return Plate(layer_ids, bottom, [dict(layer.payload) for layer in layers], image)
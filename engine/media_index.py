@@ -0,0 +1,242 @@
+# engine/media_index.py
+import bisect
+import json
+import os
+import threading
+
+import av
+
+from engine.cache_paths import get_cache_dir, file_signature
+from engine.frame_cache import FRAME_EPSILON
+
+
+class MediaIndex:
+    """
+    Index PTS + keyframe satu file video (stream video pertama).
+    Dibangun sekali dengan demux saja (tanpa decode), lalu disimpan sebagai JSON
+    di get_cache_dir("index") dengan key file_signature (path + ukuran + mtime).
+
+    Frame dinomori urut PTS (urutan tampil), jadi waktu -> frame tetap benar
+    untuk file VFR (rekaman HP) yang fps rata-ratanya tidak bisa dipercaya.
+    """
+    VERSION = 1
+
+    def __init__(self, pts: list, keyframes: list, time_base: tuple, start_pts: int = None):
+        self.pts = pts                      # PTS mentah (time_base stream), urut naik
+        self.time_base = tuple(time_base)   # (num, den)
+        self.start_pts = pts[0] if start_pts is None else start_pts
+        tb = self.time_base[0] / float(self.time_base[1])
+        # Waktu relatif awal stream (detik), sama dengan acuan CAP_PROP_POS_MSEC cv2
+        self.times = [(p - self.start_pts) * tb for p in pts]
+        self._pts_pos = {p: i for i, p in enumerate(pts)}
+
+        # gop_start[i] = index keyframe terakhir <= i -> lookup GOP O(1)
+        keyset = set(keyframes) or {pts[0]}
+        self.keyframes = sorted(self._pts_pos[p] for p in keyset if p in self._pts_pos) or [0]
+        self._gop_start = []
+        current = 0
+        for i in range(len(pts)):
+            if pts[i] in keyset: current = i
+            self._gop_start.append(current)
+
+        span = self.times[-1] - self.times[0] if len(self.times) > 1 else 0.0
+        self.fps = (len(self.times) - 1) / span if span > 0 else 30.0
+        self._eps = FRAME_EPSILON / self.fps
+
+    # ---------- LOOKUP ----------
+    def __len__(self):
+        return len(self.pts)
+
+    def frame_at_time(self, t: float) -> int:
+        """Frame yang tampil pada waktu t (detik dari awal stream)."""
+        if t <= 0: return 0
+        return max(0, bisect.bisect_right(self.times, t + self._eps) - 1)
+
+    def time_of(self, idx: int) -> float:
+        return self.times[max(0, min(idx, len(self.times) - 1))]
+
+    def pts_of(self, idx: int) -> int:
+        return self.pts[max(0, min(idx, len(self.pts) - 1))]
+
+    def index_of_pts(self, pts: int) -> int:
+        """PTS frame hasil decode -> index frame (None kalau PTS tidak ada di index)."""
+        return self._pts_pos.get(pts)
+
+    def gop_start(self, idx: int) -> int:
+        """Index keyframe tempat decode harus mulai untuk mendapatkan frame idx."""
+        return self._gop_start[max(0, min(idx, len(self._gop_start) - 1))]
+
+    # ---------- BUILD / PERSIST ----------
+    @classmethod
+    def scan(cls, path: str):
+        """Satu pass demux (tanpa decode) untuk mengumpulkan PTS & flag keyframe."""
+        with av.open(path) as container:
+            if not container.streams.video: return None
+            stream = container.streams.video[0]
+            pts, keyframes = [], []
+            for packet in container.demux(stream):
+                if packet.pts is None: continue  # packet flush / tanpa timestamp
+                pts.append(packet.pts)
+                if packet.is_keyframe: keyframes.append(packet.pts)
+            if not pts: return None
+            tb = stream.time_base
+            start = stream.start_time
+            pts.sort()  # urutan decode (B-frame) -> urutan tampil
+            return cls(pts, keyframes, (tb.numerator, tb.denominator),
+                       start if start is not None else pts[0])
+
+    def to_dict(self) -> dict:
+        return {
+            "version": self.VERSION,
+            "time_base": list(self.time_base),
+            "start_pts": self.start_pts,
+            "pts": self.pts,
+            "keyframes": [self.pts[i] for i in self.keyframes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        if data.get("version") != cls.VERSION or not data.get("pts"): return None
+        return cls(data["pts"], data["keyframes"], data["time_base"], data["start_pts"])
+
+
+_indexes = {}    # file_signature -> MediaIndex
+_building = set()  # file_signature yang sedang di-scan di background
+_lock = threading.Lock()  # hanya menjaga dict / set di atas, bukan load / scan
+
+
+def index_path_for(path: str) -> str:
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(get_cache_dir("index"), f"{name}_{file_signature(path)}.json")
+
+
+def get_media_index(path: str, background: bool = False):
+    """
+    MediaIndex untuk file (memori -> JSON di disk -> scan demux).
+    Return None kalau file tidak bisa di-index (caller pakai jalur fps lama).
+    background=True: file yang belum ter-index di-scan di thread background
+    dan langsung return None; index-nya diambil nanti lewat peek_media_index.
+    """
+    try:
+        sig = file_signature(path)
+    except OSError:
+        return None
+
+    with _lock:
+        index = _indexes.get(sig)
+    if index is not None: return index
+
+    index = _load_index(path)
+    if index is None:
+        if background:
+            with _lock:
+                if sig not in _building:
+                    _building.add(sig)
+                    # Thread daemon: tutup app tidak menunggu scan selesai (.part sisa ditimpa scan berikutnya)
+                    threading.Thread(target=_build_in_background, args=(path, sig),
+                                     name="MediaIndex", daemon=True).start()
+            return None
+        index = _build_index(path)
+        if index is None: return None
+
+    with _lock:
+        return _indexes.setdefault(sig, index)
+
+
+def peek_media_index(path: str):
+    """
+    (index, pending) tanpa load / scan: index yang sudah ada di memori, dan
+    apakah scan background untuk file ini masih jalan (True = cek lagi nanti).
+    """
+    try:
+        sig = file_signature(path)
+    except OSError:
+        return None, False
+    with _lock:
+        return _indexes.get(sig), sig in _building
+
+
+def _load_index(path: str):
+    index_file = index_path_for(path)
+    if not os.path.exists(index_file): return None
+    try:
+        with open(index_file, "r") as f:
+            return MediaIndex.from_dict(json.load(f))
+    except Exception as e:
+        print(f"Error loading media index: {e}")
+        return None
+
+
+def _build_index(path: str):
+    """Scan demux + simpan JSON (tanpa lock; scan file yang sama dua kali tetap aman)."""
+    try:
+        index = MediaIndex.scan(path)
+    except Exception as e:
+        print(f"Error indexing media {path}: {e}")
+        return None
+    if index is None: return None
+    try:
+        index_file = index_path_for(path)
+        tmp_file = index_file + ".part"
+        with open(tmp_file, "w") as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_file, index_file)
+    except Exception as e:
+        print(f"Error saving media index: {e}")
+    return index
+
+
+def _build_in_background(path: str, sig: str):
+    index = _build_index(path)
+    with _lock:
+        # Index & status pending berubah bersamaan -> peek tidak pernah melihat (None, False) di tengah
+        if index is not None: _indexes.setdefault(sig, index)
+        _building.discard(sig)
+
+
+class IndexedDecoder:
+    """
+    Decode PyAV berbasis MediaIndex.
+    Seek langsung ke keyframe GOP frame target lalu decode maju seperlunya;
+    kalau target masih di depan posisi decoder tanpa keyframe di antaranya,
+    lanjut decode tanpa seek (playback berurutan = 1 decode per frame).
+    """
+    def __init__(self, container, stream, index: MediaIndex):
+        self.container = container
+        self.stream = stream
+        self.index = index
+        self._frames = None  # generator decode aktif
+        self._next = None    # index frame berikutnya dari generator
+
+    def frame_at(self, idx: int):
+        """av.VideoFrame untuk index frame idx (None kalau lewat akhir stream)."""
+        idx = max(0, min(idx, len(self.index) - 1))
+        continues = (self._frames is not None and self._next is not None
+                     and self._next <= idx and self.index.gop_start(idx) <= self._next)
+        if not continues:
+            self._seek(idx)
+
+        for frame in self._frames:
+            fidx = self._frame_index(frame)
+            if fidx is None: continue
+            self._next = fidx + 1
+            if fidx >= idx:
+                return frame
+
+        self._frames = None
+        self._next = None
+        return None
+
+    def _seek(self, idx: int):
+        key = self.index.gop_start(idx)
+        self.container.seek(self.index.pts_of(key), stream=self.stream, any_frame=False, backward=True)
+        self._frames = self.container.decode(self.stream)
+        self._next = None
+
+    def _frame_index(self, frame):
+        if frame.pts is not None:
+            fidx = self.index.index_of_pts(frame.pts)
+            if fidx is not None: return fidx
+        if frame.time is None: return None
+        tb = self.index.time_base[0] / float(self.index.time_base[1])
+        return self.index.frame_at_time(frame.time - self.index.start_pts * tb)
@@ -0,0 +1,228 @@
+# engine/mezzanine_cache.py
+import json
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+
+from engine.cache_paths import get_cache_dir, file_signature
+
+
+DEFAULT_QUOTA_MB = 20480
+MEZZANINE_VERSION = 1
+
+
+class MezzanineFile:
+    """
+    Reader mezzanine: semua frame video sebagai YUV420 planar (I420, 1.5 byte/pixel)
+    di satu file yang di-mmap + tabel offset per frame (header JSON).
+    Akses acak = slice mmap + satu cv2.cvtColor, tanpa codec sama sekali.
+    """
+    def __init__(self, data_path: str, header: dict):
+        self.path = data_path
+        self.width = int(header["width"])
+        self.height = int(header["height"])
+        self.offsets = header["offsets"]
+        self.frame_bytes = self.width * self.height * 3 // 2
+        self._file = open(data_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def open(cls, data_path: str):
+        """None kalau file / header tidak ada atau tidak valid."""
+        try:
+            with open(header_path_for(data_path), "r") as f:
+                header = json.load(f)
+            if header.get("version") != MEZZANINE_VERSION: return None
+            return cls(data_path, header)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def frame(self, idx: int):
+        """Frame ke-idx sebagai BGR (H, W, 3), None kalau di luar tabel."""
+        if idx < 0 or idx >= len(self.offsets): return None
+        offset = self.offsets[idx]
+        if offset < 0 or offset + self.frame_bytes > len(self._mm): return None
+        yuv = np.frombuffer(self._mm, dtype=np.uint8, count=self.frame_bytes, offset=offset)
+        return cv2.cvtColor(yuv.reshape(self.height * 3 // 2, self.width), cv2.COLOR_YUV2BGR_I420)
+
+    def close(self):
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def header_path_for(data_path: str) -> str:
+    return os.path.splitext(data_path)[0] + ".json"
+
+
+class MezzanineService(QObject):
+    """
+    Ingest mezzanine di background: tiap video di-decode sekali (berurutan,
+    tanpa seek) ke file YUV420 resolusi preview. Scrub acak di source long-GOP
+    (HEVC / H.264 dari HP) jadi murah karena tidak ada decode lagi.
+    Total ukuran file di cache dibatasi quota; file paling lama tidak dipakai dihapus dulu.
+    """
+    sig_mezzanine_progress = Signal(str, int)   # source_path, persen
+    sig_mezzanine_ready = Signal(str, str)      # source_path, mezzanine_path
+    sig_mezzanine_failed = Signal(str, str)     # source_path, pesan error
+
+    def __init__(self, max_jobs: int = 1, max_dimension: int = 960, quota_mb: float = DEFAULT_QUOTA_MB):
+        super().__init__()
+        self.max_dimension = max_dimension
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.cache_dir = get_cache_dir("mezzanine")
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="MezzJob")
+        self._jobs = {}        # source_path -> Future
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    # ---------- API ----------
+    def mezzanine_path_for(self, source_path: str) -> str:
+        sig = file_signature(source_path)
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{sig}_{self.max_dimension}.yuv")
+
+    def request_mezzanine(self, source_path: str):
+        """Minta mezzanine; kalau sudah ada di cache langsung sig_mezzanine_ready."""
+        if not source_path or not os.path.exists(source_path): return
+
+        data_path = self.mezzanine_path_for(source_path)
+        if os.path.exists(data_path) and os.path.exists(header_path_for(data_path)):
+            self._touch(data_path)
+            self.sig_mezzanine_ready.emit(source_path, data_path)
+            return
+
+        with self._lock:
+            if source_path in self._jobs: return
+            self._jobs[source_path] = self._executor.submit(self._run_job, source_path, data_path)
+
+    def cancel_all(self):
+        self._cancelled = True
+        with self._lock:
+            for fut in self._jobs.values():
+                fut.cancel()
+        self._executor.shutdown(wait=False)
+
+    def disk_usage(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    # ---------- JOB ----------
+    def _target_size(self, width: int, height: int):
+        # I420 butuh dimensi genap
+        k = min(1.0, self.max_dimension / float(max(width, height)))
+        return max(2, int(width * k) // 2 * 2), max(2, int(height * k) // 2 * 2)
+
+    def _run_job(self, source_path: str, data_path: str):
+        tmp_path = data_path + ".part"
+        cap = None
+        try:
+            cap = cv2.VideoCapture(source_path)
+            if not cap.isOpened():
+                self.sig_mezzanine_failed.emit(source_path, "Video tidak bisa dibuka")
+                return
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+            size = self._target_size(width, height)
+            frame_bytes = size[0] * size[1] * 3 // 2
+
+            # Pastikan muat: file lama dibuang dulu sebesar perkiraan ukuran file ini
+            self._enforce_quota(extra=frame_bytes * total, keep=data_path)
+
+            offsets = []
+            last_pct = -1
+            with open(tmp_path, "wb") as out:
+                while not self._cancelled:
+                    ok, frame = cap.read()
+                    if not ok: break
+                    if (frame.shape[1], frame.shape[0]) != size:
+                        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                    offsets.append(out.tell())
+                    out.write(cv2.cvtColor(frame, cv2.COLOR_BGR2YUV_I420).tobytes())
+
+                    if total > 0:
+                        pct = min(99, len(offsets) * 100 // total)
+                        if pct != last_pct:
+                            last_pct = pct
+                            self.sig_mezzanine_progress.emit(source_path, pct)
+
+            if self._cancelled: return
+            if not offsets:
+                self.sig_mezzanine_failed.emit(source_path, "Tidak ada frame yang ter-decode")
+                return
+
+            header = {
+                "version": MEZZANINE_VERSION,
+                "source": os.path.abspath(source_path),
+                "width": size[0], "height": size[1],
+                "offsets": offsets,
+            }
+            os.replace(tmp_path, data_path)
+            # Header ditulis terakhir: file data tanpa header tidak pernah dibuka
+            with open(header_path_for(data_path) + ".part", "w") as f:
+                json.dump(header, f)
+            os.replace(header_path_for(data_path) + ".part", header_path_for(data_path))
+
+            self._enforce_quota(keep=data_path)
+            self.sig_mezzanine_progress.emit(source_path, 100)
+            self.sig_mezzanine_ready.emit(source_path, data_path)
+
+        except Exception as e:
+            self.sig_mezzanine_failed.emit(source_path, str(e))
+        finally:
+            if cap is not None: cap.release()
+            if os.path.exists(tmp_path):
+                try: os.remove(tmp_path)
+                except OSError: pass
+            with self._lock:
+                self._jobs.pop(source_path, None)
+
+    # ---------- QUOTA ----------
+    def _entries(self):
+        """[(mtime, data_path, ukuran data + header)] semua mezzanine di cache."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".yuv"): continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+                size = st.st_size
+                header = header_path_for(path)
+                if os.path.exists(header): size += os.path.getsize(header)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, path, size))
+        return entries
+
+    def _enforce_quota(self, extra: int = 0, keep: str = None):
+        """Hapus mezzanine paling lama tidak dipakai sampai total (+ extra) <= quota."""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries) + extra
+        for _, path, size in entries:
+            if total <= self.quota_bytes: break
+            if path == keep: continue
+            try:
+                os.remove(header_path_for(path))
+                os.remove(path)
+            except OSError:
+                continue  # masih di-mmap (Windows) -> coba lagi di ingest berikutnya
+            total -= size
+
+    @staticmethod
+    def _touch(path: str):
+        """mtime = terakhir dipakai (urutan eviction)."""
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
@@ -0,0 +1,201 @@
+# engine/numpy_compositor.py
+"""
+Compositor headless berbasis NumPy / cv2 (alternatif jalur QPainter untuk export).
+- Tidak butuh QApplication / QImage sama sekali. Sprite text (QFont) dibuat
+  TextRasterCache; proses worker tanpa Qt menerimanya lewat TextRasterCache.preload.
+- Transform (posisi, scale, rotasi terhadap center) via cv2.warpAffine,
+  hanya di bounding box tujuan.
+- Opacity & alpha blending premultiplied dengan aritmatika integer 8-bit (cv2).
+- cv2 & ufunc NumPy melepas GIL, jadi kanvas bisa dibagi per band ke beberapa thread.
+Hasilnya sama dengan RenderEngine._paint_layer (QPainter) dalam toleransi interpolasi.
+"""
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+import cv2
+import numpy as np
+
+
+@dataclass
+class CompositeItem:
+    """
+    Satu layer siap komposit.
+    array  : BGR (H, W, 3) opaque, atau BGRA (H, W, 4) premultiplied.
+    logical_w/h : ukuran logis layer (media asli / kotak text); pivot rotasi & scale
+                  = center kotak ini, sama seperti QPainter path & VideoLayerItem.
+    offset_x/y  : posisi pojok kiri atas array di dalam kotak logis.
+    array_scale : ukuran 1 pixel array dalam satuan logis (frame proxy / preview > 1.0).
+    """
+    array: np.ndarray
+    logical_w: float
+    logical_h: float
+    x: float = 0.0
+    y: float = 0.0
+    scale: float = 1.0
+    rotation: float = 0.0
+    opacity: float = 1.0
+    offset_x: float = 0.0
+    offset_y: float = 0.0
+    array_scale: float = 1.0
+
+
+def scale_item(item: CompositeItem, factor: float) -> CompositeItem:
+    """CompositeItem untuk kanvas yang diperkecil / diperbesar factor kali (preview resolusi rendah)."""
+    if factor == 1.0: return item
+    return replace(item,
+                   logical_w=item.logical_w * factor, logical_h=item.logical_h * factor,
+                   x=item.x * factor, y=item.y * factor,
+                   offset_x=item.offset_x * factor, offset_y=item.offset_y * factor,
+                   array_scale=item.array_scale * factor)
+
+
+def _div255(x):
+    """x / 255 dibulatkan, integer (x <= 255 * 255)."""
+    x = x + 128
+    return (x + (x >> 8)) >> 8
+
+
+def premultiply_bgra(bgra: np.ndarray) -> np.ndarray:
+    """BGRA straight alpha -> premultiplied (uint8)."""
+    out = bgra.copy()
+    a = bgra[..., 3:4].astype(np.uint16)
+    out[..., :3] = _div255(bgra[..., :3].astype(np.uint16) * a)
+    return out
+
+
+class NumpyCompositor:
+    def __init__(self, width: int, height: int, threads: int = 1, background=(0, 0, 0)):
+        self.width = width
+        self.height = height
+        self.background = background  # BGR
+        self.threads = max(1, threads)
+        self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="Compose") \
+            if self.threads > 1 else None
+
+    def compose(self, items, out: np.ndarray = None, transparent: bool = False) -> np.ndarray:
+        """
+        Komposit items (urut z bawah -> atas) ke kanvas BGR uint8 (H, W, 3).
+        transparent=True: kanvas BGRA premultiplied (H, W, 4) mulai dari alpha 0
+        (plate layer statis yang nanti di-blend di atas layer lain).
+        """
+        channels = 4 if transparent else 3
+        if out is None:
+            out = np.empty((self.height, self.width, channels), dtype=np.uint8)
+        out[:] = 0 if transparent else self.background
+
+        prepared = []
+        for item in items:
+            if item is None or item.array is None or item.opacity <= 0: continue
+            m = self._matrix(item)
+            src = item.array
+            if src.shape[2] == 3 and not self._is_integer_translate(m):
+                # Alpha 255 ikut di-warp -> tepi hasil rotasi / scale jadi anti-alias.
+                # Dikonversi sekali per frame, bukan per band.
+                src = cv2.cvtColor(src, cv2.COLOR_BGR2BGRA)
+            prepared.append((item, m, src))
+        if not prepared:
+            return out
+
+        if self._pool is None:
+            self._compose_band(out, prepared, 0, self.height)
+        else:
+            band = int(math.ceil(self.height / float(self.threads)))
+            futures = [self._pool.submit(self._compose_band, out, prepared, y0, min(self.height, y0 + band))
+                       for y0 in range(0, self.height, band)]
+            for fut in futures:
+                fut.result()
+        return out
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    # ---------- INTERNAL ----------
+    @staticmethod
+    def _matrix(item: CompositeItem) -> np.ndarray:
+        """
+        Affine 2x3 pixel array -> pixel kanvas. Urutannya sama dengan QPainter path:
+        translate(x + w/2, y + h/2) -> rotate -> scale -> gambar di (-w/2, -h/2).
+        """
+        k = item.array_scale * item.scale
+        rad = math.radians(item.rotation)
+        cos_r, sin_r = math.cos(rad), math.sin(rad)
+        a = np.array([[cos_r * k, -sin_r * k], [sin_r * k, cos_r * k]], dtype=np.float64)
+
+        # Titik (0, 0) array dalam koordinat relatif pivot (sebelum scale)
+        ox = item.offset_x - item.logical_w / 2.0
+        oy = item.offset_y - item.logical_h / 2.0
+        cx = item.x + item.logical_w / 2.0
+        cy = item.y + item.logical_h / 2.0
+        s = item.scale
+        b = np.array([cx + (cos_r * ox - sin_r * oy) * s, cy + (sin_r * ox + cos_r * oy) * s])
+
+        # warpAffine memetakan center pixel, QPainter memetakan tepi pixel -> geser setengah pixel
+        b = b + a.dot([0.5, 0.5]) - 0.5
+        return np.hstack([a, b.reshape(2, 1)])
+
+    @staticmethod
+    def _is_integer_translate(m: np.ndarray) -> bool:
+        return (m[0, 0] == 1.0 and m[1, 1] == 1.0 and m[0, 1] == 0.0 and m[1, 0] == 0.0
+                and float(m[0, 2]).is_integer() and float(m[1, 2]).is_integer())
+
+    def _compose_band(self, out, prepared, y0, y1):
+        for item, m, src in prepared:
+            self._draw(out, item, m, src, y0, y1)
+
+    def _draw(self, out, item: CompositeItem, m: np.ndarray, src: np.ndarray, band_y0: int, band_y1: int):
+        h, w = src.shape[:2]
+
+        # Bounding box tujuan (dipotong ke band kanvas)
+        corners = np.array([[0, 0, 1], [w, 0, 1], [0, h, 1], [w, h, 1]], dtype=np.float64)
+        pts = corners.dot(m.T)
+        x0 = max(0, int(math.floor(pts[:, 0].min())))
+        x1 = min(self.width, int(math.ceil(pts[:, 0].max())) + 1)
+        y0 = max(band_y0, int(math.floor(pts[:, 1].min())))
+        y1 = min(band_y1, int(math.ceil(pts[:, 1].max())) + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        dst = out[y0:y1, x0:x1]
+        has_alpha = src.shape[2] == 4
+
+        # Fast path: tanpa scale / rotasi & posisi integer -> slice langsung, tanpa warp
+        if self._is_integer_translate(m):
+            tx, ty = int(m[0, 2]), int(m[1, 2])
+            sx0, sy0 = x0 - tx, y0 - ty
+            patch = src[sy0:sy0 + (y1 - y0), sx0:sx0 + (x1 - x0)]
+            dst = dst[:patch.shape[0], :patch.shape[1]]
+            if not has_alpha and item.opacity >= 1.0:
+                dst[..., :3] = patch[..., :3]
+                if dst.shape[2] == 4: dst[..., 3] = 255
+                return
+            if not has_alpha:
+                patch = cv2.cvtColor(patch, cv2.COLOR_BGR2BGRA)
+            self._blend(dst, patch, item.opacity)
+            return
+
+        local = m.copy()
+        local[0, 2] -= x0
+        local[1, 2] -= y0
+        # Bilinear, sama dengan SmoothPixmapTransform di QPainter path
+        warped = cv2.warpAffine(src, local, (x1 - x0, y1 - y0), flags=cv2.INTER_LINEAR,
+                                borderMode=cv2.BORDER_CONSTANT, borderValue=(0, 0, 0, 0))
+        self._blend(dst, warped, item.opacity)
+
+    @staticmethod
+    def _blend(dst: np.ndarray, src_bgra: np.ndarray, opacity: float):
+        """
+        Source-over premultiplied, aritmatika 8-bit saturating cv2 (hasil integer, melepas GIL):
+        dst = src * op + dst * (255 - a * op) / 255.
+        dst BGR (kanvas) atau BGRA premultiplied (plate, alpha ikut di-blend).
+        """
+        op = int(round(max(0.0, min(1.0, opacity)) * 256))
+        if op < 256:
+            src_bgra = cv2.multiply(src_bgra, (op, op, op, op), scale=1 / 256.0)
+        inv = cv2.bitwise_not(np.ascontiguousarray(src_bgra[..., 3]))
+        channels = dst.shape[2]
+        under = cv2.multiply(dst, cv2.merge([inv] * channels), scale=1 / 255.0)
+        src = src_bgra if channels == 4 else cv2.cvtColor(src_bgra, cv2.COLOR_BGRA2BGR)
+        cv2.add(src, under, dst=dst)
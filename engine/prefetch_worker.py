@@ -0,0 +1,114 @@
+# engine/prefetch_worker.py
+import queue
+import threading
+
+
+class FramePrefetcher:
+    """
+    Read-ahead decoder untuk playback preview.
+    Mengamati arah & kecepatan playhead, lalu decode N frame ke depan untuk
+    semua video layer yang akan aktif (menurut TimelineEngine) ke FrameCache
+    VideoService, di thread terpisah. Antrian dibatasi (bounded) dan dibatalkan
+    setiap kali terjadi seek / lompatan.
+    """
+    def __init__(self, video_service, timeline, fps=30, lookahead=15, max_queue=64):
+        self.video_service = video_service
+        self.timeline = timeline
+        self.fps = fps
+        self.lookahead = lookahead
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._generation = 0
+        self._scheduled = set()
+        self._last_frame = None
+
+        self._thread = None
+        self._running = False
+
+    # ---------- LIFECYCLE ----------
+    def start(self):
+        if self._running: return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FramePrefetcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.cancel()
+        self._running = False
+        if self._thread:
+            self._queue.put(None)  # bangunkan worker
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def set_fps(self, fps: float):
+        self.fps = fps if fps > 0 else 30
+        self.cancel()
+
+    # ---------- PLAYHEAD ----------
+    def update_playhead(self, t: float):
+        """Dipanggil tiap tick playback dengan waktu yang sudah di-snap ke frame."""
+        frame = round(t * self.fps)
+        last = self._last_frame
+        self._last_frame = frame
+        if last is None: return
+
+        step = frame - last
+        # Diam / lompat jauh (loop ke awal, seek) -> buang read-ahead lama
+        if step == 0 or abs(step) > self.lookahead:
+            self.cancel()
+            self._last_frame = frame
+            return
+
+        self._schedule(frame, step)
+
+    def cancel(self):
+        """Cancel-on-seek: request lama tidak dikerjakan lagi."""
+        self._generation += 1
+        self._scheduled.clear()
+        self._last_frame = None
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _schedule(self, frame: int, step: int):
+        fps = float(self.fps)
+        times = [(frame + step * i) / fps for i in range(1, self.lookahead + 1)]
+        t_min, t_max = min(times), max(times)
+
+        upcoming = [
+            l for l in self.timeline.get_layers_in_range(t_min, t_max + 1.0 / fps)
+            if l.type == "video" and self.video_service.has_video_source(l.id)
+        ]
+        if not upcoming: return
+
+        gen = self._generation
+        for t in times:
+            for layer in upcoming:
+                if not layer.time.contains(t): continue
+                # Waktu lokal dihitung sama persis dengan PreviewPanel (t - start_time)
+                local_t = t - float(layer.payload.get("start_time", 0.0))
+                key = (layer.id, self.video_service.get_frame_index(layer.id, local_t))
+                if key in self._scheduled: continue
+                self._scheduled.add(key)
+                try:
+                    self._queue.put_nowait((gen, key, local_t))
+                except queue.Full:
+                    self._scheduled.discard(key)
+                    return
+
+    # ---------- WORKER ----------
+    def _run(self):
+        while self._running:
+            job = self._queue.get()
+            if job is None: continue
+
+            gen, key, local_t = job
+            if gen != self._generation: continue
+            try:
+                self.video_service.prefetch_frame(key[0], local_t)
+            except Exception as e:
+                print(f"[PREFETCH] Error: {e}")
+            # Sudah di cache, boleh dijadwalkan ulang kalau nanti ter-evict
+            self._scheduled.discard(key)
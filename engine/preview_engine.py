@@ -1,22 +1,43 @@
 # engine/preview_engine.py
+import math
+import time
+
 from PySide6.QtCore import QObject, QTimer, Signal, Qt # <--- Import Qt eksplisit
 
 class PreviewEngine(QObject):
+    """
+    Clock playback preview. Waktu playback dihitung dari jam monotonic
+    (anchor saat play / seek), bukan dari jumlah tick timer: kalau satu frame
+    telat diproses, frame berikutnya langsung lompat ke posisi yang benar
+    (frame di antaranya di-drop), jadi playback tidak ikut melambat.
+    """
     sig_tick = Signal(float)
     sig_playback_state = Signal(bool)
+    sig_stats = Signal(dict)   # statistik pacing, dikirim tiap ~1 detik selama play & saat pause
+
+    STATS_INTERVAL = 1.0       # detik (wall clock)
 
     def __init__(self, fps=30):
         super().__init__()
-        self._fps = fps
-        self._interval = int(1000 / fps)
-        
+        self._fps = float(fps) if fps > 0 else 30.0
+
         self._current_time = 0.0
         self._duration = 10.0
-        
+        self._playing = False
+
+        # Anchor: posisi timeline _anchor_time berlaku di jam _anchor_clock
+        self._anchor_clock = 0.0
+        self._anchor_time = 0.0
+        self._last_frame = -1
+        self._last_present = None
+        self._stats_clock = 0.0
+        self.reset_stats()
+
+        # Single shot, di-arm ulang ke deadline frame berikutnya tiap tick
         self._timer = QTimer()
         self._timer.setTimerType(Qt.PreciseTimer) # <--- API Bersih
+        self._timer.setSingleShot(True)
         self._timer.timeout.connect(self._on_tick)
-        self._timer.setInterval(self._interval)
 
     @property
     def current_time(self) -> float:
@@ -24,19 +45,34 @@ class PreviewEngine(QObject):
 
     @property
     def is_playing(self) -> bool:
-        return self._timer.isActive()
+        return self._playing
+
+    @property
+    def fps(self) -> float:
+        return self._fps
+
+    def set_fps(self, fps: float):
+        self._fps = float(fps) if fps > 0 else 30.0
+        if self._playing:
+            self._reanchor(self._current_time)
 
     def set_duration(self, duration: float):
         self._duration = max(0.1, duration)
 
     def play(self):
         if not self.is_playing:
-            self._timer.start()
+            self._playing = True
+            self.reset_stats()
+            self._reanchor(self._current_time)
+            self._stats_clock = self._anchor_clock
+            self._timer.start(0)
             self.sig_playback_state.emit(True)
 
     def pause(self):
         if self.is_playing:
+            self._playing = False
             self._timer.stop()
+            self.sig_stats.emit(self.stats())
             self.sig_playback_state.emit(False)
 
     def toggle_play(self):
@@ -48,16 +84,75 @@ class PreviewEngine(QObject):
     def seek(self, t: float):
         safe_t = max(0.0, min(t, self._duration))
         self._current_time = safe_t
+        if self._playing:
+            self._reanchor(safe_t)
         self.sig_tick.emit(self._current_time)
 
+    # ---------- STATISTIK ----------
+    def reset_stats(self):
+        self._presented = 0
+        self._dropped = 0
+        self._late = 0
+        self._jitter_sq = 0.0   # jumlah kuadrat deviasi interval present (detik^2)
+        self._jitter_n = 0
+
+    def stats(self) -> dict:
+        """
+        presented : frame yang dikirim lewat sig_tick
+        dropped   : frame yang dilewati karena tick telat
+        late      : frame yang dikirim > setengah periode setelah deadline-nya
+        jitter_ms : RMS deviasi jarak antar present dari jarak idealnya
+        """
+        jitter = math.sqrt(self._jitter_sq / self._jitter_n) if self._jitter_n else 0.0
+        return {
+            "fps": self._fps,
+            "presented": self._presented,
+            "dropped": self._dropped,
+            "late": self._late,
+            "jitter_ms": jitter * 1000.0,
+        }
+
+    # ---------- INTERNAL ----------
+    def _reanchor(self, t: float):
+        self._anchor_clock = time.perf_counter()
+        self._anchor_time = t
+        self._last_frame = int(math.floor(t * self._fps + 1e-9)) - 1
+        self._last_present = None
+
     def _on_tick(self):
-        step = 1.0 / self._fps
-        next_time = self._current_time + step
+        if not self._playing: return
+        now = time.perf_counter()
+        period = 1.0 / self._fps
+        target_time = self._anchor_time + (now - self._anchor_clock)
 
-        if next_time >= self._duration:
-            self._current_time = 0.0
+        if target_time >= self._duration:
+            # Loop ke awal (sama seperti sebelumnya)
+            self._reanchor(0.0)
+            target_time = 0.0
             # self.pause() # Uncomment jika ingin stop di akhir
-        else:
-            self._current_time = next_time
 
-        self.sig_tick.emit(self._current_time)
\ No newline at end of file
+        frame = int(math.floor(target_time * self._fps + 1e-9))
+        if frame > self._last_frame:
+            skipped = frame - self._last_frame - 1
+            if skipped > 0: self._dropped += skipped
+            due = self._anchor_clock + (frame * period - self._anchor_time)
+            if now - due > period * 0.5: self._late += 1
+            if self._last_present is not None:
+                deviation = (now - self._last_present) - (frame - self._last_frame) * period
+                self._jitter_sq += deviation * deviation
+                self._jitter_n += 1
+            self._presented += 1
+            self._last_frame = frame
+            self._last_present = now
+
+            self._current_time = max(self._anchor_time, frame * period)
+            self.sig_tick.emit(self._current_time)
+
+        if not self._playing: return  # di-pause dari handler sig_tick
+        if now - self._stats_clock >= self.STATS_INTERVAL:
+            self._stats_clock = now
+            self.sig_stats.emit(self.stats())
+
+        # Arm ke deadline frame berikutnya (dihitung dari jam, bukan + interval)
+        next_due = self._anchor_clock + ((self._last_frame + 1) * period - self._anchor_time)
+        self._timer.start(max(0, int(math.ceil((next_due - time.perf_counter()) * 1000.0))))
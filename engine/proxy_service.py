@@ -0,0 +1,154 @@
+# engine/proxy_service.py
+import os
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+from PySide6.QtCore import QObject, Signal
+
+from engine.cache_paths import get_cache_dir, file_signature
+
+
+class ProxyService(QObject):
+    """
+    Generator proxy media di background.
+    Video import (mis. 4K HEVC dari HP) di-transcode ke resolusi kecil dengan
+    GOP pendek / all-intra supaya decode preview + scrub murah.
+    Render tetap memakai file original.
+    """
+    sig_proxy_progress = Signal(str, int)    # source_path, persen
+    sig_proxy_ready = Signal(str, str)       # source_path, proxy_path
+    sig_proxy_failed = Signal(str, str)      # source_path, pesan error
+
+    def __init__(self, max_jobs: int = 2, max_dimension: int = 960, gop: int = 1):
+        super().__init__()
+        self.max_dimension = max_dimension
+        self.gop = gop  # 1 = all-intra
+        self.cache_dir = get_cache_dir("proxy")
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="ProxyJob")
+        self._jobs = {}        # source_path -> Future
+        self._processes = {}   # source_path -> Popen
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    # ---------- API ----------
+    def proxy_path_for(self, source_path: str) -> str:
+        sig = file_signature(source_path)
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(self.cache_dir, f"{name}_{sig}_proxy.mp4")
+
+    def request_proxy(self, source_path: str):
+        """Minta proxy; kalau sudah ada di cache langsung sig_proxy_ready."""
+        if not source_path or not os.path.exists(source_path): return
+
+        proxy_path = self.proxy_path_for(source_path)
+        if os.path.exists(proxy_path):
+            self.sig_proxy_ready.emit(source_path, proxy_path)
+            return
+
+        with self._lock:
+            if source_path in self._jobs: return
+            self._jobs[source_path] = self._executor.submit(self._run_job, source_path, proxy_path)
+
+    def cancel_all(self):
+        self._cancelled = True
+        with self._lock:
+            for fut in self._jobs.values():
+                fut.cancel()
+            running = list(self._processes.items())
+            for _, proc in running:
+                try: proc.kill()
+                except Exception: pass
+        # File .part proxy setengah jadi dibuang (tunggu ffmpeg benar-benar mati: di Windows file masih terkunci)
+        for source_path, proc in running:
+            try: proc.wait(timeout=2.0)
+            except Exception: pass
+            try: self._remove_part(self.proxy_path_for(source_path))
+            except OSError: pass  # source sudah hilang -> nama proxy tidak bisa dihitung lagi
+        self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _remove_part(proxy_path: str):
+        tmp_path = proxy_path + ".part.mp4"
+        if os.path.exists(tmp_path):
+            try: os.remove(tmp_path)
+            except OSError: pass
+
+    # ---------- JOB ----------
+    def _target_size(self, width: int, height: int):
+        longest = max(width, height)
+        if longest <= self.max_dimension:
+            return None  # sudah kecil, proxy tidak ada gunanya
+        k = self.max_dimension / float(longest)
+        # libx264 + yuv420p butuh dimensi genap
+        return max(2, int(width * k) // 2 * 2), max(2, int(height * k) // 2 * 2)
+
+    def _run_job(self, source_path: str, proxy_path: str):
+        try:
+            cap = cv2.VideoCapture(source_path)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30
+            frames = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+            cap.release()
+
+            size = self._target_size(width, height)
+            if size is None:
+                self.sig_proxy_failed.emit(source_path, "Source sudah resolusi rendah")
+                return
+
+            duration_us = (frames / fps) * 1_000_000 if frames > 0 else 0
+            tmp_path = proxy_path + ".part.mp4"
+            cmd = [
+                'ffmpeg', '-y', '-i', source_path, '-an',
+                '-vf', f'scale={size[0]}:{size[1]}',
+                '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'fastdecode',
+                '-g', str(self.gop), '-keyint_min', str(self.gop), '-bf', '0',
+                '-pix_fmt', 'yuv420p',
+                '-progress', 'pipe:1', '-nostats', tmp_path
+            ]
+
+            creation_flags = 0
+            if os.name == 'nt': creation_flags = subprocess.CREATE_NO_WINDOW
+
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                universal_newlines=True, creationflags=creation_flags
+            )
+            with self._lock:
+                self._processes[source_path] = proc
+                # cancel_all jalan selagi job ini baru mulai -> ffmpeg tidak boleh jalan sampai selesai
+                if self._cancelled: proc.kill()
+
+            last_pct = -1
+            for line in proc.stdout:
+                # ffmpeg -progress: out_time_ms sebenarnya dalam mikrodetik
+                if line.startswith("out_time_ms=") and duration_us > 0:
+                    try: done = int(line.split("=", 1)[1])
+                    except ValueError: continue
+                    pct = max(0, min(99, int(done * 100 / duration_us)))
+                    if pct != last_pct:
+                        last_pct = pct
+                        self.sig_proxy_progress.emit(source_path, pct)
+            proc.wait()
+
+            if self._cancelled:
+                self._remove_part(proxy_path)
+                return
+            if proc.returncode != 0 or not os.path.exists(tmp_path):
+                if os.path.exists(tmp_path): os.remove(tmp_path)
+                self.sig_proxy_failed.emit(source_path, f"ffmpeg exit code {proc.returncode}")
+                return
+
+            os.replace(tmp_path, proxy_path)
+            self.sig_proxy_progress.emit(source_path, 100)
+            self.sig_proxy_ready.emit(source_path, proxy_path)
+
+        except Exception as e:
+            self.sig_proxy_failed.emit(source_path, str(e))
+        finally:
+            with self._lock:
+                self._jobs.pop(source_path, None)
+                self._processes.pop(source_path, None)
@@ -1,6 +1,7 @@
 
 import av
-from engine.frame_cache import FrameCache
+from engine.frame_cache import FrameCache, time_to_frame_index
+from engine.media_index import get_media_index, IndexedDecoder
 
 
 class PyAVClip:
@@ -25,9 +26,28 @@ class PyAVClip:
         # ---------------------------------------
 
         self.fps = fps
-        self.cache = FrameCache(max_frames=180)
+        # fps asli media untuk index frame cache (bukan fps project)
+        rate = self.stream.average_rate
+        self.media_fps = float(rate) if rate else float(fps)
+        self.cache = FrameCache(name="pyav_clip")
+
+        # Index PTS/keyframe (persisten): seek langsung ke GOP yang benar, juga untuk VFR
+        self.index = get_media_index(path)
+        self.decoder = IndexedDecoder(self.container, self.stream, self.index) if self.index else None
+
+    def _frame_index(self, t):
+        if self.index is not None:
+            return self.index.frame_at_time(t)
+        return time_to_frame_index(t, self.media_fps)
+
+    def _decode_index(self, idx):
+        if self.decoder is not None:
+            frame = self.decoder.frame_at(idx)
+            return frame.to_ndarray(format="rgb24") if frame is not None else None
+        return self._decode_frame(idx / self.media_fps)
 
     def _decode_frame(self, t):
+        """Fallback tanpa index: seek mundur ke keyframe lalu decode maju."""
         pts = int(t / self.time_base)
         self.container.seek(
             pts,
@@ -36,20 +56,23 @@ class PyAVClip:
             backward=True
         )
 
+        # Toleransi setengah frame: pts * time_base jarang sama persis dengan idx / fps
+        tolerance = 0.5 / self.media_fps
         for frame in self.container.decode(self.stream):
             ft = frame.pts * self.time_base
-            if ft >= t:
+            if ft >= t - tolerance:
                 return frame.to_ndarray(format="rgb24")
         return None
 
     def get_frame_at(self, t):
-        cached = self.cache.get(t)
+        idx = self._frame_index(t)
+        cached = self.cache.get(idx)
         if cached is not None:
             return cached
 
-        frame = self._decode_frame(t)
+        frame = self._decode_index(idx)
         if frame is not None:
-            self.cache.put(t, frame)
+            self.cache.put(idx, frame)
 
         return frame
 
@@ -58,11 +81,11 @@ class PyAVClip:
         Prefetch frame ke depan (1 detik default)
         """
         step = 1.0 / self.fps
-        t = start_t
 
-        for _ in range(int(duration * self.fps)):
-            if self.cache.get(t) is None:
-                frame = self._decode_frame(t)
+        for i in range(int(duration * self.fps)):
+            t = start_t + i * step
+            idx = self._frame_index(t)
+            if self.cache.get(idx) is None:
+                frame = self._decode_index(idx)
                 if frame is not None:
-                    self.cache.put(t, frame)
-            t += step
+                    self.cache.put(idx, frame)
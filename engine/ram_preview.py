@@ -0,0 +1,308 @@
+# engine/ram_preview.py
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from engine.cache_paths import file_signature
+from engine.disk_frame_cache import DiskFrameCache
+from engine.frame_cache import FrameCache
+from engine.numpy_compositor import NumpyCompositor
+from engine.render_engine import RenderEngine
+from engine.render_plan import RenderPlan, first_frame_at
+
+
+DEFAULT_BUDGET_MB = 512
+CACHE_SIGNAL_INTERVAL = 0.25  # detik; sig_cache_changed dari worker paling sering segini
+SPILL_BACKLOG = 64            # frame antri ke disk; lebih dari ini frame evict dibuang (dikomposit ulang)
+# Payload yang tidak mengubah pixel frame (waktu lokal dihitung terpisah)
+NON_RENDER_KEYS = ("start_time", "duration", "track_index", "z_index", "volume", "mute", "path")
+
+
+class RamPreviewService(QObject):
+    """
+    RAM preview: komposit kanvas penuh rentang in/out di thread background
+    (NumpyCompositor, resolusi preview) ke FrameCache "ram_preview".
+    Playback di rentang itu cukup blit 1 gambar per frame, tanpa decode / effect / chroma.
+
+    Cache per index frame; perubahan layer hanya membuang frame di rentang waktu
+    layer itu (invalidate). Frame yang sedang dikomposit saat ada invalidate
+    dikerjakan ulang dengan plan baru, jadi tidak ada frame basi yang masuk cache.
+
+    Frame yang ter-evict dari RAM di-spill ke DiskFrameCache (mmap) dengan key hash
+    input render frame, jadi project 3 menit tetap muat dan frame yang tidak berubah
+    dipakai lagi di sesi berikutnya. Tulis ke disk jalan di thread writer sendiri:
+    eviction bisa dipicu cache lain di GUI thread.
+    """
+    sig_progress = Signal(int, int)     # frame selesai, total frame rentang
+    sig_cache_changed = Signal()        # isi cache berubah (bar hijau LayerPanel), di-throttle selama komposit
+    sig_finished = Signal(bool)         # True = selesai, False = dibatalkan
+
+    def __init__(self, timeline, video_service, budget_mb=DEFAULT_BUDGET_MB, threads=1, disk_quota_mb=None):
+        super().__init__()
+        self.timeline = timeline
+        self.engine = RenderEngine(timeline, video_service)
+        self.threads = max(1, int(threads))
+        self.cache = FrameCache(name="ram_preview", max_bytes=int(budget_mb * 1024 * 1024))
+        self.cache.on_evict = self._spill
+
+        # Tier disk (None = default quota, 0 = nonaktif)
+        self.disk = None
+        if disk_quota_mb is None or disk_quota_mb > 0:
+            self.disk = DiskFrameCache(**({} if disk_quota_mb is None else {"quota_mb": disk_quota_mb}))
+        self._keys = {}             # index frame -> hash input render (frame di RAM / disk)
+        self._signatures = {}       # path media -> file_signature (per run)
+        self._spilling = {}         # hash -> frame yang masih antri ditulis ke disk
+        self._spill_queue = queue.Queue()
+        self._spill_thread = None
+        if self.disk is not None:
+            self._spill_thread = threading.Thread(target=self._write_spills, name="RamPreviewSpill", daemon=True)
+            self._spill_thread.start()
+
+        # Setting kanvas cache saat ini (cache dibuang kalau berubah)
+        self.fps = 30.0
+        self.size = (0, 0)          # (w, h) kanvas project
+        self.scale = 1.0            # skala preview (kanvas cache = size * scale)
+        self.canvas_size = (0, 0)   # (w, h) kanvas cache
+
+        self._lock = threading.RLock()  # cache.put di dalam lock bisa memicu _spill -> _forget
+        self._version = 0           # naik tiap invalidate
+        self._cancel = threading.Event()
+        self._thread = None
+        self._last_cache_signal = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ---------- API ----------
+    def start(self, t_in: float, t_out: float, fps: float, width: int, height: int, scale: float = 1.0):
+        """Mulai komposit rentang [t_in, t_out) di background (frame yang sudah ada di-skip)."""
+        self.cancel()
+        settings = (float(fps), (int(width), int(height)), float(scale))
+        if settings != (self.fps, self.size, self.scale):
+            self.fps, self.size, self.scale = settings
+            self.clear()
+
+        f0 = first_frame_at(max(0.0, t_in), self.fps)
+        f1 = first_frame_at(t_out, self.fps)
+        if f1 <= f0: return False
+
+        w, h = self.size
+        self.canvas_size = (max(2, int(round(w * self.scale))), max(2, int(round(h * self.scale))))
+        if self.disk is not None:
+            self.disk.configure(*self.canvas_size)
+        self._signatures.clear()  # media yang diedit di luar app dapat signature baru
+
+        self._cancel.clear()
+        self._thread = threading.Thread(target=self._run, args=(f0, f1), name="RamPreview", daemon=True)
+        self._thread.start()
+        return True
+
+    def cancel(self):
+        self._cancel.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def image_at(self, t: float):
+        """
+        QImage BGR888 kanvas waktu t kalau sudah di cache (RAM, lalu disk), selain itu None.
+        Frame disk membaca mmap langsung (slot di-pin): panggil release_image setelah
+        QPixmap.fromImage.
+        """
+        if not self._keys: return None
+        f = round(t * self.fps)
+        frame = self.cache.get(f) if f in self.cache else None
+        if frame is None and self.disk is not None:
+            key = self._keys.get(f)
+            if key is not None:
+                frame = self._spilling.get(key)
+                if frame is None:
+                    return self.disk.get_image(key)  # view mmap, tanpa copy
+        if frame is None: return None
+        h, w = frame.shape[:2]
+        qimg = QImage(frame.data, w, h, frame.strides[0], QImage.Format_BGR888)
+        qimg._buffer = frame  # pegang array selama QImage hidup
+        return qimg
+
+    def release_image(self, image):
+        """Lepas pin slot disk dari image_at (frame RAM tidak perlu dilepas)."""
+        if self.disk is not None:
+            self.disk.release(image)
+
+    def invalidate(self, t0: float, t1: float):
+        """Buang frame yang menampilkan waktu [t0, t1) (rentang layer yang berubah)."""
+        f0 = first_frame_at(t0, self.fps)
+        f1 = max(f0 + 1, first_frame_at(t1, self.fps))
+        with self._lock:
+            self._version += 1
+            dropped = [f for f in self._keys if f0 <= f < f1]
+            for f in dropped:
+                del self._keys[f]
+        self.cache.remove_if(lambda f: f0 <= f < f1)
+        if dropped:
+            self.sig_cache_changed.emit()
+
+    def clear(self):
+        """Lupakan semua frame RAM (isi tier disk tetap, key-nya hash input render)."""
+        with self._lock:
+            self._version += 1
+            self._keys.clear()
+        self.cache.clear()
+        self.sig_cache_changed.emit()
+
+    def shutdown(self):
+        """Tutup app: frame yang masih di RAM ikut ditulis ke disk supaya bisa dipakai sesi berikutnya."""
+        self.cancel()
+        if self.disk is None: return
+        # Habiskan antrian writer dulu, sisanya ditulis langsung (app sudah mau tutup)
+        self._spill_queue.put(None)
+        self._spill_thread.join()
+        for f in self.cache.keys():
+            frame = self.cache.get(f)
+            key = self._keys.get(f)
+            if frame is not None and key is not None: self.disk.put(key, frame)
+        self.disk.close()
+
+    def cached_ranges(self):
+        """Rentang waktu [(t0, t1)] yang frame-nya ada di cache RAM / disk (urut)."""
+        with self._lock:
+            keys = dict(self._keys)
+        disk = self.disk
+        in_ram = set(self.cache.keys())  # satu kali lock cache, bukan per frame
+        frames = [f for f, key in keys.items()
+                  if f in in_ram or (disk is not None and (key in self._spilling or key in disk))]
+        ranges = []
+        for f in sorted(frames):
+            if ranges and ranges[-1][1] == f:
+                ranges[-1][1] = f + 1
+            else:
+                ranges.append([f, f + 1])
+        return [(a / self.fps, b / self.fps) for a, b in ranges]
+
+    # ---------- WORKER ----------
+    def _run(self, f0: int, f1: int):
+        w = self.size[0]
+        canvas_w, canvas_h = self.canvas_size
+        canvas_scale = canvas_w / float(w) if w else self.scale
+        compositor = NumpyCompositor(canvas_w, canvas_h, threads=self.threads)
+
+        plan, plan_version = None, None
+        total = f1 - f0
+        f = f0
+        try:
+            while f < f1:
+                if self._cancel.is_set(): return
+                with self._lock:
+                    version = self._version
+                if plan_version != version:
+                    # Timeline berubah: compile ulang sisa rentang
+                    plan = RenderPlan.compile(list(self.timeline.layers), self.fps, f, f1)
+                    plan_version = version
+
+                interval = plan.interval_at(f)
+                layers = interval.layers if interval else []
+                key = self._frame_key(layers, f)
+                if f in self.cache and self._keys.get(f) == key:
+                    pass
+                elif self.disk is not None and key in self.disk:
+                    # Input render sama dengan frame di disk (sesi sebelumnya) -> tidak dikomposit
+                    with self._lock:
+                        if self._version != version: continue
+                        self._keys[f] = key
+                    self._cache_changed()
+                else:
+                    canvas = self.engine.compose_frame(compositor, layers, f / self.fps,
+                                                       canvas_scale=canvas_scale, preview=True)
+                    with self._lock:
+                        if self._version != version: continue  # di-invalidate selagi komposit -> ulang
+                        self._keys[f] = key
+                        self.cache.put(f, canvas)
+                    self._cache_changed()
+
+                f += 1
+                self.sig_progress.emit(f - f0, total)
+        except Exception as e:
+            print(f"[RAM PREVIEW] Error: {e}")
+            self._cancel.set()
+        finally:
+            compositor.close()
+            if self.disk is not None:
+                self.disk.flush()
+            self._cache_changed(force=True)  # frame terakhir yang masih tertahan throttle
+            self.sig_finished.emit(not self._cancel.is_set())
+
+    def _cache_changed(self, force: bool = False):
+        """
+        Throttle sig_cache_changed dari worker: tiap signal membuat GUI menghitung
+        ulang cached_ranges (O(jumlah frame)), jadi per frame = O(n^2) selama komposit.
+        """
+        now = time.monotonic()
+        if force or now - self._last_cache_signal >= CACHE_SIGNAL_INTERVAL:
+            self._last_cache_signal = now
+            self.sig_cache_changed.emit()
+
+    def _frame_key(self, layers, frame_idx: int) -> str:
+        """Hash semua input yang menentukan pixel frame (media, waktu lokal, payload, kanvas)."""
+        t = frame_idx / self.fps
+        parts = [self.size, self.canvas_size]
+        for entry in layers:
+            layer = entry.layer
+            payload = {k: v for k, v in layer.payload.items() if k not in NON_RENDER_KEYS}
+            source = None
+            if layer.type in ("video", "image"):
+                path = layer.payload.get("path")
+                local_t = round(t - entry.params.start_time, 6) if layer.type == "video" else None
+                source = (self._signature(path), local_t)
+            parts.append((layer.type, source, json.dumps(payload, sort_keys=True, default=str)))
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def _signature(self, path):
+        if not path: return None
+        sig = self._signatures.get(path)
+        if sig is None:
+            sig = file_signature(path) if os.path.exists(path) else path
+            self._signatures[path] = sig
+        return sig
+
+    def _spill(self, frame_idx, frame):
+        """
+        FrameCache.on_evict: frame yang keluar dari RAM diantrikan ke thread writer
+        (hanya push ke queue; dipanggil di thread mana pun yang memicu eviction).
+        """
+        key = self._keys.get(frame_idx)
+        if key is None or self.disk is None: return
+        if len(self._spilling) >= SPILL_BACKLOG:
+            # Disk tertinggal jauh: frame dilepas, nanti dikomposit ulang
+            self._forget(frame_idx, key)
+            return
+        self._spilling[key] = frame
+        self._spill_queue.put((frame_idx, key, frame))
+
+    def _write_spills(self):
+        """Thread writer: tulis frame spill ke DiskFrameCache (mmap) satu per satu."""
+        while True:
+            job = self._spill_queue.get()
+            if job is None: return
+            frame_idx, key, frame = job
+            try:
+                ok = self.disk.put(key, frame)
+            except Exception as e:
+                print(f"[RAM PREVIEW] Spill error: {e}")
+                ok = False
+            self._spilling.pop(key, None)
+            if not ok:
+                self._forget(frame_idx, key)
+                self.sig_cache_changed.emit()
+
+    def _forget(self, frame_idx, key):
+        """Buang mapping frame -> hash kalau masih menunjuk frame yang sama."""
+        with self._lock:
+            if self._keys.get(frame_idx) == key:
+                del self._keys[frame_idx]
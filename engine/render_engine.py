@@ -4,17 +4,91 @@ import numpy as np
 import subprocess
 import os
 import tempfile
-from PySide6.QtGui import QImage, QPainter, QColor, QFont, QPen, QFontMetrics
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPainter, QColor
+from PySide6.QtCore import Qt, QPointF
 
 from engine.ffmpeg_renderer import FFmpegRenderer
 from engine.chroma_processor import ChromaProcessor
+from engine.render_pipeline import RenderPipeline
+from engine.numpy_compositor import NumpyCompositor, CompositeItem, scale_item
+from engine.layer_plates import PlateCache
+from engine.render_plan import RenderPlan, LayerParams
+from engine.text.raster_cache import TextRasterCache
+
+# Default render paralel (bisa di-override lewat settings "workers" / "segment_seconds")
+DEFAULT_SEGMENT_SECONDS = 10.0
+WORKER_CACHE_MB = 256  # budget cache frame per proses worker
+# Key settings yang ikut dikirim ke worker segmen
+RENDER_OPTION_KEYS = ("pipeline_queue", "compositor", "compose_threads")
+
+
+class RenderCancelled(Exception):
+    pass
+
+
+def _render_segment_job(job):
+    """
+    Entry point proses worker (spawn): render satu segmen frame ke file video sendiri.
+    Tiap worker punya VideoService (decoder + cache) dan encoder ffmpeg sendiri.
+    """
+    from PySide6.QtGui import QGuiApplication
+    from manager.timeline.timeline_engine import TimelineEngine
+    from engine.video_service import VideoService
+    from engine.cache_manager import CacheManager
+
+    options = job.get("options", {})
+    use_numpy = options.get("compositor") == "numpy"
+
+    # QPainter / QImage butuh QGuiApplication; worker tidak punya window.
+    # Compositor NumPy tidak butuh Qt sama sekali (sprite text dikirim dari proses utama).
+    app = QGuiApplication.instance()
+    if app is None and not use_numpy:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication([])
+
+    CacheManager.instance().set_budget_mb(job.get("cache_mb", WORKER_CACHE_MB))
+    if job.get("text_sprites"):
+        TextRasterCache.instance().preload(job["text_sprites"])
+
+    timeline = TimelineEngine()
+    video_service = VideoService()
+    for layer in job["layers"]:
+        timeline.add_layer(layer)
+        path = layer.payload.get("path")
+        if layer.type in ['video', 'image'] and path:
+            video_service.register_source(layer.id, path)
+
+    progress_queue = job["progress_queue"]
+    cancel_event = job["cancel_event"]
+    seg_idx = job["segment"]
+    report_every = max(1, int(job["fps"]))
+
+    def on_frame(done):
+        if cancel_event.is_set(): raise RenderCancelled()
+        if done % report_every == 0:
+            progress_queue.put((seg_idx, done))
+
+    engine = RenderEngine(timeline, video_service)
+    renderer = FFmpegRenderer(job["output_path"], job["width"], job["height"], job["fps"],
+                              pix_fmt="bgr24" if use_numpy else "rgb24")
+    renderer.start_process()
+    try:
+        engine._render_range(renderer, job["start_frame"], job["end_frame"],
+                             job["fps"], job["width"], job["height"], on_frame, options)
+    finally:
+        renderer.close_process()
+        video_service.release_all()
+
+    progress_queue.put((seg_idx, job["end_frame"] - job["start_frame"]))
+    return job["output_path"]
+
 
 class RenderEngine:
     def __init__(self, timeline, video_service):
         self.timeline = timeline
         self.video_service = video_service
         self.renderer = None 
+        self.pipeline = None  # RenderPipeline terakhir (statistik occupancy per stage)
 
     def render(self, output_path, settings, callback=None):
         fps = settings.get("fps", 30)
@@ -24,45 +98,34 @@ class RenderEngine:
         duration = self.timeline.get_total_duration()
         total_frames = int(duration * fps)
         if total_frames == 0: total_frames = 1
+
+        workers = self._resolve_workers(settings.get("workers", 1))
+        segment_frames = max(1, int(float(settings.get("segment_seconds", DEFAULT_SEGMENT_SECONDS)) * fps))
+        if workers > 1 and total_frames > segment_frames:
+            options = {k: settings[k] for k in RENDER_OPTION_KEYS if k in settings}
+            return self._render_parallel(output_path, fps, width, height, total_frames,
+                                         workers, segment_frames, callback, options)
                 
         print("🔊 Processing Audio Mix...")
         temp_audio_path = os.path.join(tempfile.gettempdir(), "mamen_mix_temp.aac")
         has_audio = self._mix_audio(temp_audio_path)
 
         print(f"[RENDER] Init FFmpeg: {width}x{height} @ {fps}fps")
-        self.renderer = FFmpegRenderer(output_path, width, height, fps)
+        use_numpy = settings.get("compositor") == "numpy"
+        self.renderer = FFmpegRenderer(output_path, width, height, fps,
+                                       pix_fmt="bgr24" if use_numpy else "rgb24")
         
         if has_audio:
             self.renderer.start_process(audio_path=temp_audio_path, audio_delay_ms=0)
         else:
             self.renderer.start_process() 
 
+        def on_frame(done):
+            if callback:
+                callback(int((done / total_frames) * 100))
+
         try:
-            for frame_idx in range(total_frames):
-                current_time = frame_idx / float(fps)
-                
-                active_layers = self.timeline.get_active_layers(current_time)
-                active_layers.sort(key=lambda x: x.z_index) 
-                
-                canvas = QImage(width, height, QImage.Format_ARGB32)
-                canvas.fill(QColor(0, 0, 0, 255)) 
-                painter = QPainter(canvas)
-                
-                painter.setRenderHint(QPainter.Antialiasing)
-                painter.setRenderHint(QPainter.SmoothPixmapTransform)
-                
-                for layer in active_layers:
-                    self._draw_layer(painter, layer, current_time)
-                
-                painter.end()
-                
-                rgb_image = canvas.convertToFormat(QImage.Format_RGB888)
-                raw_bytes = rgb_image.constBits().tobytes()
-                self.renderer.write_frame(raw_bytes)
-                
-                if callback:
-                    percent = int((frame_idx / total_frames) * 100)
-                    callback(percent)
+            self._render_range(self.renderer, 0, total_frames, fps, width, height, on_frame, settings)
                     
         except Exception as e:
             print(f"🔥 Render Error: {e}")
@@ -78,78 +141,410 @@ class RenderEngine:
                 try: os.remove(temp_audio_path)
                 except: pass
 
-    def _draw_layer(self, painter, layer, global_time):
+    def _render_range(self, renderer, start_frame, end_frame, fps, width, height, on_frame=None,
+                      options=None):
+        """
+        Render frame [start_frame, end_frame) ke renderer. on_frame(jumlah frame selesai).
+        Pipeline: schedule -> decode (frame + effect) -> composite
+        -> convert (bytes) -> write (pipe ffmpeg), tiap stage di thread sendiri.
+        options["compositor"] = "numpy": komposit NumPy/cv2 (output BGR, renderer bgr24),
+        default QPainter (output RGB888).
+        """
+        options = options or {}
+        if options.get("compositor") == "numpy":
+            return self._render_range_numpy(renderer, start_frame, end_frame, fps, width, height,
+                                            on_frame, options)
+
+        plan = RenderPlan.compile(self.timeline.layers, fps, start_frame, end_frame)
+        schedule = self._make_scheduler(fps)
+        last = {"bytes": None}
+
+        def build_plate(layers, bottom, current_time):
+            plate = QImage(width, height, QImage.Format_ARGB32 if bottom else QImage.Format_ARGB32_Premultiplied)
+            plate.fill(QColor(0, 0, 0, 255) if bottom else QColor(0, 0, 0, 0))
+            painter = self._begin_painter(plate)
+            for entry in layers:
+                self._paint_layer(painter, self._prepare_layer(entry.layer, current_time, entry.params))
+            painter.end()
+            return plate
+
+        plates = PlateCache(build_plate)
+
+        def decode(job):
+            frame_idx, current_time, active_layers, repeat = job
+            if repeat: return frame_idx, None
+            ops = []
+            for kind, entry in plates.resolve(active_layers, current_time):
+                if kind == "plate":
+                    ops.append({"kind": "plate", "image": entry.image, "bottom": entry.bottom})
+                else:
+                    ops.append(self._prepare_layer(entry.layer, current_time, entry.params))
+            return frame_idx, ops
+
+        def composite(job):
+            frame_idx, ops = job
+            if ops is None: return job  # frame statis berulang -> tidak dikomposit
+            if ops and ops[0] is not None and ops[0]["kind"] == "plate" and ops[0]["bottom"]:
+                # Plate bawah sudah opaque (termasuk background) -> cukup di-copy
+                canvas = ops[0]["image"].copy()
+                ops = ops[1:]
+            else:
+                canvas = QImage(width, height, QImage.Format_ARGB32)
+                canvas.fill(QColor(0, 0, 0, 255))
+            painter = self._begin_painter(canvas)
+            for op in ops:
+                self._paint_layer(painter, op)
+            painter.end()
+            return frame_idx, canvas
+
+        def convert(job):
+            frame_idx, canvas = job
+            if canvas is not None:
+                rgb_image = canvas.convertToFormat(QImage.Format_RGB888)
+                last["bytes"] = rgb_image.constBits().tobytes()
+            return frame_idx, last["bytes"]
+
+        def write(job):
+            frame_idx, raw_bytes = job
+            renderer.write_frame(raw_bytes)
+            if on_frame:
+                on_frame(frame_idx - start_frame)
+
+        self.pipeline = RenderPipeline([
+            ("schedule", schedule),
+            ("decode", decode),
+            ("composite", composite),
+            ("convert", convert),
+            ("write", write),
+        ], queue_size=options.get("pipeline_queue", 8))
+        try:
+            self.pipeline.run(plan.frames())
+        finally:
+            self._print_report(start_frame, end_frame, schedule, plates)
+
+    def _render_range_numpy(self, renderer, start_frame, end_frame, fps, width, height, on_frame, options):
+        """Pipeline yang sama dengan _render_range, komposit pakai NumpyCompositor (tanpa QImage)."""
+        compositor = NumpyCompositor(width, height, threads=int(options.get("compose_threads", 1)))
+
+        plan = RenderPlan.compile(self.timeline.layers, fps, start_frame, end_frame)
+        schedule = self._make_scheduler(fps)
+        last = {"bytes": None}
+
+        def build_plate(layers, bottom, current_time):
+            items = [self._prepare_item(entry.layer, current_time, entry.params) for entry in layers]
+            return compositor.compose(items, transparent=not bottom)
+
+        plates = PlateCache(build_plate)
+
+        def decode(job):
+            frame_idx, current_time, active_layers, repeat = job
+            if repeat: return frame_idx, None
+            items = []
+            for kind, entry in plates.resolve(active_layers, current_time):
+                if kind == "plate":
+                    # Plate kanvas penuh di (0, 0): bawah = copy BGR, atas = blend BGRA
+                    items.append(CompositeItem(entry.image, width, height))
+                else:
+                    items.append(self._prepare_item(entry.layer, current_time, entry.params))
+            return frame_idx, items
+
+        def composite(job):
+            frame_idx, items = job
+            if items is None: return job  # frame statis berulang -> tidak dikomposit
+            return frame_idx, compositor.compose(items)
+
+        def convert(job):
+            frame_idx, canvas = job
+            if canvas is not None:
+                last["bytes"] = canvas.tobytes()
+            return frame_idx, last["bytes"]
+
+        def write(job):
+            frame_idx, raw_bytes = job
+            renderer.write_frame(raw_bytes)
+            if on_frame:
+                on_frame(frame_idx - start_frame)
+
+        self.pipeline = RenderPipeline([
+            ("schedule", schedule),
+            ("decode", decode),
+            ("composite", composite),
+            ("convert", convert),
+            ("write", write),
+        ], queue_size=options.get("pipeline_queue", 8))
+        try:
+            self.pipeline.run(plan.frames())
+        finally:
+            compositor.close()
+            self._print_report(start_frame, end_frame, schedule, plates)
+
+    def _make_scheduler(self, fps):
+        """
+        Stage schedule: (frame_idx, FrameInterval) dari RenderPlan
+        -> (frame_idx, waktu, layer aktif urut z, repeat).
+        repeat=True kalau frame masih di interval statis yang sama dengan frame
+        sebelumnya -> frame identik, buffer terakhir dipakai ulang tanpa
+        decode / komposit / konversi (slide quote, gambar + text).
+        """
+        state = {"interval": None}
+
+        def schedule(item):
+            frame_idx, interval = item
+            repeat = interval.static and interval is state["interval"]
+            state["interval"] = interval
+            if repeat: schedule.repeated += 1
+            return frame_idx, frame_idx / float(fps), interval.layers, repeat
+
+        schedule.repeated = 0
+        return schedule
+
+    def _print_report(self, start_frame, end_frame, schedule, plates):
+        print(f"[RENDER] Stage occupancy frame {start_frame}-{end_frame}:\n{self.pipeline.format_report()}")
+        if schedule.repeated:
+            print(f"[RENDER] Frame statis dipakai ulang: {schedule.repeated}/{end_frame - start_frame}")
+        if plates.built:
+            print(f"[RENDER] Plate layer statis dibuat: {plates.built}")
+
+    @staticmethod
+    def _begin_painter(image):
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        return painter
+
+    # =====================
+    # PARALLEL (SEGMENT)
+    # =====================
+    @staticmethod
+    def _resolve_workers(workers):
+        if workers in (None, 0, "auto"):
+            return max(1, (os.cpu_count() or 2) - 1)
+        return max(1, int(workers))
+
+    def _render_parallel(self, output_path, fps, width, height, total_frames,
+                         workers, segment_frames, callback=None, options=None):
+        """
+        Timeline dipotong per segment_frames, tiap segmen di-render proses worker
+        sendiri (decoder + encoder sendiri), lalu disambung lossless dengan
+        concat demuxer ffmpeg (-c copy) + audio mix di akhir.
+        """
+        import multiprocessing
+        import shutil
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_EXCEPTION
+
+        work_dir = tempfile.mkdtemp(prefix="mamen_segments_")
+        temp_audio_path = os.path.join(work_dir, "mix.aac")
+        layers = list(self.timeline.layers)
+
+        segments = []
+        for seg_idx, start in enumerate(range(0, total_frames, segment_frames)):
+            segments.append((seg_idx, start, min(total_frames, start + segment_frames)))
+
+        print(f"[RENDER] Parallel: {len(segments)} segmen, {workers} worker, {width}x{height} @ {fps}fps")
+
+        # spawn: aman dipakai dari proses yang sudah menjalankan thread Qt
+        ctx = multiprocessing.get_context("spawn")
+        manager = ctx.Manager()
+        progress_queue = manager.Queue()
+        cancel_event = manager.Event()
+        done_per_segment = {}
+
+        use_numpy = (options or {}).get("compositor") == "numpy"
+        text_layers = [l for l in layers if l.type in ('text', 'caption')]
+
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        futures = []
+        try:
+            for seg_idx, start, end in segments:
+                # Worker NumPy tanpa Qt: sprite text segmen ini di-raster di proses utama
+                t0, t1 = start / float(fps), end / float(fps)
+                sprites = TextRasterCache.instance().collect(
+                    l.payload for l in text_layers if l.time.start < t1 and l.time.end > t0
+                ) if use_numpy else None
+                futures.append(executor.submit(_render_segment_job, {
+                    "segment": seg_idx,
+                    "layers": layers,
+                    "start_frame": start,
+                    "end_frame": end,
+                    "fps": fps,
+                    "width": width,
+                    "height": height,
+                    "output_path": os.path.join(work_dir, f"seg_{seg_idx:05d}.mp4"),
+                    "progress_queue": progress_queue,
+                    "cancel_event": cancel_event,
+                    "options": options or {},
+                    "text_sprites": sprites,
+                }))
+
+            # Audio mix jalan di proses utama sementara worker render video
+            print("🔊 Processing Audio Mix...")
+            has_audio = self._mix_audio(temp_audio_path)
+
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_EXCEPTION)
+                for fut in finished:
+                    fut.result()  # lempar error worker ke sini
+                while not progress_queue.empty():
+                    seg_idx, done = progress_queue.get_nowait()
+                    done_per_segment[seg_idx] = done
+                if callback:
+                    # Sisakan 1% untuk proses concat
+                    callback(min(99, int(sum(done_per_segment.values()) / total_frames * 100)))
+
+            segment_paths = [f.result() for f in futures]
+            self._concat_segments(segment_paths, output_path, work_dir,
+                                  temp_audio_path if has_audio else None)
+            if callback: callback(100)
+
+        except BaseException:
+            cancel_event.set()
+            for fut in futures:
+                fut.cancel()
+            raise
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            manager.shutdown()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _concat_segments(self, segment_paths, output_path, work_dir, audio_path=None):
+        list_path = os.path.join(work_dir, "segments.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for seg in segment_paths:
+                safe = seg.replace("\\", "/").replace("'", "'\\''")
+                f.write(f"file '{safe}'\n")
+
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_path]
+        if audio_path and os.path.exists(audio_path):
+            cmd.extend(['-i', audio_path, '-map', '0:v', '-map', '1:a', '-c:v', 'copy',
+                        '-c:a', 'aac', '-b:a', '192k', '-ac', '2'])
+        else:
+            cmd.extend(['-map', '0:v', '-c:v', 'copy'])
+        cmd.append(output_path)
+
+        print(f"[FFMPEG] {' '.join(cmd)}")
+        creation_flags = 0
+        if os.name == 'nt': creation_flags = subprocess.CREATE_NO_WINDOW
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, creationflags=creation_flags)
+        if result.returncode != 0:
+            raise RuntimeError(f"Concat segmen gagal (ffmpeg exit code {result.returncode})")
+
+    def _prepare_layer(self, layer, global_time, params: LayerParams = None):
+        """
+        Bagian berat per layer (decode + effect + chroma, raster text),
+        tanpa QPainter -> bisa jalan di stage decode, terpisah dari composite.
+        params: hasil compile RenderPlan (None -> parse payload sekarang).
+        Return dict op gambar, atau None kalau layer tidak menggambar apa-apa.
+        """
         props = layer.payload
         layer_type = layer.type
+        if params is None: params = LayerParams.from_payload(props)
         
-        x = float(props.get("x", 0))
-        y = float(props.get("y", 0))
-        scale = float(props.get("scale", 100)) / 100.0
-        rotation = float(props.get("rotation", 0))
-        opacity = float(props.get("opacity", 1.0))
-        
-        painter.save()
+        op = params.transform()
         
         if layer_type in ['video', 'image']:
             path = props.get("path")
-            if path:
-                start_offset = float(props.get("start_time", 0.0))
-                local_time = global_time - start_offset
-                
-                render_props = {
-                    "color": {
-                        "brightness": props.get("brightness", 0),
-                        "contrast": props.get("contrast", 0),
-                        "saturation": props.get("saturation", 0),
-                        "hue": props.get("hue", 0),
-                        "temperature": props.get("temperature", 0),
-                    },
-                    "effect": {
-                        "blur": props.get("blur", 0),
-                        "vignette": props.get("vignette", 0),
-                    }
-                }
-                
-                qimg = self.video_service.get_frame(layer.id, local_time, render_props)
-                
-                if not qimg.isNull():
-                    if props.get("chroma_active", False):
-                        c_color = props.get("chroma_color", "#00ff00")
-                        c_thresh = float(props.get("chroma_threshold", 0.15))
-                        qimg = ChromaProcessor.process_qimage(qimg, c_color, c_thresh)
-                    
-                    w, h = qimg.width(), qimg.height()
-                    
-                    # [PERBAIKAN POSISI]
-                    # Gunakan w/2 dan h/2 (TANPA scale) agar pivot point konsisten 
-                    # dengan QGraphicsItem di preview.
-                    painter.translate(x + w/2, y + h/2)
-                    
-                    painter.rotate(rotation)
-                    painter.scale(scale, scale)
-                    painter.setOpacity(opacity)
-                    
-                    # Draw image centered at (0,0) local coord
-                    painter.drawImage(-w/2, -h/2, qimg)
+            if not path: return None
+            local_time = global_time - params.start_time
+            
+            qimg = self.video_service.get_frame(layer.id, local_time, params.effects)
+            if qimg.isNull(): return None
+
+            if params.chroma:
+                c_color, c_thresh = params.chroma
+                qimg = ChromaProcessor.process_qimage(qimg, c_color, c_thresh)
+
+            op["kind"] = "image"
+            op["image"] = qimg
+            op["w"], op["h"] = qimg.width(), qimg.height()
+            return op
 
         elif layer_type in ['text', 'caption']:
-            # ... (kode text biarkan sama, atau sesuaikan pivotnya jika perlu)
-            text = props.get("text_content", "Text")
-            font = QFont(props.get("font_family", "Arial"), int(props.get("font_size", 60)))
-            if props.get("is_bold"): font.setBold(True)
-            painter.setFont(font)
-            painter.setPen(QColor(props.get("text_color", "#ffffff")))
+            # Raster text di-cache per style (sama dengan preview & compositor NumPy)
+            sprite = TextRasterCache.instance().get(props)
+            op["kind"] = "image"
+            op["image"] = sprite.to_qimage()
+            op["sprite"] = sprite  # pegang buffer sprite selama op dipakai
+            op["w"], op["h"] = sprite.box_w, sprite.box_h
+            op["offset"] = (sprite.offset_x, sprite.offset_y)
+            return op
+
+        return None
+
+    def _prepare_item(self, layer, global_time, params: LayerParams = None, preview: bool = False):
+        """
+        Versi NumPy dari _prepare_layer: CompositeItem (array BGR/BGRA), tanpa Qt.
+        preview=True: frame proxy / skala preview, ukuran logis tetap media asli.
+        """
+        props = layer.payload
+        if params is None: params = LayerParams.from_payload(props)
+        transform = params.transform()
+
+        if layer.type in ['video', 'image']:
+            if not props.get("path"): return None
+            local_time = global_time - params.start_time
+            arr = self.video_service.get_frame_array(layer.id, local_time, params.effects, preview=preview)
+            if arr is None: return None
+
+            if params.chroma:
+                c_color, c_thresh = params.chroma
+                arr = ChromaProcessor.process_array(arr, c_color, c_thresh)
+
+            h, w = arr.shape[:2]
+            if preview:
+                sw, sh = self.video_service.get_source_size(layer.id) or (w, h)
+                return CompositeItem(arr, sw, sh, array_scale=sw / float(w), **transform)
+            return CompositeItem(arr, w, h, **transform)
+
+        elif layer.type in ['text', 'caption']:
+            sprite = TextRasterCache.instance().get(props)
+            return CompositeItem(sprite.bgra, sprite.box_w, sprite.box_h,
+                                 offset_x=sprite.offset_x, offset_y=sprite.offset_y, **transform)
+
+        return None
+
+    def compose_frame(self, compositor, layers, global_time, canvas_scale=1.0, preview=False):
+        """
+        Komposit satu frame (PlanLayer urut z) -> kanvas BGR compositor.
+        canvas_scale < 1.0: kanvas preview resolusi rendah (RAM preview).
+        """
+        items = []
+        for entry in layers:
+            item = self._prepare_item(entry.layer, global_time, entry.params, preview=preview)
+            if item is not None:
+                items.append(scale_item(item, canvas_scale))
+        return compositor.compose(items)
+
+    def _paint_layer(self, painter, op):
+        """Gambar op hasil _prepare_layer ke canvas (stage composite)."""
+        if op is None: return
+        if op["kind"] == "plate":
+            # Plate layer statis: kanvas penuh, tanpa transform
+            painter.drawImage(0, 0, op["image"])
+            return
+        x, y = op["x"], op["y"]
+        scale = op["scale"]
+
+        painter.save()
+
+        if op["kind"] == "image":
+            qimg = op["image"]
+            w, h = op["w"], op["h"]
+            off_x, off_y = op.get("offset", (0, 0))
             
-            fm = QFontMetrics(font)
-            rect = fm.boundingRect(text)
-            text_w, text_h = rect.width(), rect.height()
+            # [PERBAIKAN POSISI]
+            # Gunakan w/2 dan h/2 (TANPA scale) agar pivot point konsisten 
+            # dengan QGraphicsItem di preview.
+            painter.translate(x + w/2, y + h/2)
             
-            # Text biasanya pivotnya center juga agar rotasi aman
-            painter.translate(x + text_w/2, y + text_h/2)
-            painter.rotate(rotation)
+            painter.rotate(op["rotation"])
             painter.scale(scale, scale)
-            painter.setOpacity(opacity)
-            painter.drawText(-text_w/2, text_h/4, text)
+            painter.setOpacity(op["opacity"])
+            
+            # Draw image centered at (0,0) local coord
+            # (sprite text punya margin stroke / shadow -> offset negatif)
+            painter.drawImage(QPointF(-w/2 + off_x, -h/2 + off_y), qimg)
 
         painter.restore()
 
@@ -0,0 +1,138 @@
+# engine/render_pipeline.py
+import queue
+import threading
+import time
+
+_END = object()  # penanda akhir stream antar stage
+
+
+class StageStats:
+    """Statistik satu stage: waktu kerja, waktu nunggu input / output, isi queue input."""
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0       # detik menjalankan fn
+        self.wait_in = 0.0    # detik menunggu item dari stage sebelumnya (starved)
+        self.wait_out = 0.0   # detik tertahan karena queue berikutnya penuh (back-pressure)
+        self._queue_samples = 0
+        self._queue_total = 0
+
+    def sample_queue(self, q):
+        if q is None: return
+        self._queue_samples += 1
+        self._queue_total += q.qsize()
+
+    def as_dict(self, wall: float) -> dict:
+        return {
+            "items": self.items,
+            "busy_s": round(self.busy, 3),
+            "wait_in_s": round(self.wait_in, 3),
+            "wait_out_s": round(self.wait_out, 3),
+            # Occupancy = porsi wall-clock stage ini benar-benar bekerja.
+            # Stage dengan occupancy tertinggi (~1.0) = bottleneck.
+            "occupancy": round(self.busy / wall, 3) if wall > 0 else 0.0,
+            "queue_avg": round(self._queue_total / self._queue_samples, 2) if self._queue_samples else 0.0,
+        }
+
+
+class RenderPipeline:
+    """
+    Stage render berurutan, masing-masing di thread sendiri, disambung queue terbatas.
+    Stage pertama menerima item dari iterable source; tiap stage fn(item) -> item
+    untuk stage berikutnya (return None = drop). Urutan item tetap (1 thread per stage).
+    Queue penuh menahan stage sebelumnya, jadi latency decode & back-pressure
+    encoder saling overlap, bukan dijumlah.
+    """
+    def __init__(self, stages, queue_size: int = 8):
+        self.stages = stages  # list (nama, fn)
+        self.queue_size = max(1, queue_size)
+        self.stats = {name: StageStats(name) for name, _ in stages}
+        self.wall = 0.0
+        self._stop = threading.Event()
+        self._error = None
+
+    def run(self, source):
+        """Jalankan sampai source habis. Exception stage mana pun dilempar ulang di sini."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]),
+                                    name="Render-source", daemon=True)]
+        for i, (name, fn) in enumerate(self.stages):
+            out_q = queues[i + 1] if i + 1 < len(queues) else None
+            threads.append(threading.Thread(target=self._work, args=(name, fn, queues[i], out_q),
+                                            name=f"Render-{name}", daemon=True))
+
+        t0 = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self.wall = time.perf_counter() - t0
+
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        self._stop.set()
+
+    def report(self) -> dict:
+        return {name: st.as_dict(self.wall) for name, st in self.stats.items()}
+
+    def format_report(self) -> str:
+        lines = [f"{'stage':<12}{'items':>7}{'busy(s)':>9}{'wait_in':>9}{'wait_out':>9}{'occup.':>8}{'queue':>7}"]
+        for name, st in self.report().items():
+            lines.append(f"{name:<12}{st['items']:>7}{st['busy_s']:>9.2f}{st['wait_in_s']:>9.2f}"
+                         f"{st['wait_out_s']:>9.2f}{st['occupancy']:>8.2f}{st['queue_avg']:>7.1f}")
+        return "\n".join(lines)
+
+    # ---------- INTERNAL ----------
+    def _put(self, q, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q):
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _fail(self, e):
+        if self._error is None:
+            self._error = e
+        self._stop.set()
+
+    def _feed(self, source, out_q):
+        try:
+            for item in source:
+                if not self._put(out_q, item): return
+            self._put(out_q, _END)
+        except BaseException as e:
+            self._fail(e)
+
+    def _work(self, name, fn, in_q, out_q):
+        st = self.stats[name]
+        try:
+            while True:
+                t0 = time.perf_counter()
+                st.sample_queue(in_q)
+                item = self._get(in_q)
+                t1 = time.perf_counter()
+                st.wait_in += t1 - t0
+                if item is _END:
+                    if out_q is not None: self._put(out_q, _END)
+                    return
+
+                result = fn(item)
+                t2 = time.perf_counter()
+                st.busy += t2 - t1
+                st.items += 1
+
+                if out_q is not None and result is not None:
+                    if not self._put(out_q, result): return
+                    st.wait_out += time.perf_counter() - t2
+        except BaseException as e:
+            self._fail(e)
@@ -0,0 +1,160 @@
+# engine/render_plan.py
+import bisect
+import math
+from dataclasses import dataclass, field
+
+from engine.layer_plates import is_static_layer
+
+# Layer yang menggambar sesuatu di frame (audio hanya ikut mix audio)
+VISUAL_LAYER_TYPES = ("video", "image", "text", "caption")
+
+
+def effect_props(props: dict) -> dict:
+    """Parameter color / effect untuk VideoService (format color_config preview)."""
+    return {
+        "color": {
+            "brightness": props.get("brightness", 0),
+            "contrast": props.get("contrast", 0),
+            "saturation": props.get("saturation", 0),
+            "hue": props.get("hue", 0),
+            "temperature": props.get("temperature", 0),
+        },
+        "effect": {
+            "blur": props.get("blur", 0),
+            "vignette": props.get("vignette", 0),
+        }
+    }
+
+
+@dataclass
+class LayerParams:
+    """Payload layer yang sudah di-parse ke tipe final (sekali per render, bukan per frame)."""
+    x: float = 0.0
+    y: float = 0.0
+    scale: float = 1.0      # 100 (%) di payload -> 1.0
+    rotation: float = 0.0
+    opacity: float = 1.0
+    start_time: float = 0.0
+    effects: dict = field(default_factory=dict)
+    chroma: tuple = None    # (warna, threshold) kalau chroma aktif
+
+    @classmethod
+    def from_payload(cls, props: dict) -> "LayerParams":
+        chroma = None
+        if props.get("chroma_active", False):
+            chroma = (props.get("chroma_color", "#00ff00"), float(props.get("chroma_threshold", 0.15)))
+        return cls(
+            x=float(props.get("x", 0)),
+            y=float(props.get("y", 0)),
+            scale=float(props.get("scale", 100)) / 100.0,
+            rotation=float(props.get("rotation", 0)),
+            opacity=float(props.get("opacity", 1.0)),
+            start_time=float(props.get("start_time", 0.0)),
+            effects=effect_props(props),
+            chroma=chroma,
+        )
+
+    def transform(self) -> dict:
+        return {"x": self.x, "y": self.y, "scale": self.scale,
+                "rotation": self.rotation, "opacity": self.opacity}
+
+
+class PlanLayer:
+    """LayerModel + LayerParams hasil compile. id / type / payload diteruskan ke layer asli."""
+    __slots__ = ("layer", "params")
+
+    def __init__(self, layer, params: LayerParams):
+        self.layer = layer
+        self.params = params
+
+    @property
+    def id(self): return self.layer.id
+
+    @property
+    def type(self): return self.layer.type
+
+    @property
+    def payload(self): return self.layer.payload
+
+
+@dataclass
+class FrameInterval:
+    """Rentang frame [start_frame, end_frame) dengan set layer aktif yang sama."""
+    start_frame: int
+    end_frame: int
+    layers: list            # PlanLayer, urut z (bawah -> atas)
+    static: bool = False    # semua layer statis -> semua frame di rentang ini identik
+
+
+class RenderPlan:
+    """
+    Timeline yang sudah di-compile untuk render: daftar FrameInterval berurutan
+    yang menutup [start_frame, end_frame) tanpa celah.
+    Dibangun dengan sweep event start / end layer (O(n log n) sekali), jadi loop
+    per frame tidak lagi scan semua layer, sort z, atau parse payload.
+    """
+    def __init__(self, intervals: list, start_frame: int, end_frame: int):
+        self.intervals = intervals
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self._starts = [iv.start_frame for iv in intervals]
+
+    @classmethod
+    def compile(cls, layers, fps: float, start_frame: int, end_frame: int) -> "RenderPlan":
+        # 1. Event per layer: frame pertama aktif & frame pertama tidak aktif lagi
+        events = []
+        for order, layer in enumerate(layers):
+            if layer.type not in VISUAL_LAYER_TYPES: continue
+            f0 = max(start_frame, first_frame_at(layer.time.start, fps))
+            f1 = min(end_frame, first_frame_at(layer.time.end, fps))
+            if f0 >= f1: continue
+            plan_layer = PlanLayer(layer, LayerParams.from_payload(layer.payload))
+            events.append((f0, 1, order, plan_layer))
+            events.append((f1, -1, order, plan_layer))
+        events.sort(key=lambda e: (e[0], e[1]))
+
+        # 2. Sweep: tiap batas event membuka interval baru
+        intervals = []
+        active = {}  # order -> PlanLayer
+        cursor = start_frame
+        i = 0
+        while cursor < end_frame:
+            while i < len(events) and events[i][0] <= cursor:
+                frame, kind, order, plan_layer = events[i]
+                if kind > 0: active[order] = plan_layer
+                else: active.pop(order, None)
+                i += 1
+            next_frame = events[i][0] if i < len(events) else end_frame
+            next_frame = min(end_frame, next_frame)
+
+            # Urut z_index; z sama -> urutan timeline (sama dengan sort stabil sebelumnya)
+            ordered = [active[o] for o in sorted(active, key=lambda o: (active[o].layer.z_index, o))]
+            intervals.append(FrameInterval(cursor, next_frame, ordered,
+                                           all(is_static_layer(pl) for pl in ordered)))
+            cursor = next_frame
+
+        return cls(intervals, start_frame, end_frame)
+
+    def __len__(self):
+        return self.end_frame - self.start_frame
+
+    def interval_at(self, frame_idx: int) -> FrameInterval:
+        pos = bisect.bisect_right(self._starts, frame_idx) - 1
+        return self.intervals[max(0, pos)] if self.intervals else None
+
+    def frames(self):
+        """Iterasi (frame_idx, FrameInterval) urut untuk seluruh rentang plan."""
+        for interval in self.intervals:
+            for frame_idx in range(interval.start_frame, interval.end_frame):
+                yield frame_idx, interval
+
+
+def first_frame_at(t: float, fps: float) -> int:
+    """Frame terkecil f dengan f / fps >= t (sama persis dengan TimeRange.contains)."""
+    fps = float(fps)
+    f = max(0, int(math.ceil(t * fps)))
+    while f > 0 and (f - 1) / fps >= t:
+        f -= 1
+    while f / fps < t:
+        f += 1
+    return f
@@ -0,0 +1,261 @@
+# engine/text/raster_cache.py
+import threading
+
+import cv2
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont, QFontMetricsF, QGuiApplication, QImage, QPainter, QPainterPath, QPen
+
+from engine.frame_cache import FrameCache
+from .wrap_text import wrap_text
+
+# Semua key payload yang mempengaruhi tampilan text (transform TIDAK termasuk)
+TEXT_STYLE_KEYS = (
+    "text_content", "font_family", "font_size", "text_color",
+    "text_weight", "is_bold", "text_italic",
+    "text_wrap", "text_align", "line_height", "letter_spacing",
+    "stroke_enabled", "stroke_color", "stroke_width",
+    "shadow_enabled", "shadow_color", "shadow_blur", "shadow_x", "shadow_y",
+)
+
+# QFont(point size) digambar di QImage 96 dpi -> pixel = pt * 96 / 72
+QT_POINT_TO_PIXEL = 96.0 / 72.0
+WRAP_WIDTH = 800  # lebar wrap text (px), sama dengan setTextWidth(800) preview lama
+# text_weight panel properti -> QFont.Weight
+FONT_WEIGHTS = {
+    "Thin": QFont.Thin, "Light": QFont.Light,
+    "Normal": QFont.Normal, "Medium": QFont.Medium,
+    "Bold": QFont.Bold, "Black": QFont.Black,
+}
+
+
+class TextSprite:
+    """
+    Hasil raster satu style text.
+    rgba / bgra : sprite premultiplied (H, W, 4) uint8, read-only.
+    box_w/h     : kotak logis text; pivot transform = center kotak ini.
+    offset_x/y  : posisi pojok kiri atas sprite relatif kotak (negatif = margin stroke / shadow).
+    """
+    def __init__(self, rgba: np.ndarray, box_w: int, box_h: int, offset_x: float, offset_y: float):
+        rgba.setflags(write=False)
+        self.rgba = rgba
+        self.bgra = cv2.cvtColor(rgba, cv2.COLOR_RGBA2BGRA)
+        self.bgra.setflags(write=False)
+        self.box_w = box_w
+        self.box_h = box_h
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self._qimage = None
+
+    @property
+    def nbytes(self) -> int:
+        return self.rgba.nbytes + self.bgra.nbytes
+
+    def __getstate__(self):
+        # Dikirim ke proses worker render (pickle): QImage tidak ikut
+        state = dict(self.__dict__)
+        state["_qimage"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.rgba.setflags(write=False)
+        self.bgra.setflags(write=False)
+
+    def to_qimage(self):
+        """QImage RGBA8888_Premultiplied tanpa copy (buffer tetap milik sprite)."""
+        if self._qimage is None:
+            h, w = self.rgba.shape[:2]
+            self._qimage = QImage(self.rgba.data, w, h, w * 4, QImage.Format_RGBA8888_Premultiplied)
+        return self._qimage
+
+
+class TextRasterCache:
+    """
+    Cache raster text untuk layer text / caption, dipakai preview & export.
+    Key = hash semua payload style text; raster dibuat sekali (QFont + QPainter,
+    jadi family dari QFontComboBox ter-resolve oleh QFontDatabase) lalu tiap
+    frame tinggal di-blit dengan transform layer.
+    Disimpan di FrameCache -> ikut LRU & budget byte CacheManager.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "TextRasterCache":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self, max_sprites: int = 512):
+        self._cache = FrameCache(max_frames=max_sprites, name="text_raster")
+        self._preloaded = {}  # style_key -> TextSprite dari proses lain (worker tanpa Qt), tidak ter-evict
+
+    @staticmethod
+    def style_key(payload: dict):
+        """Tuple nilai style (hashable); tuple utuh dipakai sebagai key supaya tidak ada collision."""
+        return tuple(TextRasterCache._hashable(payload.get(k)) for k in TEXT_STYLE_KEYS)
+
+    def get(self, payload: dict) -> TextSprite:
+        key = self.style_key(payload)
+        sprite = self._preloaded.get(key)
+        if sprite is not None:
+            return sprite
+        sprite = self._cache.get(key)
+        if sprite is None:
+            sprite = rasterize_text(payload)
+            self._cache.put(key, sprite)
+        return sprite
+
+    def collect(self, payloads) -> dict:
+        """{style_key: TextSprite} untuk payload text (di-raster di sini kalau belum ada)."""
+        return {self.style_key(p): self.get(p) for p in payloads}
+
+    def preload(self, sprites: dict):
+        """
+        Pakai sprite hasil collect() dari proses lain: worker compositor NumPy
+        tidak punya QGuiApplication, jadi tidak bisa raster text sendiri.
+        """
+        self._preloaded.update(sprites)
+
+    def clear(self):
+        self._cache.clear()
+        self._preloaded.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def _hashable(value):
+        return tuple(value) if isinstance(value, list) else value
+
+
+# =====================
+# RASTER (QPainter)
+# =====================
+def make_font(payload: dict) -> QFont:
+    """QFont dari payload text: family & weight di-resolve QFontDatabase."""
+    font = QFont(payload.get("font_family", "Arial"))
+    font.setPixelSize(max(1, int(round(int(payload.get("font_size", 60)) * QT_POINT_TO_PIXEL))))
+    weight = FONT_WEIGHTS.get(payload.get("text_weight", "Normal"), QFont.Normal)
+    if payload.get("is_bold") and weight < QFont.Bold:
+        weight = QFont.Bold
+    font.setWeight(weight)
+    font.setItalic(bool(payload.get("text_italic")))
+    spacing = float(payload.get("letter_spacing", 0) or 0)
+    if spacing:
+        font.setLetterSpacing(QFont.AbsoluteSpacing, spacing)
+    return font
+
+
+class _Metrics:
+    """Adapter QFontMetricsF -> interface getlength() yang dipakai wrap_text."""
+    def __init__(self, font: QFont):
+        self._fm = QFontMetricsF(font)
+        self._spacing = font.letterSpacing() if font.letterSpacingType() == QFont.AbsoluteSpacing else 0.0
+
+    def getlength(self, line: str) -> float:
+        # Qt menambah spacing juga setelah huruf terakhir; kotak text tidak ikut
+        return self._fm.horizontalAdvance(line) - (self._spacing if line else 0.0)
+
+
+def _hex_to_color(hex_str: str, default: str = "#ffffff") -> QColor:
+    color = QColor(hex_str or default)
+    return color if color.isValid() else QColor(default)
+
+
+def _to_array(img: QImage) -> np.ndarray:
+    """QImage RGBA8888_Premultiplied -> array (H, W, 4) milik sendiri."""
+    h, w = img.height(), img.width()
+    buf = np.frombuffer(img.constBits(), dtype=np.uint8, count=img.sizeInBytes())
+    return buf.reshape(h, img.bytesPerLine())[:, :w * 4].reshape(h, w, 4).copy()
+
+
+def rasterize_text(payload: dict) -> TextSprite:
+    """
+    Render text payload -> TextSprite (premultiplied RGBA).
+    Butuh QGuiApplication (boleh dipanggil dari thread worker selama app ada);
+    proses tanpa Qt memakai sprite dari TextRasterCache.preload.
+    """
+    if QGuiApplication.instance() is None:
+        raise RuntimeError("Raster text butuh QGuiApplication (proses tanpa Qt: pakai TextRasterCache.preload)")
+    text = str(payload.get("text_content", "Text"))
+    font = make_font(payload)
+    metrics = _Metrics(font)
+
+    # 1. Layout baris
+    lines = []
+    for para in text.split("\n"):
+        if payload.get("text_wrap"):
+            lines += wrap_text(para, metrics, WRAP_WIDTH) or [""]
+        else:
+            lines.append(para)
+
+    fm = QFontMetricsF(font)
+    ascent, descent = fm.ascent(), fm.descent()
+    line_px = ascent + descent
+    step = line_px * float(payload.get("line_height", 1.2)) if len(lines) > 1 else line_px
+    widths = [metrics.getlength(l) for l in lines]
+    box_w = max(1, int(round(max(widths))))
+    box_h = max(1, int(round(step * (len(lines) - 1) + line_px)))
+
+    # 2. Margin untuk stroke & shadow di luar kotak
+    stroke = int(payload.get("stroke_width", 0)) if payload.get("stroke_enabled") else 0
+    shadow = bool(payload.get("shadow_enabled"))
+    sx = int(payload.get("shadow_x", 5)) if shadow else 0
+    sy = int(payload.get("shadow_y", 5)) if shadow else 0
+    blur = int(payload.get("shadow_blur", 5)) if shadow else 0
+    margin = stroke + 2 + (blur + max(abs(sx), abs(sy)) if shadow else 0)
+
+    size = (box_w + margin * 2, box_h + margin * 2)
+    align = payload.get("text_align", "left")
+
+    path = QPainterPath()
+    for i, line in enumerate(lines):
+        free = box_w - widths[i]
+        x = free / 2.0 if align == "center" else (free if align == "right" else 0)
+        path.addText(margin + x, margin + ascent + i * step, font, line)
+
+    def paint_text(painter, fill, stroke_fill, dx=0, dy=0):
+        painter.save()
+        painter.translate(dx, dy)
+        if stroke:
+            # Pen di tengah outline -> lebar 2x supaya stroke keluar sejauh stroke_width
+            painter.strokePath(path, QPen(stroke_fill, stroke * 2, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.fillPath(path, fill)
+        painter.restore()
+
+    def new_image():
+        img = QImage(size[0], size[1], QImage.Format_RGBA8888_Premultiplied)
+        img.fill(Qt.transparent)
+        return img
+
+    out = new_image()
+    painter = QPainter(out)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # 3. Shadow (mask blur, warna shadow) di bawah text
+    if shadow:
+        mask_img = new_image()
+        mask_painter = QPainter(mask_img)
+        mask_painter.setRenderHint(QPainter.Antialiasing)
+        paint_text(mask_painter, QColor(255, 255, 255), QColor(255, 255, 255), sx, sy)
+        mask_painter.end()
+        mask = np.ascontiguousarray(_to_array(mask_img)[..., 3])
+        if blur > 0:
+            mask = cv2.GaussianBlur(mask, (0, 0), blur / 2.0)
+        color = _hex_to_color(payload.get("shadow_color"), "#000000")
+        shade = np.empty((size[1], size[0], 4), dtype=np.uint8)
+        for c, v in enumerate((color.red(), color.green(), color.blue())):
+            shade[..., c] = ((mask.astype(np.uint16) * v + 127) // 255).astype(np.uint8)
+        shade[..., 3] = mask
+        painter.drawImage(0, 0, QImage(shade.data, size[0], size[1], size[0] * 4,
+                                       QImage.Format_RGBA8888_Premultiplied))
+
+    # 4. Text + stroke
+    paint_text(painter, _hex_to_color(payload.get("text_color"), "#ffffff"),
+               _hex_to_color(payload.get("stroke_color"), "#000000"))
+    painter.end()
+
+    return TextSprite(_to_array(out), box_w, box_h, -margin, -margin)
@@ -1,53 +1,180 @@
 # engine/video_service.py
 import cv2
+import threading
 import numpy as np
 from PySide6.QtGui import QPixmap, QImage, QColor
-from engine.frame_cache import FrameCache
+from engine.frame_cache import FrameCache, time_to_frame_index
+from engine.decoder_pool import DecoderPool
+from engine.media_index import peek_media_index
+from engine.color_grading import compile_grade
+from engine.mezzanine_cache import MezzanineFile
 
 class VideoService:
-    def __init__(self):
-        self._readers = {}     
+    def __init__(self, max_decoders: int = 8):
+        self._decoders = DecoderPool(max_sessions=max_decoders)
         self._image_cache = {} 
         self._id_map = {}      
-        self._video_frame_cache = FrameCache(max_frames=100)
+        self._media_fps = {}   # layer_id -> fps asli media (di-resolve sekali)
+        self._media_index = {} # layer_id -> MediaIndex (PTS/keyframe, akurat untuk VFR)
+        self._index_pending = set()  # layer_id yang index-nya masih di-scan di background
+        self._source_size = {} # layer_id -> (w, h) resolusi asli media
+        self._proxies = {}     # source path -> proxy path (khusus preview)
+        self._mezzanines = {}  # source path -> MezzanineFile (YUV420 mmap, khusus preview)
+        self.use_proxies = True
+        self.preview_scale = 1.0  # Full / Half / Quarter (khusus preview)
+        self._video_frame_cache = FrameCache(name="video_raw")
+        # Cache level 2: hasil effect + konversi QImage, key = (key frame source, params)
+        self._processed_cache = FrameCache(max_frames=120, name="video_processed")
+        # Hanya menjaga update map (proxy / mezzanine / fps); decode dikunci per
+        # DecoderSession, cache punya lock sendiri (CacheManager)
+        self._lock = threading.RLock()
 
     # ---------- REGISTRATION ----------
     def register_source(self, layer_id: str, path: str):
         if not path: return
+        if self._id_map.get(layer_id) not in (None, path):
+            # Source layer diganti -> frame & hasil olahan lama tidak valid lagi
+            self.unregister_source(layer_id)
         self._id_map[layer_id] = path
         ext = path.split('.')[-1].lower()
         if ext in ["jpg", "jpeg", "png", "bmp", "webp"]:
             img = cv2.imread(path)
             if img is not None:
                 self._image_cache[layer_id] = img 
+                self._source_size[layer_id] = (img.shape[1], img.shape[0])
         else:
-            self._get_reader(path)
+            session = self._decoders.get(layer_id, path)
+            if session:
+                self._store_session_info(layer_id, session)
 
     def unregister_source(self, layer_id: str):
+        self._decoders.close_layer(layer_id)
+        self._video_frame_cache.remove_if(lambda k: k[0] == layer_id)
+        self._processed_cache.remove_if(lambda k: k[0][0] == layer_id)
         if layer_id in self._image_cache: del self._image_cache[layer_id]
         if layer_id in self._id_map: del self._id_map[layer_id]
+        self._media_fps.pop(layer_id, None)
+        self._media_index.pop(layer_id, None)
+        self._index_pending.discard(layer_id)
+        self._source_size.pop(layer_id, None)
+
+    def set_proxy(self, source_path: str, proxy_path: str):
+        """Daftarkan proxy resolusi rendah untuk preview (render tetap pakai original)."""
+        with self._lock:
+            self._proxies[source_path] = proxy_path
+
+    def set_mezzanine(self, source_path: str, mezzanine_path: str) -> bool:
+        """
+        Daftarkan mezzanine YUV420 untuk preview: frame dibaca dari mmap tanpa decode.
+        Dipakai sebelum proxy; render tetap pakai original.
+        """
+        mezz = MezzanineFile.open(mezzanine_path)
+        if mezz is None: return False
+        with self._lock:
+            old = self._mezzanines.pop(source_path, None)
+            self._mezzanines[source_path] = mezz
+        if old is not None: old.close()
+        return True
+
+    def get_source_size(self, layer_id: str):
+        """Resolusi asli media (w, h); frame preview bisa lebih kecil dari ini."""
+        return self._source_size.get(layer_id)
+
+    def has_video_source(self, layer_id: str) -> bool:
+        return layer_id in self._id_map and layer_id not in self._image_cache
 
     # ---------- API ----------
     # [FIX] Render Engine butuh method ini
-    def get_frame(self, layer_id: str, time: float, props: dict = None) -> QImage:
+    def get_frame(self, layer_id: str, time: float, props: dict = None, preview: bool = False) -> QImage:
+        """
+        preview=True: boleh pakai proxy & preview_scale (frame bisa lebih kecil
+        dari get_source_size). Render / export selalu preview=False -> media original.
+        """
         path = self._id_map.get(layer_id)
         if not path: return QImage()
+        variant = self._variant(path, preview)
+
+        # 0. Hasil olahan yang identik (paused, scrub ulang, layer gambar) -> langsung pakai
+        source_key = self._source_key(layer_id, path, time, variant)
+        if source_key is None: return QImage()
+        processed_key = (source_key, self._params_key(props))
+        cached = self._processed_cache.get(processed_key)
+        if cached is not None:
+            return cached
 
         # 1. Raw Frame
-        raw_frame = self._get_raw_frame(layer_id, path, time)
+        raw_frame = self._get_raw_frame(layer_id, path, time, variant)
         if raw_frame is None: return QImage()
 
         # 2. Effects
-        try:
-            if props:
-                processed_frame = self._apply_effects(raw_frame, props)
-            else:
-                processed_frame = raw_frame
-        except Exception:
-            processed_frame = raw_frame
+        processed_frame = self._process_raw(layer_id, raw_frame, props)
 
         # 3. Convert
-        return self._cv2_to_qimage(processed_frame)
+        qimg = self._cv2_to_qimage(processed_frame)
+        self._processed_cache.put(processed_key, qimg)
+        return qimg
+
+    def get_frame_array(self, layer_id: str, time: float, props: dict = None, preview: bool = False):
+        """
+        Sama dengan get_frame tapi hasilnya array BGR uint8 (tanpa QImage),
+        untuk compositor NumPy / proses tanpa QApplication. None kalau gagal.
+        Jangan diubah in-place: array bisa dipakai bareng lewat cache.
+        """
+        path = self._id_map.get(layer_id)
+        if not path: return None
+        variant = self._variant(path, preview)
+
+        params_key = self._params_key(props)
+        source_key = self._source_key(layer_id, path, time, variant)
+        if source_key is None: return None
+        processed_key = (source_key, params_key, "array")
+        if params_key is not None:
+            cached = self._processed_cache.get(processed_key)
+            if cached is not None:
+                return cached
+
+        raw_frame = self._get_raw_frame(layer_id, path, time, variant)
+        if raw_frame is None or params_key is None:
+            # Tanpa effect: frame raw (sudah ada di cache raw) langsung dipakai
+            return raw_frame
+
+        processed_frame = self._process_raw(layer_id, raw_frame, props)
+        if processed_frame is not raw_frame:
+            self._processed_cache.put(processed_key, processed_frame)
+        return processed_frame
+
+    def peek(self, layer_id: str, time: float, props: dict = None, preview: bool = True):
+        """
+        Versi get_frame yang tidak pernah decode (aman dipanggil dari GUI thread
+        selagi worker decode): hasil olahan dari cache, atau frame raw yang sudah
+        ada di cache (prefetcher) lalu diolah di sini. None kalau frame belum ada.
+        Tidak mengambil self._lock / lock session decoder dan tidak membuka decoder:
+        key dihitung langsung dari map yang sudah terisi saat register_source.
+        """
+        path = self._id_map.get(layer_id)
+        if not path: return None
+        decode_path, scale = self._variant(path, preview)
+        if layer_id in self._image_cache:
+            source_key = (layer_id, -1, None, scale)
+        elif layer_id in self._media_fps:
+            source_key = (layer_id, self.get_frame_index(layer_id, time), decode_path, scale)
+        else:
+            return None  # belum ter-register (decoder belum pernah dibuka)
+
+        processed_key = (source_key, self._params_key(props))
+        cached = self._processed_cache.get(processed_key)
+        if cached is not None:
+            return cached
+
+        if layer_id in self._image_cache and scale >= 1.0:
+            raw_frame = self._image_cache[layer_id]
+        else:
+            raw_frame = self._video_frame_cache.get(source_key)
+        if raw_frame is None: return None
+
+        qimg = self._cv2_to_qimage(self._process_raw(layer_id, raw_frame, props))
+        self._processed_cache.put(processed_key, qimg)
+        return qimg
 
     # Legacy support (jika ada komponen lama yang manggil ini)
     def get_frame_image(self, path: str, time: float) -> QImage:
@@ -62,82 +189,172 @@ class VideoService:
             return self.get_frame(found_id, time)
         return QImage() # Fail safe
 
+    def get_frame_index(self, layer_id: str, time: float) -> int:
+        """Index frame source untuk waktu lokal layer (index PTS media, fallback fps asli)."""
+        index = self._media_index.get(layer_id)
+        if index is None and layer_id in self._index_pending:
+            index = self._poll_index(layer_id)
+        if index is not None:
+            return index.frame_at_time(time)
+        return time_to_frame_index(time, self._media_fps.get(layer_id, 30))
+
+    def prefetch_frame(self, layer_id: str, time: float, preview: bool = True) -> bool:
+        """Decode raw frame ke cache tanpa effect/konversi (dipanggil prefetcher)."""
+        path = self._id_map.get(layer_id)
+        if not path: return False
+        return self._get_raw_frame(layer_id, path, time, self._variant(path, preview)) is not None
+
+    def set_preview_scale(self, scale: float):
+        """Kualitas preview: 1.0 (Full), 0.5 (Half), 0.25 (Quarter)."""
+        self.preview_scale = min(1.0, max(0.1, float(scale)))
+
     # ---------- INTERNAL ----------
-    def _get_raw_frame(self, layer_id: str, path: str, time: float):
+    def _variant(self, path: str, preview: bool):
+        """(file yang di-decode, skala) untuk request ini. Render: (original, 1.0)."""
+        if not preview:
+            return (path, 1.0)
+        mezz = self._mezzanines.get(path)
+        if mezz is not None:
+            return (mezz.path, self.preview_scale)
+        decode_path = self._proxies.get(path, path) if self.use_proxies else path
+        return (decode_path, self.preview_scale)
+
+    def _downscale(self, frame, layer_id: str, scale: float):
+        """Perkecil frame tepat setelah decode (sebelum effect & konversi QImage)."""
+        size = self._source_size.get(layer_id)
+        if scale >= 1.0 or not size: return frame
+        tw = max(2, int(round(size[0] * scale)))
+        th = max(2, int(round(size[1] * scale)))
+        # Proxy yang sudah lebih kecil dari target tidak diperbesar lagi
+        if frame.shape[1] <= tw: return frame
+        return cv2.resize(frame, (tw, th), interpolation=cv2.INTER_AREA)
+
+    def _frame_scale(self, layer_id: str, frame) -> float:
+        """Rasio lebar frame yang di-decode terhadap media asli (proxy / preview < 1.0)."""
+        size = self._source_size.get(layer_id)
+        if not size or not size[0]: return 1.0
+        return frame.shape[1] / float(size[0])
+
+    def _source_key(self, layer_id: str, path: str, time: float, variant=None):
+        """
+        Key frame source: (LayerID, index frame source, file yang di-decode, skala).
+        Tanpa format string / float, jadi waktu dari tick (akumulasi 1/fps)
+        & frame_to_time tetap hit. Proxy / skala preview & original punya key terpisah.
+        Layer gambar statis selalu frame -1.
+        """
+        decode_path, scale = variant or (path, 1.0)
         if layer_id in self._image_cache:
-            return self._image_cache[layer_id]
+            return (layer_id, -1, None, scale)
+
+        if layer_id not in self._media_fps:
+            session = self._decoders.get(layer_id, path)
+            if not session: return None
+            self._store_session_info(layer_id, session)
+        return (layer_id, self.get_frame_index(layer_id, time), decode_path, scale)
+
+    def _store_session_info(self, layer_id: str, session):
+        with self._lock:
+            self._media_fps[layer_id] = session.fps
+            self._media_index[layer_id] = session.index
+            self._source_size[layer_id] = (session.width, session.height)
+            if session.index is None:
+                self._index_pending.add(layer_id)
 
-        # [FIX] Buat Unique Key: LayerID + Waktu
-        # Format string biar unik per layer
-        cache_key = f"{layer_id}_{round(time, 3)}"
+    def _poll_index(self, layer_id: str):
+        """Index dari scan background sudah jadi? Sampai saat itu index frame pakai fps."""
+        path = self._id_map.get(layer_id)
+        index, pending = peek_media_index(path) if path else (None, False)
+        if index is not None:
+            self._media_index[layer_id] = index
+            self._media_fps[layer_id] = index.fps
+        if index is not None or not pending:
+            self._index_pending.discard(layer_id)
+        return index
+
+    @staticmethod
+    def _params_key(props: dict):
+        """Bagian key dari parameter color/effect (hashable, tanpa serialisasi)."""
+        if not props: return None
+        return tuple(
+            (group, tuple(sorted(values.items())) if isinstance(values, dict) else values)
+            for group, values in sorted(props.items())
+        )
 
-        # Panggil cache dengan key unik
+    def _get_raw_frame(self, layer_id: str, path: str, time: float, variant=None):
+        decode_path, scale = variant or (path, 1.0)
+        if layer_id in self._image_cache and scale >= 1.0:
+            return self._image_cache[layer_id]
+
+        # Tanpa lock service: decode hanya mengunci session layer ini (DecoderSession.read),
+        # jadi GUI thread & layer lain tidak menunggu decode yang sedang jalan
+        cache_key = self._source_key(layer_id, path, time, variant)
+        if cache_key is None: return None
         cached = self._video_frame_cache.get(cache_key)
         if cached is not None:
             return cached
 
-        cap = self._get_reader(path)
-        if not cap: return None
+        if layer_id in self._image_cache:
+            frame = self._downscale(self._image_cache[layer_id], layer_id, scale)
+            self._video_frame_cache.put(cache_key, frame)
+            return frame
 
-        fps = cap.get(cv2.CAP_PROP_FPS) or 30
-        frame_idx = int(time * fps)
-        
-        # Optimasi seek: Jangan seek jika posisinya sudah pas (opsional tapi bagus)
-        # if abs(cap.get(cv2.CAP_PROP_POS_FRAMES) - frame_idx) > 1:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-        
-        ok, frame = cap.read()
-        
-        if ok:
+        mezz = self._mezzanines.get(path)
+        if mezz is not None and decode_path == mezz.path:
+            # Mezzanine: index frame sama dengan original, cukup slice mmap + cvtColor
+            frame = mezz.frame(cache_key[1])
+            if frame is not None:
+                frame = self._downscale(frame, layer_id, scale)
+                self._video_frame_cache.put(cache_key, frame)
+                return frame
+            decode_path = path  # di luar tabel (file terpotong) -> decode original
+
+        frame = None
+        for _ in range(2):
+            # Decoder per layer: layer lain dengan file sama tidak menggeser posisinya
+            session = self._decoders.get(layer_id, decode_path)
+            if not session: return None
+
+            # Proxy punya index sendiri -> petakan lewat waktu, bukan nomor frame original
+            frame_idx = cache_key[1] if decode_path == path else session.frame_at_time(time)
+            frame = session.read(frame_idx)
+            # Session ditutup (evict LRU) selagi menunggu giliran -> buka ulang sekali
+            if frame is not None or session.is_open(): break
+
+        if frame is not None:
+            frame = self._downscale(frame, layer_id, scale)
             # Simpan dengan key unik
             self._video_frame_cache.put(cache_key, frame)
             return frame
         return None
 
-    def _apply_effects(self, img, props: dict):
-        img = img.copy() 
+    def _process_raw(self, layer_id: str, raw_frame, props: dict):
+        try:
+            if props:
+                return self._apply_effects(raw_frame, props, self._frame_scale(layer_id, raw_frame))
+        except Exception:
+            pass
+        return raw_frame
+
+    def _apply_effects(self, img, props: dict, scale: float = 1.0):
         c_props = props.get("color", {})
         fx_props = props.get("effect", {})
 
-        bright = c_props.get("brightness", 0)
-        contrast = c_props.get("contrast", 0)
-        
-        if bright != 0 or contrast != 0:
-            alpha = 1.0 + (contrast / 100.0) 
-            beta = bright
-            img = cv2.convertScaleAbs(img, alpha=alpha, beta=beta)
-
-        sat = c_props.get("saturation", 0)
-        hue = c_props.get("hue", 0)
-        temp = c_props.get("temperature", 0)
-        
-        if sat != 0 or hue != 0 or temp != 0:
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype("float32")
-            (h, s, v) = cv2.split(hsv)
-
-            if sat != 0:
-                s = s * (1.0 + (sat / 100.0))
-                s = np.clip(s, 0, 255)
-            if hue != 0:
-                h = h + hue
-                h = np.mod(h, 180)
-
-            hsv = cv2.merge([h, s, v])
-            img = cv2.cvtColor(hsv.astype("uint8"), cv2.COLOR_HSV2BGR)
-
-        if temp != 0:
-            b, g, r = cv2.split(img)
-            if temp > 0: # Warm
-                r = cv2.add(r, int(temp))
-                b = cv2.subtract(b, int(temp))
-            else: # Cool
-                r = cv2.subtract(r, int(abs(temp)))
-                b = cv2.add(b, int(abs(temp)))
-            img = cv2.merge([b, g, r])
+        # Brightness/contrast/saturation/hue/temperature: satu stage LUT yang
+        # sudah di-compile & di-cache per set parameter (lihat engine/color_grading.py)
+        grade = compile_grade(
+            c_props.get("brightness", 0),
+            c_props.get("contrast", 0),
+            c_props.get("saturation", 0),
+            c_props.get("hue", 0),
+            c_props.get("temperature", 0),
+        )
+        if not grade.is_noop:
+            img = grade.apply(img)
 
         blur = fx_props.get("blur", 0)
         if blur > 0:
-            k = int(blur) * 2 + 1 
+            # Radius blur dalam pixel media asli -> ikut diperkecil untuk frame proxy
+            k = int(blur * scale) * 2 + 1 
             img = cv2.GaussianBlur(img, (k, k), 0)
 
         return img
@@ -155,18 +372,19 @@ class VideoService:
         qimg = QImage(cv_img.data, w, h, bytes_per_line, QImage.Format_RGB888)
         return qimg.copy()
 
-    def _get_reader(self, path):
-        if path not in self._readers:
-            cap = cv2.VideoCapture(path)
-            if cap.isOpened():
-                self._readers[path] = cap
-        return self._readers.get(path)
+    def set_max_decoders(self, count: int):
+        self._decoders.set_max_sessions(count)
 
     def release_all(self):
-        for r in self._readers.values(): r.release()
-        self._readers.clear()
-        self._image_cache.clear()
-        self._video_frame_cache.clear()
+        self._decoders.release_all()
+        with self._lock:
+            self._image_cache.clear()
+            self._video_frame_cache.clear()
+            self._processed_cache.clear()
+            self._media_fps.clear()
+            self._media_index.clear()
+            self._index_pending.clear()
+            self._source_size.clear()
     
     @staticmethod
     def _blank():
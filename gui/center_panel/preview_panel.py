@@ -2,17 +2,19 @@
 import math
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGraphicsView, QGraphicsScene, 
-    QComboBox, QCheckBox, QToolButton, QFrame, QSizePolicy, QLabel, QMenu
+    QComboBox, QCheckBox, QToolButton, QFrame, QSizePolicy, QLabel, QMenu,
+    QGraphicsPixmapItem
 )
 from PySide6.QtCore import Qt, Signal, QTimer, QPointF
 from PySide6.QtGui import (
-    QPainter, QColor, QBrush, QWheelEvent, QMouseEvent, QPen, QAction, QKeySequence
+    QPainter, QColor, QBrush, QWheelEvent, QMouseEvent, QPen, QAction, QKeySequence,
+    QPixmap
 )
 
 # Import Canvas Items
 from gui.center_panel.canvas_items.canvas_frame import CanvasFrameItem
 from gui.center_panel.canvas_items.grid_item import GridItem
-from canvas.text_item import TextItem # [NEW] Import Text Item
+from canvas.text_sprite_item import TextSpriteItem # Text / caption: sprite raster (sama dengan export)
 
 try:
     from canvas.video_item import VideoLayerItem
@@ -59,6 +61,8 @@ class PreviewPanel(QWidget):
     
     # Signal untuk update resolusi global
     sig_resolution_changed = Signal(int, int)
+    # Kualitas preview (skala decode), tidak mempengaruhi render
+    sig_preview_scale_changed = Signal(float)
 
     CANVAS_PRESETS = {
         "9:16 (Tiktok/Reels)": (1080, 1920),
@@ -67,6 +71,12 @@ class PreviewPanel(QWidget):
         "4:5 (Portrait)": (1080, 1350),
     }
 
+    PREVIEW_QUALITY = {
+        "Full": 1.0,
+        "Half": 0.5,
+        "Quarter": 0.25,
+    }
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
@@ -94,7 +104,13 @@ class PreviewPanel(QWidget):
         self._center_canvas_item()
 
         self.video_service = None
+        self.frame_dispatcher = None  # kalau di-set: decode preview async (latest-wins)
+        self.ram_preview = None       # RamPreviewService: frame komposit jadi untuk playback
+        self.ram_overlay = None       # pixmap kanvas penuh dari RAM preview (dibuat saat perlu)
+        self.is_playing = False
+        self._last_time = 0.0
         self.items_map = {} 
+        self.visible_ids = set()  # layer yang aktif di playhead (diatur lewat delta)
 
         # 4. Init Toolbar
         self._init_toolbar()
@@ -117,6 +133,14 @@ class PreviewPanel(QWidget):
         self.combo_ratio.setFixedWidth(140)
         layout.addWidget(self.combo_ratio)
 
+        self.combo_quality = QComboBox()
+        self.combo_quality.addItems(self.PREVIEW_QUALITY.keys())
+        self.combo_quality.setCurrentIndex(0)
+        self.combo_quality.setToolTip("Preview Quality")
+        self.combo_quality.currentTextChanged.connect(self._on_quality_changed)
+        self.combo_quality.setFixedWidth(80)
+        layout.addWidget(self.combo_quality)
+
         chk_grid = QCheckBox("Grid")
         chk_grid.setStyleSheet("color: #ccc; margin-left: 5px;")
         chk_grid.toggled.connect(lambda v: setattr(self.grid, 'visible', v) or self.grid.update())
@@ -260,6 +284,18 @@ class PreviewPanel(QWidget):
         
         self.sig_resolution_changed.emit(w, h)
 
+    def _on_quality_changed(self, quality_text):
+        self.sig_preview_scale_changed.emit(self.PREVIEW_QUALITY.get(quality_text, 1.0))
+
+    def set_preview_quality(self, scale: float):
+        """Sinkron combo dari config tanpa emit ulang."""
+        for text, value in self.PREVIEW_QUALITY.items():
+            if abs(value - scale) < 1e-6:
+                self.combo_quality.blockSignals(True)
+                self.combo_quality.setCurrentText(text)
+                self.combo_quality.blockSignals(False)
+                break
+
     def _fit_view(self):
         self.view.resetTransform()
         rect = self.canvas_frame.sceneBoundingRect()
@@ -270,14 +306,70 @@ class PreviewPanel(QWidget):
     def set_video_service(self, service):
         self.video_service = service
 
+    def set_frame_dispatcher(self, dispatcher):
+        self.frame_dispatcher = dispatcher
+        dispatcher.sig_frame_ready.connect(self._on_frame_ready)
+
+    def _on_frame_ready(self, layer_id, seq, qimg, source_size):
+        # Hasil decode async; buang kalau layer sudah dihapus / frame sudah disalip
+        item = self.items_map.get(layer_id)
+        if item is None or not self.frame_dispatcher.is_current(layer_id, seq): return
+        item.set_frame_image(qimg, source_size)
+
+    def set_ram_preview(self, service):
+        self.ram_preview = service
+
+    def set_playing(self, playing: bool):
+        self.is_playing = playing
+        if not playing and self.ram_overlay is not None and self.ram_overlay.isVisible():
+            # Kembali ke item live (bisa dipilih / di-drag) di posisi terakhir
+            self.ram_overlay.setVisible(False)
+            self.on_time_changed(self._last_time)
+
+    def _show_ram_frame(self, t) -> bool:
+        """Saat playback: blit kanvas jadi dari RAM preview kalau frame t sudah di-cache."""
+        image = self.ram_preview.image_at(t) if (self.ram_preview and self.is_playing) else None
+        if image is None:
+            if self.ram_overlay is not None: self.ram_overlay.setVisible(False)
+            return False
+
+        if self.ram_overlay is None:
+            self.ram_overlay = QGraphicsPixmapItem(self.canvas_frame)
+            self.ram_overlay.setZValue(99990)  # di atas semua layer, di bawah smart guide
+            self.ram_overlay.setAcceptedMouseButtons(Qt.NoButton)
+            self.ram_overlay.setTransformationMode(Qt.SmoothTransformation)
+        w = image.width()
+        try:
+            pix = QPixmap.fromImage(image)
+        finally:
+            self.ram_preview.release_image(image)  # pixmap sudah punya copy sendiri
+        # Kanvas preview bisa lebih kecil (Half / Quarter) -> ukuran logis tetap = kanvas project
+        rect = self.canvas_frame.rect()
+        if rect.width() > 0: pix.setDevicePixelRatio(w / rect.width())
+        self.ram_overlay.setPixmap(pix)
+        self.ram_overlay.setVisible(True)
+        return True
+
     def on_time_changed(self, t):
-        # Sync semua layer yang terlihat (Video & Text)
-        for _, item in self.items_map.items():
-            if item.isVisible():
+        self._last_time = t
+        if self._show_ram_frame(t):
+            # Frame komposit jadi menutup semua layer -> tidak perlu decode per layer
+            self._update_time_label(t)
+            return
+
+        # Sync hanya layer yang terlihat (Video & Text), bukan semua item di scene
+        for lid in self.visible_ids:
+            item = self.items_map.get(lid)
+            if item is not None:
                 start = getattr(item, 'start_time', 0.0)
-                # VideoService hanya dipakai oleh VideoLayerItem, TextItem akan ignore
-                item.sync_frame(t - start, self.video_service)
-        
+                # VideoService hanya dipakai oleh VideoLayerItem, TextSpriteItem akan ignore
+                if self.frame_dispatcher is not None:
+                    item.request_frame(t - start, self.frame_dispatcher)
+                else:
+                    item.sync_frame(t - start, self.video_service)
+        self._update_time_label(t)
+
+    def _update_time_label(self, t):
         total_seconds = int(t)
         rem_ms = int((t - total_seconds) * 100)
         mins = total_seconds // 60
@@ -285,27 +377,41 @@ class PreviewPanel(QWidget):
         self.lbl_time.setText(f"{mins:02d}:{secs:02d}:{rem_ms:02d}")
 
     def sync_layer_visibility(self, active_ids):
+        """Resync penuh (semua item); playback normal pakai apply_visibility_delta."""
+        self.visible_ids = set(active_ids)
         for lid, item in self.items_map.items():
-            item.setVisible(lid in active_ids)
+            item.setVisible(lid in self.visible_ids)
+
+    def apply_visibility_delta(self, entered, exited):
+        """Hanya layer yang masuk / keluar playhead yang di-setVisible."""
+        for lid in exited:
+            self.visible_ids.discard(lid)
+            item = self.items_map.get(lid)
+            if item is not None: item.setVisible(False)
+        for lid in entered:
+            self.visible_ids.add(lid)
+            item = self.items_map.get(lid)
+            if item is not None: item.setVisible(True)
 
     def on_layer_created(self, layer_data):
         if layer_data.id in self.items_map: return
         
         # [FIX] Factory Logic: Bedakan Item berdasarkan Tipe
-        if layer_data.type == 'text':
-            content = layer_data.properties.get("text_content", "Text")
-            item = TextItem(layer_data.id, content)
+        if layer_data.type in ['text', 'caption']:
+            item = TextSpriteItem(layer_data.id)
         else:
             # Video / Image / Audio
             item = VideoLayerItem(layer_data.id, layer_data.path)
             
         item.setParentItem(self.canvas_frame) 
+        # Tampil kalau sudah aktif di playhead; selebihnya lewat apply_visibility_delta
+        item.setVisible(layer_data.id in self.visible_ids)
         
         # Set properti awal
         props = layer_data.properties
         item.start_time = float(props.get("start_time", 0.0))
         
-        # Panggil update_transform (sekarang TextItem juga punya method ini)
+        # Panggil update_transform (TextSpriteItem sekalian raster text-nya)
         item.update_transform(props)
         item.setZValue(layer_data.z_index)
         
@@ -322,6 +428,9 @@ class PreviewPanel(QWidget):
                 item.sig_transform_changed.disconnect() 
             self.scene.removeItem(item)
             del self.items_map[lid]
+            self.visible_ids.discard(lid)
+            if self.frame_dispatcher is not None:
+                self.frame_dispatcher.forget(lid)
 
     def on_property_changed(self, layer_id, props):
         if layer_id in self.items_map:
@@ -205,4 +205,18 @@ class VideoEditorApp(QMainWindow):
 
         self.action_play = QAction("Play / Pause", self)
         self.action_play.setShortcut(QKeySequence(Qt.Key_Space))
-        self.addAction(self.action_play)
\ No newline at end of file
+        self.addAction(self.action_play)
+
+        # RAM Preview (work area in / out + render ke cache)
+        preview_menu = menu_bar.addMenu("Preview")
+        self.action_set_in = QAction("Set In Point", self)
+        self.action_set_in.setShortcut(QKeySequence(Qt.Key_I))
+        preview_menu.addAction(self.action_set_in)
+
+        self.action_set_out = QAction("Set Out Point", self)
+        self.action_set_out.setShortcut(QKeySequence(Qt.Key_O))
+        preview_menu.addAction(self.action_set_out)
+
+        self.action_ram_preview = QAction("Render Preview (RAM)", self)
+        self.action_ram_preview.setShortcut(QKeySequence("Ctrl+Return"))
+        preview_menu.addAction(self.action_ram_preview)
\ No newline at end of file
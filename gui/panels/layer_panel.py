@@ -219,6 +219,10 @@ class LayerPanel(QGraphicsView):
         self.clip_registry = {}
         self.last_layers_data = [] 
 
+        # RAM preview: work area (in / out) & rentang frame yang sudah di-cache
+        self.work_area = (None, None)
+        self.cached_ranges = []
+
         # Playhead
         self.playhead = QGraphicsLineItem()
         self.playhead.setPen(QPen(QColor("#ff0000"), 1.5))
@@ -478,6 +482,18 @@ class LayerPanel(QGraphicsView):
                         painter.drawLine(sub_x, tick_top, sub_x, top + HEADER_HEIGHT)
             current_t += major_step
 
+        # Work area (in / out) & bar hijau RAM preview
+        t_in, t_out = self.work_area
+        if t_in is not None or t_out is not None:
+            x0 = TRACK_HEADER_WIDTH + (t_in or 0.0) * self.zoom_level
+            x1 = TRACK_HEADER_WIDTH + t_out * self.zoom_level if t_out is not None else left + width
+            painter.fillRect(QRectF(x0, top + HEADER_HEIGHT - 9, max(1.0, x1 - x0), 4), QColor(120, 140, 170, 160))
+        for t0, t1 in self.cached_ranges:
+            x0 = TRACK_HEADER_WIDTH + t0 * self.zoom_level
+            x1 = TRACK_HEADER_WIDTH + t1 * self.zoom_level
+            if x1 < left or x0 > left + width: continue
+            painter.fillRect(QRectF(x0, top + HEADER_HEIGHT - 4, max(1.0, x1 - x0), 3), QColor("#3ddc84"))
+
         # Sidebar Header
         painter.fillRect(QRectF(left, top + HEADER_HEIGHT, TRACK_HEADER_WIDTH, rect.height()), QColor(SIDEBAR_BG))
         painter.setPen(QPen(QColor("#000"), 1))
@@ -527,6 +543,14 @@ class LayerPanel(QGraphicsView):
         if x > vis.right() - 50:
              self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() + 50)
 
+    def set_work_area(self, t_in, t_out):
+        self.work_area = (t_in, t_out)
+        self.viewport().update()
+
+    def set_cached_ranges(self, ranges: list):
+        self.cached_ranges = ranges
+        self.viewport().update()
+
     def _process_seek_event(self, scene_x):
         raw_t = max(0, (scene_x - TRACK_HEADER_WIDTH) / self.zoom_level)
         snapped_t = round(raw_t * FPS) / FPS
@@ -24,6 +24,7 @@ if __name__ == "__main__":
     controller = EditorController()
     window = VideoEditorApp()
     binder = EditorBinder(controller, window)
+    app.aboutToQuit.connect(controller.shutdown)
     
     # 6. Launch
     window.show()
@@ -15,6 +15,11 @@ class EditorBinder(QObject):
         if hasattr(self.c, 'video_service') and hasattr(self.ui, 'preview_panel'):
             print("🔗 [BINDER] Injecting VideoService to PreviewPanel...")
             self.ui.preview_panel.set_video_service(self.c.video_service)
+        if hasattr(self.c, 'frame_dispatcher') and hasattr(self.ui, 'preview_panel'):
+            self.ui.preview_panel.set_frame_dispatcher(self.c.frame_dispatcher)
+        if hasattr(self.c, 'ram_preview') and hasattr(self.ui, 'preview_panel'):
+            self.ui.preview_panel.set_ram_preview(self.c.ram_preview)
+            self.c.preview_engine.sig_playback_state.connect(self.ui.preview_panel.set_playing)
         
         # 2. Wiring Signals
         self._connect_logic_to_ui()
@@ -23,6 +28,7 @@ class EditorBinder(QObject):
     def _connect_logic_to_ui(self):
         # Update Visual Preview
         self.c.sig_preview_update.connect(self._on_preview_update)
+        self.c.sig_visibility_delta.connect(self.ui.preview_panel.apply_visibility_delta)
         self.c.sig_status_message.connect(self.ui.status_bar.showMessage)
         
         # CRUD Events
@@ -38,6 +44,8 @@ class EditorBinder(QObject):
         if hasattr(self.ui, 'layer_panel'):
             self.c.sig_layers_reordered.connect(lambda _: self.ui.layer_panel.sync_all_layers(self.c.state.layers))
             self.c.sig_layer_cleared.connect(self.ui.layer_panel.clear_visual)
+            self.c.sig_work_area_changed.connect(self.ui.layer_panel.set_work_area)
+            self.c.sig_ram_cache_changed.connect(self.ui.layer_panel.set_cached_ranges)
 
     def _connect_ui_to_logic(self):
         # 1. TIMELINE ACTIONS
@@ -45,7 +53,8 @@ class EditorBinder(QObject):
             lp = self.ui.layer_panel
             lp.sig_request_seek.connect(self.c.seek_to)
             lp.sig_layer_selected.connect(self.c.select_layer)
-            lp.sig_request_move.connect(self.c.move_layer_time)
+            # Geser clip (termasuk push_tracks_down) di-coalesce per frame preview
+            lp.sig_request_move.connect(self.c.queue_move_layer_time)
             lp.sig_request_add.connect(self.c.add_new_layer)
             lp.sig_request_delete.connect(self.c.delete_current_layer)
             lp.sig_request_reorder.connect(self.c.reorder_layers)
@@ -53,15 +62,19 @@ class EditorBinder(QObject):
         # 2. PREVIEW PANEL INTERACTION
         if hasattr(self.ui, 'preview_panel'):
             pp = self.ui.preview_panel
-            pp.sig_property_changed.connect(self.c.update_layer_property)
+            pp.sig_property_changed.connect(self.c.queue_layer_property)
             pp.sig_layer_selected.connect(self.c.select_layer)
             if hasattr(pp, 'sig_request_delete'):
                 pp.sig_request_delete.connect(lambda lid: self.c.delete_current_layer())
             if hasattr(pp, 'sig_resolution_changed'):
                 pp.sig_resolution_changed.connect(self.c.update_canvas_resolution)
+            if hasattr(pp, 'sig_preview_scale_changed'):
+                pp.set_preview_quality(self.c.video_service.preview_scale)
+                pp.sig_preview_scale_changed.connect(self.c.set_preview_scale)
 
         # 3. PROPERTIES
-        self.ui.setting_panel.sig_property_update.connect(self.c.update_layer_property)
+        # Slider drag mengirim banyak event -> antri & flush sekali per frame
+        self.ui.setting_panel.sig_property_update.connect(self.c.queue_layer_property)
         
         # --- RENDER TAB CONNECTIONS ---
         if hasattr(self.ui, 'render_tab'):
@@ -83,6 +96,9 @@ class EditorBinder(QObject):
         self.ui.action_save.triggered.connect(self._on_menu_save)
         self.ui.action_open.triggered.connect(self._on_menu_open)
         self.ui.action_play.triggered.connect(self.c.toggle_play)
+        self.ui.action_set_in.triggered.connect(lambda: self.c.set_work_area_in())
+        self.ui.action_set_out.triggered.connect(lambda: self.c.set_work_area_out())
+        self.ui.action_ram_preview.triggered.connect(self.c.render_ram_preview)
 
         # --- LEFT PANEL CONNECTIONS ---
         
@@ -123,7 +139,7 @@ class EditorBinder(QObject):
             self.ui.render_tab.set_output_path(new_path)
             
     def _on_preview_update(self, t, active_ids):
-        self.ui.preview_panel.sync_layer_visibility(active_ids)
+        # Visibility sudah diatur lewat sig_visibility_delta (hanya layer yang berubah)
         self.ui.preview_panel.on_time_changed(t)
         self.ui.layer_panel.update_playhead(t)
 
@@ -137,6 +153,8 @@ class EditorBinder(QObject):
 
     def _on_layer_cleared(self):
         self.ui.preview_panel.items_map.clear()
+        self.ui.preview_panel.visible_ids.clear()
+        self.ui.preview_panel.ram_overlay = None  # ikut terhapus scene.clear()
         self.ui.preview_panel.scene.clear()
         if hasattr(self.ui.preview_panel, 'canvas_frame'):
             self.ui.preview_panel.scene.addItem(self.ui.preview_panel.canvas_frame)
@@ -4,7 +4,7 @@ import json
 import uuid
 import os
 from datetime import datetime
-from PySide6.QtCore import QObject, Signal, QUrl # <--- [FIX] Tambah QUrl
+from PySide6.QtCore import QObject, Signal, QUrl, QTimer # <--- [FIX] Tambah QUrl
 from PySide6.QtWidgets import QFileDialog
 from PySide6.QtGui import QDesktopServices
 # STATE & DATA
@@ -16,6 +16,12 @@ from manager.timeline.layer_model import LayerModel
 from manager.timeline.time_range import TimeRange
 from engine.preview_engine import PreviewEngine
 from engine.video_service import VideoService 
+from engine.prefetch_worker import FramePrefetcher
+from engine.frame_dispatcher import FrameDispatcher
+from engine.ram_preview import RamPreviewService
+from engine.cache_manager import CacheManager
+from engine.proxy_service import ProxyService
+from engine.mezzanine_cache import MezzanineService
 
 # SERVICES
 from manager.services.template_service import TemplateService
@@ -23,6 +29,9 @@ from manager.services.render_service import RenderService
 from manager.services.project_io_service import ProjectIOService
 from manager.services.caption_service import CaptionService
 
+# Properti yang mengubah posisi layer di timeline (perlu resync TimelineEngine)
+TIMELINE_KEYS = ("start_time", "duration", "track_index")
+
 class EditorController(QObject):
     # Signals UI Updates
     sig_layer_created = Signal(object)
@@ -33,6 +42,9 @@ class EditorController(QObject):
     sig_status_message = Signal(str)
     sig_layers_reordered = Signal(list)
     sig_preview_update = Signal(float, list) 
+    sig_visibility_delta = Signal(list, list)  # (entered, exited) id layer sejak update sebelumnya
+    sig_work_area_changed = Signal(object, object)  # (in, out) RAM preview, None = belum di-set
+    sig_ram_cache_changed = Signal(list)            # rentang [(t0, t1)] yang sudah di-cache
     sig_render_started = Signal()          # Signal render mulai
     sig_render_finished = Signal(bool, str) # Signal render selesai (Success/Fail, Msg)
     sig_render_progress = Signal(int)       # Signal progress (0-100)
@@ -43,21 +55,39 @@ class EditorController(QObject):
         self.render_service = RenderService() # <--- INIT SERVICE
         
         self.current_frame = 0
-        self.fps = 30.0
+        self.fps = self.state.fps
         
         self.video_service = VideoService()
 
         self.timeline = TimelineEngine()       
-        self.preview_engine = PreviewEngine()  
+        self.preview_engine = PreviewEngine(fps=self.fps)
+        self.playback_stats = {}  # statistik pacing playback terakhir (PreviewEngine.sig_stats)
+        self.prefetcher = FramePrefetcher(self.video_service, self.timeline, fps=self.fps)
+        self.prefetcher.start()
+        self.proxy_service = ProxyService()
         self.render_service = RenderService()  
         
         self.tpl_service = TemplateService()
         self.io_service = ProjectIOService()
         self.cap_service = CaptionService()
         
+        # Batch update properti (begin_batch / commit) & antrian update dari UI
+        self._batch_depth = 0
+        self._batch_changes = {}   # layer_id -> props gabungan selama batch
+        self._batch_seek = None    # target seek setelah commit (None = frame sekarang)
+        self._queued_changes = {}  # layer_id -> props dari UI, di-flush sekali per frame
+        self._queued_seek = None
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush_queued_updates)
+
         self.preview_engine.sig_tick.connect(self._on_engine_tick)
         self.preview_engine.sig_playback_state.connect(self._on_playback_state)
+        self.preview_engine.sig_stats.connect(self._on_playback_stats)
         
+        self.proxy_service.sig_proxy_ready.connect(self._on_proxy_ready)
+        self.proxy_service.sig_proxy_progress.connect(self._on_proxy_progress)
+        self.proxy_service.sig_proxy_failed.connect(lambda src, msg: print(f"[PROXY] Skip {src}: {msg}"))
         self.cap_service.sig_success.connect(self._on_caption_success)
         self.cap_service.sig_fail.connect(self._on_caption_error)
         
@@ -77,11 +107,48 @@ class EditorController(QObject):
         self.user_config = self._load_config()
         default_path = os.path.join(os.path.expanduser("~"), "Desktop")
         self.output_path = self.user_config.get("output_path", default_path)
-        
+
+        # Budget memori global untuk semua frame cache (MB)
+        if "cache_budget_mb" in self.user_config:
+            CacheManager.instance().set_budget_mb(float(self.user_config["cache_budget_mb"]))
+        # Proxy preview (default aktif); render selalu pakai media original
+        self.video_service.use_proxies = bool(self.user_config.get("use_proxies", True))
+        self.video_service.set_preview_scale(self.user_config.get("preview_scale", 1.0))
+        # Decode frame preview di thread pool (scrub tidak memblok GUI thread)
+        self.frame_dispatcher = FrameDispatcher(self.video_service, workers=int(self.user_config.get("preview_workers", 2)))
+        # RAM preview (komposit rentang in / out ke cache, seperti render bar NLE lain)
+        self.work_area = (None, None)
+        self.ram_preview = RamPreviewService(
+            self.timeline, self.video_service,
+            budget_mb=float(self.user_config.get("ram_preview_budget_mb", 512)),
+            threads=int(self.user_config.get("ram_preview_threads", 1)),
+            disk_quota_mb=self.user_config.get("ram_preview_disk_mb"),  # None = default, 0 = tanpa tier disk
+        )
+        self.ram_preview.sig_progress.connect(self._on_ram_preview_progress)
+        self.ram_preview.sig_finished.connect(self._on_ram_preview_finished)
+        self.ram_preview.sig_cache_changed.connect(self._on_ram_cache_changed)
+        # Mode ingest mezzanine (opsional): video di-decode sekali ke YUV420 mmap untuk scrub
+        self.use_mezzanine = bool(self.user_config.get("use_mezzanine", False))
+        self.mezzanine_service = MezzanineService(
+            quota_mb=float(self.user_config.get("mezzanine_disk_mb", 20480)))
+        self.mezzanine_service.sig_mezzanine_ready.connect(self._on_mezzanine_ready)
+        self.mezzanine_service.sig_mezzanine_progress.connect(self._on_mezzanine_progress)
+        self.mezzanine_service.sig_mezzanine_failed.connect(lambda src, msg: print(f"[MEZZANINE] Skip {src}: {msg}"))
+        
+    def shutdown(self):
+        """Dipanggil saat app ditutup: hentikan worker background & simpan cache disk."""
+        self.preview_engine.pause()
+        self.prefetcher.stop()
+        self.frame_dispatcher.shutdown()
+        self.ram_preview.shutdown()
+        self.proxy_service.cancel_all()
+        self.mezzanine_service.cancel_all()
+
     # --- RENDER LOGIC (IMPLEMENTASI BARU) ---
 
     def start_rendering_process(self, ui_config):
         """Dipanggil oleh UI saat tombol Export ditekan"""
+        self.flush_queued_updates()
         
         # 1. Tentukan Path Output (Folder)
         final_folder = ui_config.get('path')
@@ -110,9 +177,15 @@ class EditorController(QObject):
             "quality": ui_config.get('quality', 'medium'),
             "width": self.state.width,
             "height": self.state.height,
-            "fps": getattr(self, 'fps', 30),
+            "fps": self.state.fps,
             "layers": self.state.layers,
-            "duration": total_duration if total_duration > 0 else 10 
+            "duration": total_duration if total_duration > 0 else 10,
+            # Render paralel per segmen (1 = serial seperti biasa, "auto" = jumlah core - 1)
+            "workers": self.user_config.get("render_workers", 1),
+            "segment_seconds": self.user_config.get("render_segment_seconds", 10),
+            # "qpainter" (default) atau "numpy" (compositor headless NumPy/cv2)
+            "compositor": self.user_config.get("render_compositor", "qpainter"),
+            "compose_threads": self.user_config.get("render_compose_threads", 1),
         }
 
         # 4. Mulai Render
@@ -156,6 +229,10 @@ class EditorController(QObject):
         except Exception as e:
             print(f"Error saving config: {e}")
 
+    def get_cache_stats(self) -> dict:
+        """Hit / miss / eviction semua frame cache (buat sizing host)"""
+        return CacheManager.instance().stats()
+
     # --- OUTPUT FOLDER LOGIC ---
     def get_output_path(self):
         """Return current output path"""
@@ -202,19 +279,25 @@ class EditorController(QObject):
     def _on_engine_tick(self, t: float):
         self.current_frame = self.time_to_frame(t)
         clean_time = self.frame_to_time(self.current_frame)
-        active_models = self.timeline.get_active_layers(clean_time)
-        active_ids = [l.id for l in active_models]
-        self.sig_preview_update.emit(clean_time, active_ids)
+        if self.preview_engine.is_playing:
+            self.prefetcher.update_playhead(clean_time)
+        self._emit_preview_update(clean_time)
 
     def seek_to(self, t: float):
         target_frame = self.time_to_frame(t)
         self.current_frame = target_frame
         clean_time = self.frame_to_time(self.current_frame)
+        self.prefetcher.cancel()
+        # PreviewEngine.seek memancarkan sig_tick -> _on_engine_tick -> 1 refresh preview
+        # (dulu refresh dikirim 2x per seek)
         self.preview_engine.seek(clean_time)
-        
-        active_models = self.timeline.get_active_layers(clean_time)
-        active_ids = [l.id for l in active_models]
-        self.sig_preview_update.emit(clean_time, active_ids)
+
+    def _emit_preview_update(self, clean_time: float):
+        # Cursor timeline hanya melaporkan layer yang masuk / keluar sejak tick sebelumnya
+        entered, exited = self.timeline.advance_cursor(clean_time)
+        if entered or exited:
+            self.sig_visibility_delta.emit(entered, exited)
+        self.sig_preview_update.emit(clean_time, self.timeline.cursor_ids)
 
     def toggle_play(self):
         total_dur = self.timeline.get_total_duration()
@@ -222,9 +305,78 @@ class EditorController(QObject):
         self.preview_engine.toggle_play()
 
     def _on_playback_state(self, is_playing: bool):
+        if not is_playing:
+            self.prefetcher.cancel()
         state = "▶️ PLAYING" if is_playing else "⏸️ PAUSED"
+        st = self.playback_stats
+        if not is_playing and st.get("presented"):
+            state += (f" | {st['presented']} frame, drop {st['dropped']}, "
+                      f"telat {st['late']}, jitter {st['jitter_ms']:.1f} ms")
         self.sig_status_message.emit(state)
 
+    def _on_playback_stats(self, stats: dict):
+        self.playback_stats = stats
+
+    def set_fps(self, fps: float):
+        """Ganti fps project: playback, prefetch, dan snap frame ikut fps ini."""
+        t = self.frame_to_time(self.current_frame)
+        fps = float(fps) if fps > 0 else 30.0
+        if fps != self.fps:
+            self._reset_ram_preview()
+        self.fps = fps
+        self.state.fps = fps
+        self.preview_engine.set_fps(self.fps)
+        self.prefetcher.set_fps(self.fps)
+        self.seek_to(t)
+
+    # --- RAM PREVIEW ---
+    def set_work_area_in(self, t: float = None):
+        """In point RAM preview (default: posisi playhead)."""
+        if t is None: t = self.frame_to_time(self.current_frame)
+        t_out = self.work_area[1]
+        if t_out is not None and t_out <= t: t_out = None
+        self.work_area = (t, t_out)
+        self.sig_work_area_changed.emit(*self.work_area)
+
+    def set_work_area_out(self, t: float = None):
+        """Out point RAM preview (default: posisi playhead)."""
+        if t is None: t = self.frame_to_time(self.current_frame)
+        t_in = self.work_area[0]
+        if t_in is not None and t_in >= t: t_in = None
+        self.work_area = (t_in, t)
+        self.sig_work_area_changed.emit(*self.work_area)
+
+    def render_ram_preview(self):
+        """Komposit work area (default: seluruh timeline) di background ke RAM preview."""
+        self.flush_queued_updates()
+        t_in, t_out = self.work_area
+        if t_in is None: t_in = 0.0
+        if t_out is None: t_out = self.timeline.get_total_duration()
+        started = self.ram_preview.start(t_in, t_out, self.fps, self.state.width, self.state.height,
+                                         self.video_service.preview_scale)
+        if not started:
+            self.sig_status_message.emit("❌ RAM preview: work area kosong")
+
+    def _on_ram_preview_progress(self, done: int, total: int):
+        if done == total or done % 10 == 0:
+            self.sig_status_message.emit(f"🟩 RAM preview: {done}/{total} frame")
+
+    def _on_ram_preview_finished(self, complete: bool):
+        self.sig_status_message.emit("✅ RAM preview siap" if complete else "⏹️ RAM preview dibatalkan")
+
+    def _on_ram_cache_changed(self):
+        self.sig_ram_cache_changed.emit(self.ram_preview.cached_ranges())
+
+    def _invalidate_layer_frames(self, layer_id: str):
+        """Layer berubah: buang frame RAM preview di rentang waktu layer itu saja."""
+        model = self.timeline.get_layer(layer_id)
+        if model is not None:
+            self.ram_preview.invalidate(model.time.start, model.time.end)
+
+    def _reset_ram_preview(self):
+        self.ram_preview.cancel()
+        self.ram_preview.clear()
+
     # --- CRUD LAYERS (CORE) ---
     def add_new_layer(self, layer_type, path=None, properties=None):
         """
@@ -308,19 +460,20 @@ class EditorController(QObject):
         
         # 4. Insert without shifting others
         if os.path.exists(layer_data.path):
-            self.video_service.register_source(layer_data.id, layer_data.path)
+            self._register_media(layer_data)
         
         self.state.add_layer(layer_data)
         self._sync_layer_to_timeline(layer_data)
         
         self.sig_layer_created.emit(layer_data)
+        self.seek_to(self.frame_to_time(self.current_frame))  # tampilkan kalau aktif di playhead
         self.sig_status_message.emit("🖼️ Background Added")
 
 
     def _insert_layer(self, layer_data: LayerData):
         if layer_data.type in ['video', 'image', 'audio'] and layer_data.path:
             if os.path.exists(layer_data.path):
-                self.video_service.register_source(layer_data.id, layer_data.path)
+                self._register_media(layer_data)
             else:
                 self.sig_status_message.emit(f"⚠️ File not found: {layer_data.path}")
 
@@ -334,8 +487,31 @@ class EditorController(QObject):
         self.seek_to(start_t)
         self.sig_status_message.emit(f"✅ Layer Added: {layer_data.name}")
 
+    def _register_media(self, layer_data: LayerData):
+        self.video_service.register_source(layer_data.id, layer_data.path)
+        if layer_data.type == 'video' and self.use_mezzanine:
+            # Mezzanine menggantikan proxy untuk preview (tanpa decode sama sekali)
+            self.mezzanine_service.request_mezzanine(layer_data.path)
+        elif layer_data.type == 'video' and self.video_service.use_proxies:
+            self.proxy_service.request_proxy(layer_data.path)
+
+    def _on_proxy_progress(self, source_path: str, percent: int):
+        self.sig_status_message.emit(f"🎞️ Proxy {os.path.basename(source_path)}: {percent}%")
+
+    def _on_proxy_ready(self, source_path: str, proxy_path: str):
+        self.video_service.set_proxy(source_path, proxy_path)
+        # Refresh preview supaya frame berikutnya langsung dari proxy
+        self.seek_to(self.frame_to_time(self.current_frame))
+
+    def _on_mezzanine_progress(self, source_path: str, percent: int):
+        self.sig_status_message.emit(f"🧊 Ingest {os.path.basename(source_path)}: {percent}%")
+
+    def _on_mezzanine_ready(self, source_path: str, mezzanine_path: str):
+        if not self.video_service.set_mezzanine(source_path, mezzanine_path): return
+        self.prefetcher.cancel()
+        self.seek_to(self.frame_to_time(self.current_frame))
+
     def _sync_layer_to_timeline(self, layer_data: LayerData):
-        self.timeline.remove_layer(layer_data.id)
         start = float(layer_data.properties.get("start_time", 0.0))
         duration = float(layer_data.properties.get("duration", 5.0))
         min_dur = 1.0 / self.fps if self.fps > 0 else 0.033
@@ -350,28 +526,39 @@ class EditorController(QObject):
         )
         if layer_data.path:
             model.payload["path"] = layer_data.path
-        self.timeline.add_layer(model)
+        # Rentang lama & baru sama-sama berubah isinya
+        self._invalidate_layer_frames(layer_data.id)
+        # Ganti model lama secara incremental (index interval + urutan z)
+        self.timeline.update_layer(model)
+        self._invalidate_layer_frames(layer_data.id)
         
         total_dur = self.timeline.get_total_duration()
         self.preview_engine.set_duration(max(total_dur + 1.0, 5.0))
 
     def move_layer_time(self, layer_id: str, new_start_time: float, track_index: int = -1):
+        props = self._move_props(new_start_time, track_index)
+        self.state.selected_layer_id = layer_id
+
+        # Seek ke awal clip ditunda sampai commit (1 seek, bukan 2)
+        self.begin_batch()
+        self.update_layer_property(layer_id, props)
+        self._batch_seek = props["start_time"]
+        self.commit()
+
+    def _move_props(self, new_start_time: float, track_index: int = -1) -> dict:
         if new_start_time < 0: new_start_time = 0.0
         frame_start = self.time_to_frame(new_start_time)
-        clean_start_time = self.frame_to_time(frame_start)
-        
-        self.state.selected_layer_id = layer_id
-        props = {"start_time": clean_start_time}
+        props = {"start_time": self.frame_to_time(frame_start)}
         if track_index >= 0:
             props["track_index"] = track_index
-
-        self.update_layer_property(layer_id, props)
-        self.seek_to(clean_start_time)
+        return props
 
     def delete_current_layer(self):
+        self.flush_queued_updates()
         current_id = self.state.selected_layer_id
         if current_id:
             self.video_service.unregister_source(current_id)
+            self._invalidate_layer_frames(current_id)
             self.timeline.remove_layer(current_id)
             self.state.remove_layer(current_id)
             self.sig_layer_removed.emit(current_id)
@@ -381,37 +568,114 @@ class EditorController(QObject):
             self.sig_status_message.emit("🗑️ Layer Deleted")
 
     def select_layer(self, layer_id):
+        self.flush_queued_updates()  # panel properti harus membaca nilai terbaru
         self.state.selected_layer_id = layer_id
         layer = self.state.get_layer(layer_id)
         self.sig_selection_changed.emit(layer)
 
     def update_layer_property(self, arg1, arg2=None, arg3=None):
-        layer_id = None
-        new_props = {}
-
-        if isinstance(arg1, dict):
-            layer_id = self.state.selected_layer_id
-            new_props = arg1
-        elif isinstance(arg1, str) and isinstance(arg2, dict):
-            layer_id = arg1
-            new_props = arg2
-        elif isinstance(arg1, str) and isinstance(arg2, str):
-            layer_id = arg1
-            new_props = {arg2: arg3}
-        else:
-            return
-
+        layer_id, new_props = self._parse_property_args(arg1, arg2, arg3)
         if not layer_id: return
         layer = self.state.get_layer(layer_id)
         if layer:
             layer.properties.update(new_props)
-            if any(k in new_props for k in ["start_time", "duration", "track_index"]):
+            if self._batch_depth:
+                # Resync timeline, signal & seek ditunda sampai commit()
+                self._batch_changes.setdefault(layer_id, {}).update(new_props)
+                return
+
+            if any(k in new_props for k in TIMELINE_KEYS):
                 self._sync_layer_to_timeline(layer)
+            else:
+                self._invalidate_layer_frames(layer_id)
             
             self.sig_property_changed.emit(layer_id, new_props)
             clean_time = self.frame_to_time(self.current_frame)
             self.seek_to(clean_time)
 
+    def _parse_property_args(self, arg1, arg2=None, arg3=None):
+        """(props) / (layer_id, props) / (layer_id, key, value) -> (layer_id, props)."""
+        if isinstance(arg1, dict):
+            return self.state.selected_layer_id, arg1
+        if isinstance(arg1, str) and isinstance(arg2, dict):
+            return arg1, arg2
+        if isinstance(arg1, str) and isinstance(arg2, str):
+            return arg1, {arg2: arg3}
+        return None, {}
+
+    # --- BATCH UPDATE ---
+    def begin_batch(self):
+        """Mulai batch: update_layer_property hanya mengubah state sampai commit() terakhir."""
+        self._batch_depth += 1
+
+    def commit(self):
+        """
+        Akhiri batch. Di commit paling luar: resync timeline per layer yang berubah
+        waktunya, 1 sig_property_changed per layer (props digabung), lalu 1 seek / refresh preview.
+        """
+        if self._batch_depth == 0: return
+        self._batch_depth -= 1
+        if self._batch_depth: return
+
+        changes, self._batch_changes = self._batch_changes, {}
+        seek_time, self._batch_seek = self._batch_seek, None
+        if not changes and seek_time is None: return
+
+        for layer_id, props in changes.items():
+            layer = self.state.get_layer(layer_id)
+            if layer is None: continue
+            if any(k in props for k in TIMELINE_KEYS):
+                self._sync_layer_to_timeline(layer)
+            else:
+                self._invalidate_layer_frames(layer_id)
+            self.sig_property_changed.emit(layer_id, props)
+
+        if seek_time is None:
+            seek_time = self.frame_to_time(self.current_frame)
+        self.seek_to(seek_time)
+
+    def update_layers(self, changes: dict, seek_time: float = None):
+        """Update banyak layer sekaligus: {layer_id: props} -> 1 resync & 1 refresh preview."""
+        self.begin_batch()
+        try:
+            for layer_id, props in changes.items():
+                self.update_layer_property(layer_id, props)
+            if seek_time is not None:
+                self._batch_seek = seek_time
+        finally:
+            self.commit()
+
+    # --- ANTRIAN UPDATE DARI UI (slider drag, gizmo, geser clip) ---
+    def queue_layer_property(self, arg1, arg2=None, arg3=None):
+        """
+        Versi tertunda update_layer_property untuk signal UI: props digabung per layer
+        lalu di-apply sekali per frame preview (badai event slider = 1 refresh per frame).
+        """
+        layer_id, new_props = self._parse_property_args(arg1, arg2, arg3)
+        if not layer_id: return
+        self._queued_changes.setdefault(layer_id, {}).update(new_props)
+        self._schedule_flush()
+
+    def queue_move_layer_time(self, layer_id: str, new_start_time: float, track_index: int = -1):
+        """Versi tertunda move_layer_time (push_tracks_down = banyak clip, 1 commit)."""
+        props = self._move_props(new_start_time, track_index)
+        self.state.selected_layer_id = layer_id
+        self._queued_changes.setdefault(layer_id, {}).update(props)
+        self._queued_seek = props["start_time"]
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(max(1, int(1000 / self.fps)))
+
+    def flush_queued_updates(self):
+        """Apply semua update UI yang masih antri (dipanggil timer, atau sebelum aksi lain)."""
+        self._flush_timer.stop()
+        if not self._queued_changes and self._queued_seek is None: return
+        changes, self._queued_changes = self._queued_changes, {}
+        seek_time, self._queued_seek = self._queued_seek, None
+        self.update_layers(changes, seek_time)
+
     def reorder_layers(self, from_idx: int, to_idx: int):
         if from_idx < 0 or to_idx < 0: return
         if from_idx >= len(self.state.layers) or to_idx >= len(self.state.layers): return
@@ -422,10 +686,22 @@ class EditorController(QObject):
     def update_canvas_resolution(self, width: int, height: int):
         self.state.width = width
         self.state.height = height
+        self._reset_ram_preview()
         self.sig_status_message.emit(f"📐 Resolution set to {width}x{height}")
 
+    def set_preview_scale(self, scale: float):
+        """Full / Half / Quarter: frame preview di-decode lebih kecil, render tetap full."""
+        self.video_service.set_preview_scale(scale)
+        self.user_config["preview_scale"] = self.video_service.preview_scale
+        self._save_config()
+        self.prefetcher.cancel()
+        self._reset_ram_preview()
+        self.seek_to(self.frame_to_time(self.current_frame))
+        self.sig_status_message.emit(f"🖥 Preview quality: {int(self.video_service.preview_scale * 100)}%")
+
     # --- RENDER ---
     def process_render(self, config):
+        self.flush_queued_updates()
         if self.timeline.get_total_duration() <= 0:
             self.sig_status_message.emit("❌ Timeline is empty!")
             return
@@ -437,6 +713,10 @@ class EditorController(QObject):
         render_config = config.copy()
         render_config["width"] = self.state.width
         render_config["height"] = self.state.height
+        render_config.setdefault("workers", self.user_config.get("render_workers", 1))
+        render_config.setdefault("segment_seconds", self.user_config.get("render_segment_seconds", 10))
+        render_config.setdefault("compositor", self.user_config.get("render_compositor", "qpainter"))
+        render_config.setdefault("compose_threads", self.user_config.get("render_compose_threads", 1))
         
         # [FIX] Kirim 3 Parameter: timeline, settings, video_service
         success, worker_or_msg = self.render_service.start_render_process(
@@ -465,6 +745,7 @@ class EditorController(QObject):
             self.sig_status_message.emit("❌ Failed to load project")
             return
         self.preview_engine.pause()
+        self._reset_ram_preview()
         self.state.layers.clear()
         self.timeline.clear()
         self.video_service.release_all()
@@ -476,11 +757,13 @@ class EditorController(QObject):
             l.z_index = 100 - l.properties['track_index']
             self._insert_layer(l)
             
-        self.seek_to(0.0)
+        # set_fps juga seek ke frame 0 dengan fps project yang baru
+        self.set_fps(self.io_service.load_fps(path))
         self.sig_status_message.emit("✅ Project Loaded")
 
     def save_project(self, path=None):
         if not path: return
+        self.flush_queued_updates()
         if self.io_service.save_project(self.state, path):
             self.sig_status_message.emit(f"💾 Saved: {os.path.basename(path)}")
         else:
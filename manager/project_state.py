@@ -55,6 +55,8 @@ class ProjectState:
         # GLOBAL CANVAS RESOLUTION
         self.width: int = 1080
         self.height: int = 1920
+        # FPS project: dipakai playback, prefetch, RAM preview, dan export
+        self.fps: float = 30.0
 
     def add_layer(self, layer: LayerData):
         self.layers.append(layer)
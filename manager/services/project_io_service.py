@@ -17,6 +17,7 @@ class ProjectIOService:
             # 2. Bungkus Data Proyek
             project_data = {
                 "version": "1.0",
+                "fps": state.fps,
                 "layers": layers_data
             }
             
@@ -50,4 +51,15 @@ class ProjectIOService:
             
         except Exception as e:
             print(f"[IO SERVICE ERROR] Load failed: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def load_fps(self, file_path: str, default: float = 30.0) -> float:
+        """FPS project dari file JSON (project lama tanpa key 'fps' -> default)."""
+        try:
+            with open(file_path, 'r') as f:
+                data = json.load(f)
+            fps = float(data.get("fps", default))
+            return fps if fps > 0 else default
+        except Exception as e:
+            print(f"[IO SERVICE ERROR] Load fps failed: {e}")
+            return default
\ No newline at end of file
@@ -0,0 +1,147 @@
+# manager/timeline/interval_index.py
+from typing import Dict, List, Optional, Tuple
+
+
+class _Node:
+    """Node interval tree terpusat: interval yang memuat center disimpan di node ini."""
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center, by_start, by_end, left, right):
+        self.center = center
+        self.by_start = by_start  # [(start, end, key)] urut start naik
+        self.by_end = by_end      # [(start, end, key)] urut end turun
+        self.left = left
+        self.right = right
+
+
+class IntervalIndex:
+    """
+    Index interval setengah terbuka [start, end) -> key, untuk query
+    "aktif di waktu t" dalam O(log n + k).
+
+    Interval tree terpusat yang dibangun statis (O(n log n)), ditambah:
+    - pending: interval baru sejak build terakhir (di-scan linear),
+    - tombstone: key yang sudah dihapus / diganti (di-skip saat query).
+    Mutasi O(1); tree baru dibangun ulang saat query kalau pending + tombstone
+    melewati ~2 * sqrt(n) (bulk insert saat load project = 1 rebuild saja,
+    slider drag = rebuild sesekali, scan pending per query tetap kecil).
+    """
+    REBUILD_MIN = 64        # di bawah ini pending / tombstone selalu dibiarkan
+
+    def __init__(self):
+        self._items: Dict[object, Tuple[float, float]] = {}  # key -> (start, end) yang berlaku
+        self._root: Optional[_Node] = None
+        self._built: Dict[object, Tuple[float, float]] = {}  # isi tree saat build terakhir
+        self._pending: Dict[object, Tuple[float, float]] = {}
+        self._tombstones = set()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    # ---------- MUTASI ----------
+    def insert(self, key, start: float, end: float):
+        """Tambah / ganti interval key."""
+        if key in self._items:
+            self.remove(key)
+        self._items[key] = (start, end)
+        self._pending[key] = (start, end)
+
+    def remove(self, key):
+        if self._items.pop(key, None) is None: return
+        if self._pending.pop(key, None) is not None and key not in self._built:
+            return
+        self._tombstones.add(key)
+
+    def clear(self):
+        self._items.clear()
+        self._built = {}
+        self._pending.clear()
+        self._tombstones.clear()
+        self._root = None
+
+    # ---------- QUERY ----------
+    def at(self, t: float) -> List[object]:
+        """Key yang aktif di waktu t (start <= t < end)."""
+        self._maybe_rebuild()
+        out = []
+        node = self._root
+        while node is not None:
+            if t < node.center:
+                # Interval node ini berakhir setelah center > t -> cukup cek start
+                # (end > t hanya menyaring interval kosong start == end == center)
+                for start, end, key in node.by_start:
+                    if start > t: break
+                    if end > t: out.append(key)
+                node = node.left
+            else:
+                # Semua interval node ini mulai sebelum center <= t -> cukup cek end
+                for start, end, key in node.by_end:
+                    if end <= t: break
+                    out.append(key)
+                node = node.right
+        return self._finish(out, lambda s, e: s <= t < e)
+
+    def overlapping(self, t0: float, t1: float) -> List[object]:
+        """Key yang aktif di sebagian rentang [t0, t1) (start < t1 dan end > t0)."""
+        self._maybe_rebuild()
+        out = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if node.center < t0:
+                for start, end, key in node.by_end:
+                    if end <= t0: break
+                    out.append(key)
+            elif node.center >= t1:
+                for start, end, key in node.by_start:
+                    if start >= t1: break
+                    out.append(key)
+            else:
+                out.extend(key for _, end, key in node.by_start if end > t0)
+            if node.left is not None and t0 < node.center: stack.append(node.left)
+            if node.right is not None and t1 > node.center: stack.append(node.right)
+        return self._finish(out, lambda s, e: s < t1 and e > t0)
+
+    # ---------- INTERNAL ----------
+    def _finish(self, out, match):
+        if self._tombstones:
+            out = [k for k in out if k not in self._tombstones]
+        for key, (start, end) in self._pending.items():
+            if match(start, end): out.append(key)
+        return out
+
+    def _maybe_rebuild(self):
+        dirty = len(self._pending) + len(self._tombstones)
+        if dirty > max(self.REBUILD_MIN, 2.0 * len(self._items) ** 0.5):
+            self.rebuild()
+
+    def rebuild(self):
+        self._built = dict(self._items)
+        self._pending.clear()
+        self._tombstones.clear()
+        entries = [(s, e, k) for k, (s, e) in self._built.items()]
+        self._root = self._build(entries)
+
+    @classmethod
+    def _build(cls, entries):
+        if not entries: return None
+        # Center = median start: interval dengan start == center pasti tersimpan
+        # di node ini, jadi tiap level pasti mengecil.
+        starts = sorted(s for s, _, _ in entries)
+        center = starts[len(starts) // 2]
+
+        here, left, right = [], [], []
+        for entry in entries:
+            start, end = entry[0], entry[1]
+            # Interval kosong (start == end == center) tetap di node ini
+            if end < center or (end == center and start < center): left.append(entry)
+            elif start > center: right.append(entry)
+            else: here.append(entry)
+
+        return _Node(center,
+                     sorted(here, key=lambda x: x[0]),
+                     sorted(here, key=lambda x: -x[1]),
+                     cls._build(left), cls._build(right))
@@ -1,10 +1,31 @@
 # manager/timeline/timeline_engine.py
+import bisect
+import itertools
+import threading
 from typing import List, Optional
 from .layer_model import LayerModel
+from .interval_index import IntervalIndex
 
 class TimelineEngine:
+    """
+    Daftar layer timeline + index untuk query waktu.
+    - _by_id       : id -> LayerModel (get_layer O(1))
+    - _layers      : urut z_index (stabil: z sama -> urutan masuk), untuk render / iterasi
+    - _index       : IntervalIndex [start, end) -> query layer aktif O(log n + k)
+    Semua mutasi incremental; tidak ada rebuild list / sort ulang per perubahan properti.
+    Query juga dipanggil dari thread prefetcher -> mutasi & query di bawah lock.
+    """
     def __init__(self):
         self._layers: List[LayerModel] = []
+        self._order_keys = []          # (z_index, seq) sejajar dengan _layers
+        self._by_id = {}               # id -> LayerModel
+        self._key_of = {}              # id -> (z_index, seq)
+        self._index = IntervalIndex()
+        self._seq = itertools.count()
+        self._duration = 0.0           # cache max end (None = perlu hitung ulang)
+        self._lock = threading.RLock()
+        # Cursor playhead: id layer aktif pada query advance_cursor terakhir
+        self._cursor_ids = {}          # id -> None (dict: urutan tetap, lookup O(1))
 
     # ✅ [BARU] Properti publik untuk akses layer (dibutuhkan RenderEngine)
     @property
@@ -12,28 +33,98 @@ class TimelineEngine:
         return self._layers
 
     def add_layer(self, layer: LayerModel):
-        self._layers.append(layer)
-        self._sort_layers()
+        with self._lock:
+            if layer.id in self._by_id:
+                self.remove_layer(layer.id)  # id sama -> ganti, bukan duplikat
+            key = (layer.z_index, next(self._seq))
+            pos = bisect.bisect_right(self._order_keys, key)
+            self._order_keys.insert(pos, key)
+            self._layers.insert(pos, layer)
+            self._key_of[layer.id] = key
+            self._by_id[layer.id] = layer
+            self._index.insert(layer.id, layer.time.start, layer.time.end)
+            if self._duration is not None:
+                self._duration = max(self._duration, layer.time.end)
+
+    def update_layer(self, layer: LayerModel):
+        """Ganti / tambah layer dengan id yang sama (waktu, z, payload baru)."""
+        self.add_layer(layer)
 
     def remove_layer(self, layer_id: str):
-        self._layers = [l for l in self._layers if l.id != layer_id]
+        with self._lock:
+            layer = self._by_id.pop(layer_id, None)
+            if layer is None: return
+            self._remove_order(layer_id)
+            self._key_of.pop(layer_id, None)
+            self._index.remove(layer_id)
+            if self._duration is not None and layer.time.end >= self._duration:
+                self._duration = None
 
     def clear(self):
-        self._layers.clear()
+        with self._lock:
+            self._layers.clear()
+            self._order_keys.clear()
+            self._by_id.clear()
+            self._key_of.clear()
+            self._index.clear()
+            self._duration = 0.0
+            self._cursor_ids = {}
 
     def get_active_layers(self, t: float) -> List[LayerModel]:
-        return [layer for layer in self._layers if layer.time.contains(t)]
-        
+        """Layer aktif di waktu t, urut z (bawah -> atas)."""
+        with self._lock:
+            return self._ordered(self._index.at(t))
+
+    def get_active_ids(self, t: float) -> List[str]:
+        return [l.id for l in self.get_active_layers(t)]
+
+    # ---------- CURSOR PLAYHEAD ----------
+    def advance_cursor(self, t: float):
+        """
+        Pindahkan cursor playhead ke t (maju, mundur, atau lompat).
+        Return (entered, exited): id layer yang baru aktif / tidak aktif lagi
+        sejak panggilan sebelumnya. Biaya O(log n + k), k = layer aktif;
+        perubahan waktu / hapus layer di antaranya ikut terhitung.
+        """
+        with self._lock:
+            active = dict.fromkeys(self._index.at(t))
+            old = self._cursor_ids
+            entered = [i for i in active if i not in old]
+            exited = [i for i in old if i not in active]
+            self._cursor_ids = active
+            return entered, exited
+
+    def reset_cursor(self):
+        """Lupakan state cursor -> advance_cursor berikutnya melaporkan semua layer aktif sebagai entered."""
+        with self._lock:
+            self._cursor_ids = {}
+
+    @property
+    def cursor_ids(self) -> List[str]:
+        """Id layer aktif di posisi cursor terakhir."""
+        return list(self._cursor_ids)
+
+    def get_layers_in_range(self, t0: float, t1: float) -> List[LayerModel]:
+        """Layer yang aktif di sebagian rentang [t0, t1) (dipakai prefetcher)."""
+        with self._lock:
+            return self._ordered(self._index.overlapping(t0, t1))
+
     def get_layer(self, layer_id: str) -> Optional[LayerModel]:
-        for layer in self._layers:
-            if layer.id == layer_id:
-                return layer
-        return None
+        return self._by_id.get(layer_id)
 
     def get_total_duration(self) -> float:
-        if not self._layers:
-            return 0.0
-        return max((layer.time.end for layer in self._layers), default=0.0)
+        with self._lock:
+            if self._duration is None:
+                self._duration = max((layer.time.end for layer in self._layers), default=0.0)
+            return self._duration
+
+    # ---------- INTERNAL ----------
+    def _ordered(self, ids) -> List[LayerModel]:
+        key_of = self._key_of
+        return [self._by_id[i] for i in sorted(ids, key=key_of.__getitem__)]
 
-    def _sort_layers(self):
-        self._layers.sort(key=lambda l: l.z_index)
\ No newline at end of file
+    def _remove_order(self, layer_id: str):
+        key = self._key_of[layer_id]
+        pos = bisect.bisect_left(self._order_keys, key)
+        del self._order_keys[pos]
+        del self._layers[pos]